@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import CustomUser
+from .models import CustomUser, RevokedToken
 
 admin.site.register(CustomUser)
+admin.site.register(RevokedToken)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.contrib.auth.password_validation import get_default_password_validators
+
+        from . import signals  # noqa: F401
+
+        # Build the validators, and read the common-password list, at startup
+        # rather than on the first registration.
+        get_default_password_validators()
@@ -0,0 +1,153 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.db.models import Model
+from django.db.models.base import ModelState
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+def get_user_state(user_id):
+    """
+    The user's (is_active, username), or None when the user is
+    gone, cached for USER_STATE_CACHE_TTL seconds. Saving the user forgets it.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(
+            'is_active', get_user_model().USERNAME_FIELD
+        ).first()
+        # An empty tuple remembers a missing user, which a cache miss cannot.
+        state = tuple(row) if row else ()
+        cache.set(key, state, settings.USER_STATE_CACHE_TTL)
+    return state or None
+
+
+async def aget_user_state(user_id):
+    """ get_user_state() for async code. """
+    key = _state_key(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        row = await get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(
+            'is_active', get_user_model().USERNAME_FIELD
+        ).afirst()
+        state = tuple(row) if row else ()
+        await cache.aset(key, state, settings.USER_STATE_CACHE_TTL)
+    return state or None
+
+
+def forget_user_state(user_id):
+    cache.delete(_state_key(user_id))
+
+
+def _state_key(user_id):
+    return f'user-state:{user_id}'
+
+
+class LazyUser(SimpleLazyObject):
+    """
+    Stands in for the authenticated user. The id comes from the token and the
+    username and active flag from the state cache; anything
+    else loads the user row on first use. Once loaded, every attribute comes from the
+    row, so a write to the user in the same request is seen.
+
+    It reports the user model as its class and carries the model's _meta and
+    _state, so filtering on it or assigning it to a foreign key needs no query.
+    """
+
+    def __init__(self, user_id, username=None, is_active=True):
+        User = get_user_model()
+        super().__init__(lambda: User._default_manager.get(pk=user_id))
+        state = ModelState()
+        state.adding = False
+        state.db = router.db_for_read(User)
+        claims = {'is_active': is_active}
+        if username is not None:
+            claims['username'] = username
+        # LazyObject.__setattr__ forwards to the wrapped object, so bypass it.
+        self.__dict__.update({
+            'id': user_id,
+            'pk': user_id,
+            'is_authenticated': True,
+            'is_anonymous': False,
+            '_meta': User._meta,
+            '_state': state,
+            # Served by __getattr__ only until the row is loaded.
+            '_claims': claims,
+        })
+
+    def _setup(self):
+        super()._setup()
+        self.__dict__.pop('_claims', None)
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            claims = self.__dict__.get('_claims', {})
+            if name in claims:
+                return claims[name]
+            # Probes for attributes no user instance has, like the
+            # hasattr(value, 'resolve_expression') in every queryset filter,
+            # must not load the row.
+            if not hasattr(self._meta.model, name):
+                raise AttributeError(name)
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        return get_user_model()
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, Model) and other._meta.concrete_model is self._meta.concrete_model and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the user query on every request: request.user is
+    a LazyUser, and revocation (a deleted or deactivated user) is checked
+    against the in-process state cache.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash, which means the full row anyway.
+            return super().get_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        return self.user_from_state(user_id, get_user_state(user_id), validated_token)
+
+    async def authenticate_async(self, request):
+        """ authenticate() for async views: the state lookup does not hold a thread while it waits. """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token), validated_token
+        user_id = self.get_user_id(validated_token)
+        return self.user_from_state(user_id, await aget_user_state(user_id), validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def user_from_state(self, user_id, state, validated_token):
+        if state is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        is_active, username = state
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return LazyUser(user_id, username, is_active)
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with its cost taken from PASSWORD_HASHER_COST['scrypt']. The
+    algorithm name is unchanged, so stored hashes stay readable and a cost
+    change rehashes each password on its next successful login.
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHER_COST['scrypt']['work_factor']
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_HASHER_COST['scrypt']['block_size']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_COST['scrypt']['parallelism']
+
+    # OpenSSL's default 32 MiB cap would reject work factors from 2**15 (block
+    # size 8), including ones stored before a cost change.
+    maxmem = 2**30
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """ Argon2id with its cost from PASSWORD_HASHER_COST['argon2']; needs argon2-cffi. """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_COST['argon2']['time_cost']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHER_COST['argon2']['memory_cost']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_COST['argon2']['parallelism']
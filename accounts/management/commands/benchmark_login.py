@@ -0,0 +1,32 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Time one password check with every configured hasher and report logins per '
+        'second per core. Runs in one thread, so each figure is what one core sustains.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help='Checks timed per hasher.')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        self.stdout.write(f"{'hasher':<55}{'ms/login':>10}{'logins/s/core':>16}")
+        for index, hasher in enumerate(get_hashers()):
+            name = f'{type(hasher).__module__}.{type(hasher).__name__}'
+            try:
+                encoded = hasher.encode('correct horse battery staple', hasher.salt())
+            except ValueError as e:
+                # Typically a hasher whose optional library is not installed.
+                self.stdout.write(self.style.WARNING(f'{name:<55}skipped: {e}'))
+                continue
+            started = time.perf_counter()
+            for _ in range(iterations):
+                hasher.verify('correct horse battery staple', encoded)
+            seconds = (time.perf_counter() - started) / iterations
+            line = f'{name:<55}{seconds * 1000:>10.1f}{1 / seconds:>16.1f}'
+            self.stdout.write(self.style.SUCCESS(line) if index == 0 else line)
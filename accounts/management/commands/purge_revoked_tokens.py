@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from accounts.revocation import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh tokens that have expired anyway, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per transaction.')
+
+    def handle(self, *args, **options):
+        total = 0
+        for deleted in purge_expired(options['batch_size']):
+            total += deleted
+            self.stdout.write(f'Deleted {total} revoked tokens')
+        self.stdout.write(self.style.SUCCESS(f'Purged {total} expired revoked tokens.'))
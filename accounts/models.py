@@ -1,10 +1,41 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 
 class CustomUser(AbstractUser):
     signup_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Email stays optional, but no two accounts share one.
+            models.UniqueConstraint(fields=['email'], condition=~Q(email=''), name='unique_nonblank_email'),
+        ]
    #email = models.EmailField(unique=True)
 
     def __str__(self):
         return f'{self.username}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored values so change handlers can tell what a save changed.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        fields = [self._meta.get_field(name) for name in update_fields] if update_fields else self._meta.concrete_fields
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **{
+            field.attname: getattr(self, field.attname) for field in fields
+        }}
+
+
+
+class RevokedToken(models.Model):
+    """ A refresh token that may no longer be used, kept until it would have expired anyway. """
+    jti = models.UUIDField(unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.jti}'
@@ -0,0 +1,76 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+class RecentlyRevoked:
+    """ A bounded LRU of revoked JTIs seen by this process. """
+
+    def __init__(self, size):
+        self.size = size
+        self.jtis = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __contains__(self, jti):
+        with self.lock:
+            if jti not in self.jtis:
+                return False
+            self.jtis.move_to_end(jti)
+            return True
+
+    def add(self, jti):
+        with self.lock:
+            self.jtis[jti] = None
+            self.jtis.move_to_end(jti)
+            while len(self.jtis) > self.size:
+                self.jtis.popitem(last=False)
+
+
+recently_revoked = RecentlyRevoked(settings.REVOKED_TOKEN_CACHE_SIZE)
+
+
+def revoke(jti, expires_at):
+    """
+    Revoke `jti` and return True, or False if it already was. There is no read
+    first: the unique jti column makes the insert itself the check, so two
+    refreshes racing with the same token cannot both succeed.
+    """
+    jti = uuid.UUID(jti)
+    if jti in recently_revoked:
+        return False
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        recently_revoked.add(jti)
+        return False
+    recently_revoked.add(jti)
+    return True
+
+
+def is_revoked(jti):
+    jti = uuid.UUID(jti)
+    if jti in recently_revoked:
+        return True
+    if RevokedToken.objects.filter(jti=jti).exists():
+        recently_revoked.add(jti)
+        return True
+    return False
+
+
+def purge_expired(batch_size=1000):
+    """ Delete revocations of tokens that have expired, a batch per transaction. Yields rows deleted. """
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            ids = list(RevokedToken.objects.filter(expires_at__lt=now).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return
+            RevokedToken.objects.filter(pk__in=ids).delete()
+        yield len(ids)
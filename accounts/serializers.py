@@ -2,6 +2,12 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -12,26 +18,35 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'password','password2' , 'email']
-        #extra_kwargs = {'password':{'write_only':True}}
-    
-    def validate(self, attrs):
-        # Check if username already exists
-        if User.objects.filter(username=attrs['username']).exists():
-            raise serializers.ValidationError({"username": "A user with that username already exists."})
-
-        # Check if email already exists
-        if User.objects.filter(email=attrs['email']).exists():
-            raise serializers.ValidationError({"email": "A user with that email already exists."})
+        # Uniqueness is left to the database constraints; see create().
+        extra_kwargs = {
+            'username': {'validators': [User.username_validator]},
+            'email': {'validators': []},
+        }
 
+    def validate(self, attrs):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError('passwords do not match!')
         return attrs
-    
+
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = User.objects.create_user(**validated_data)
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(**validated_data)
+        except IntegrityError:
+            # Only now look up which value was taken, so a successful signup
+            # is a single INSERT and concurrent duplicates still fail cleanly.
+            raise serializers.ValidationError(self.conflicts(validated_data))
 
-        return user
+    def conflicts(self, validated_data):
+        errors = {}
+        if User.objects.filter(username=validated_data['username']).exists():
+            errors['username'] = 'A user with that username already exists.'
+        email = validated_data.get('email')
+        if email and User.objects.filter(email=email).exists():
+            errors['email'] = 'A user with that email already exists.'
+        return errors or {'non_field_errors': ['Could not create the user, please try again.']}
     
 class UserLoginSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -43,4 +58,29 @@ class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ['username', 'email', 'first_name', 'last_name'] 
-        extra_kwargs = {'email': {'required': True},}
\ No newline at end of file
+        extra_kwargs = {'email': {'required': True},}
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            # Revoking is the revocation check: only the first refresh with a token wins.
+            if not refresh.blacklist():
+                raise InvalidToken(_('Token is blacklisted'))
+        else:
+            try:
+                refresh.check_blacklist()
+            except TokenError as e:
+                raise InvalidToken(e.args[0])
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -1,3 +1,237 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from accounts.authentication import LazyUser
+from accounts.models import RevokedToken
+from accounts.revocation import revoke
+from accounts.tokens import RefreshToken
+from home.models import Notification
 
-# Create your tests here.
+
+class TestStatelessJWTAuthentication(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="stateless",
+            email="stateless@example.com",
+            password="password123",
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+
+    def test_token_carries_no_user_state(self):
+        access = self.refresh.access_token
+
+        # The username and roles come from the state cache, which renames invalidate.
+        self.assertNotIn("username", access)
+        self.assertNotIn("wrv", access)
+
+    def test_renames_show_in_the_response_and_later_requests(self):
+        response = self.client.patch(reverse("profile"), {"username": "renamed"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "renamed")
+        self.assertEqual(self.client.get(reverse("profile")).data["username"], "renamed")
+
+    def test_user_row_is_not_loaded_when_only_claims_are_used(self):
+        url = reverse("home:notifications-list")
+        self.client.get(url)
+
+        # notifications only; the user state is cached and request.user stays lazy
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_loads_the_user_on_demand(self):
+        response = self.client.get(reverse("profile"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "stateless@example.com")
+
+    def test_deactivated_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse("home:notifications-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestLazyUser(TestCase):
+    def test_stands_in_for_the_user_without_a_query(self):
+        user = get_user_model().objects.create_user(username="lazy", password="password123")
+
+        with self.assertNumQueries(0):
+            lazy = LazyUser(user.pk, "lazy")
+            self.assertIsInstance(lazy, get_user_model())
+            self.assertEqual(lazy, user)
+            self.assertEqual(user, lazy)
+            self.assertEqual(lazy.username, "lazy")
+            queryset = Notification.objects.filter(user=lazy)
+            notification = Notification(user=lazy, message="hello")
+
+        self.assertEqual(notification.user_id, user.pk)
+        self.assertFalse(queryset.exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(lazy.email, user.email)
+
+    def test_loaded_row_replaces_the_claims(self):
+        user = get_user_model().objects.create_user(username="stale", password="password123")
+        lazy = LazyUser(user.pk, "stale")
+        get_user_model().objects.filter(pk=user.pk).update(username="fresh")
+
+        lazy.refresh_from_db()
+
+        self.assertEqual(lazy.username, "fresh")
+
+
+class TestRefreshTokenRevocation(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="rotating", password="password123")
+        self.refresh = str(RefreshToken.for_user(self.user))
+        self.url = reverse("token_refresh")
+
+    def test_rotated_token_cannot_be_used_again(self):
+        first = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        replay = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        second = self.client.post(self.url, {"refresh": first.data["refresh"]}, format="json")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+    def test_refresh_is_a_single_insert(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statements = [q["sql"].split()[0] for q in context.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(statements, ["INSERT"])
+
+    def test_known_revocations_are_answered_from_memory(self):
+        jti = uuid.uuid4().hex
+        expires_at = timezone.now() + timedelta(days=1)
+
+        self.assertTrue(revoke(jti, expires_at))
+        with self.assertNumQueries(0):
+            self.assertFalse(revoke(jti, expires_at))
+
+    def test_purge_deletes_only_expired_revocations(self):
+        now = timezone.now()
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=uuid.uuid4(), expires_at=now - timedelta(minutes=i + 1)) for i in range(5)]
+            + [RevokedToken(jti=uuid.uuid4(), expires_at=now + timedelta(days=1))]
+        )
+
+        call_command("purge_revoked_tokens", "--batch-size", "2", stdout=StringIO())
+
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+
+class TestLoginPipeline(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="login", password="password123")
+        self.url = reverse("user-login")
+
+    def login(self, username="login", password="password123", ip="10.0.0.1"):
+        return self.client.post(self.url, {"username": username, "password": password}, REMOTE_ADDR=ip)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": None, "login_username": "2/min"},
+    })
+    def test_attempts_on_one_account_are_throttled_across_addresses(self):
+        self.assertEqual(self.login(password="wrong", ip="10.0.0.1").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login(password="wrong", ip="10.0.0.2").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.assertNumQueries(0):
+            response = self.login(ip="10.0.0.3")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.login(username="someone-else").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "2/min", "login_username": None},
+    })
+    def test_attempts_from_one_address_are_throttled_across_accounts(self):
+        self.login(username="a")
+        self.login(username="b")
+
+        self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login(ip="10.0.0.9").status_code, status.HTTP_200_OK)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "2/min", "login_username": None},
+    })
+    def test_forwarded_for_headers_do_not_open_new_buckets(self):
+        for i in range(2):
+            self.client.post(self.url, {"username": f"user-{i}", "password": "wrong"}, HTTP_X_FORWARDED_FOR=f"203.0.113.{i}")
+
+        response = self.client.post(self.url, {"username": "login", "password": "password123"}, HTTP_X_FORWARDED_FOR="203.0.113.9")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_old_hashes_are_upgraded_on_login(self):
+        self.user.password = make_password("password123", hasher="pbkdf2_sha256")
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$16384$"))
+        self.assertTrue(self.user.check_password("password123"))
+
+
+class TestRegistration(APITestCase):
+    def setUp(self):
+        self.url = reverse("user-register")
+
+    def register(self, username="newcomer", email="newcomer@example.com", password="Vq7!rT2#lmPz"):
+        return self.client.post(
+            self.url,
+            {"username": username, "email": email, "password": password, "password2": password},
+            format="json",
+        )
+
+    def test_signup_is_a_single_insert(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.register()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [q["sql"].split()[0] for q in context.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(statements, ["INSERT"])
+
+    def test_taken_username_and_email_are_reported_per_field(self):
+        self.register()
+
+        username = self.register(email="other@example.com")
+        email = self.register(username="other")
+
+        self.assertEqual(username.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(username.data), ["username"])
+        self.assertEqual(email.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(email.data), ["email"])
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_accounts_without_email_do_not_collide(self):
+        self.assertEqual(self.register(username="first", email="").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.register(username="second", email="").status_code, status.HTTP_201_CREATED)
+
+    def test_common_password_is_rejected(self):
+        response = self.register(password="password123")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", response.data)
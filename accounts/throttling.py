@@ -0,0 +1,68 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    One token bucket per key in the default cache. A rate of "10/min" is a
+    bucket of 10 refilled evenly over a minute: bursts up to 10, then one
+    request every 6 seconds. Scopes without a rate are not throttled.
+    """
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.capacity, self.period = self.parse_rate(rate) if rate else (None, None)
+        self.delay = None
+
+    def parse_rate(self, rate):
+        count, period = rate.split('/')
+        return int(count), PERIODS[period[0]]
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if self.capacity is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = time.time()
+        tokens, updated_at = cache.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.capacity / self.period)
+        if tokens < 1:
+            self.delay = (1 - tokens) * self.period / self.capacity
+            return False
+        # A full bucket is the same as no entry, so the key can expire after one period.
+        cache.set(key, (tokens - 1, now), self.period)
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return f'throttle:{self.scope}:{self.get_ident(request)}'
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """ Throttles attempts on one account, whatever addresses they come from. """
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        digest = hashlib.sha256(username.strip().casefold().encode()).hexdigest()
+        return f'throttle:{self.scope}:{digest}'
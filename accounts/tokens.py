@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .revocation import is_revoked, revoke
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Checks and records revocation in RevokedToken. Tokens carry only the user
+    id: StatelessJWTAuthentication reads everything else from the user state
+    cache, which saving the user invalidates, so no claim can go stale.
+    """
+
+    def check_blacklist(self):
+        if is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        """ Revoke the token; False if it already was. """
+        expires_at = datetime.fromtimestamp(self['exp'], tz=timezone.utc)
+        return revoke(self[api_settings.JTI_CLAIM], expires_at)
@@ -0,0 +1,21 @@
+import functools
+import gzip
+
+from django.contrib.auth import password_validation
+
+
+@functools.cache
+def load_password_list(path):
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f)
+    except OSError:
+        with open(path) as f:
+            return frozenset(line.strip() for line in f)
+
+
+class CommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """ Django's check against the same list, read once per process into a shared frozenset. """
+
+    def __init__(self, password_list_path=None):
+        self.passwords = load_password_list(str(password_list_path or self.DEFAULT_PASSWORD_LIST_PATH))
@@ -4,9 +4,10 @@ from django.contrib.auth import get_user_model
 from .serializers import UserRegistrationSerializer, UserLoginSerializer,UserProfileSerializer
 from django.contrib.auth import authenticate
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RefreshToken
 from rest_framework.views import APIView
 from rest_framework.generics import RetrieveUpdateAPIView
+from .throttling import LoginIPThrottle, LoginUsernameThrottle
 
 User = get_user_model()
 
@@ -30,6 +31,8 @@ class UserRegisterView(APIView):
     
 class UserLoginView(APIView):
     permission_classes = [AllowAny]
+    # Checked before the password is hashed.
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
     serializer_class = UserLoginSerializer
 
     def post(self, request):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Workspace, Board, Tag, Task, WorkspaceMembership, Notification
+from .models import Workspace, Board, Tag, Task, WorkspaceMembership, Notification, UnreadNotificationCounter, BoardTaskCounter, ChangeLogEntry
 
 admin.site.register(Workspace)
 admin.site.register(Board)
@@ -7,4 +7,6 @@ admin.site.register(Tag)
 admin.site.register(Task)
 admin.site.register(WorkspaceMembership)
 admin.site.register(Notification)
-
+admin.site.register(UnreadNotificationCounter)
+admin.site.register(BoardTaskCounter)
+admin.site.register(ChangeLogEntry)
@@ -0,0 +1,145 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework import exceptions
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from .views import BoardViewSet, NotificationViewSet, TaskViewSet
+
+# Permissions that only look at request.user and so can run on the event loop.
+INLINE_PERMISSIONS = (AllowAny, IsAuthenticated)
+
+
+class AsyncViewSetMixin:
+    """
+    Serves a viewset's actions as coroutines, so under ASGI a request holds no
+    thread while it waits on the database or cache.
+
+    Authentication and permission classes are awaited through their
+    authenticate_async / has_permission_async when they have one, and run in a
+    thread otherwise. Throttles, object permissions, content negotiation and
+    serialization are CPU-only and run inline. Actions may be coroutines or
+    plain methods.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        async_view.__dict__.update(view.__dict__)
+        async_view.__name__ = view.__name__
+        async_view.__qualname__ = view.__qualname__
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.initial_async(request, *args, **kwargs)
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                self.http_method_not_allowed(request, *args, **kwargs)
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def initial_async(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.perform_authentication_async(request)
+        await self.check_permissions_async(request)
+        self.check_throttles(request)
+
+    async def perform_authentication_async(self, request):
+        # What Request._authenticate() does, awaiting each authenticator.
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'authenticate_async', None)
+            try:
+                if authenticate is not None:
+                    user_auth = await authenticate(request)
+                else:
+                    user_auth = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        request._not_authenticated()
+
+    async def check_permissions_async(self, request):
+        for permission in self.get_permissions():
+            has_permission = getattr(permission, 'has_permission_async', None)
+            if has_permission is not None:
+                allowed = await has_permission(request, self)
+            elif isinstance(permission, INLINE_PERMISSIONS):
+                allowed = permission.has_permission(request, self)
+            else:
+                allowed = await sync_to_async(permission.has_permission)(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request, message=getattr(permission, 'message', None), code=getattr(permission, 'code', None)
+                )
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = None
+        if self.paginator is not None:
+            paginate = getattr(self.paginator, 'apaginate_queryset', None)
+            if paginate is not None:
+                page = await paginate(queryset, request, view=self)
+            else:
+                page = await sync_to_async(self.paginator.paginate_queryset)(queryset, request, view=self)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer([row async for row in queryset], many=True).data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(await self.aget_object()).data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class AsyncNotificationViewSet(AsyncViewSetMixin, NotificationViewSet):
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncBoardViewSet(AsyncViewSetMixin, BoardViewSet):
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.alist, request, *args, **kwargs)
+
+
+class AsyncTaskViewSet(AsyncViewSetMixin, TaskViewSet):
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.alist, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.aretrieve, request, *args, **kwargs)
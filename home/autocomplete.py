@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+
+from .models import Tag
+from .response_cache import generations
+
+TagMatch = namedtuple('TagMatch', ['id', 'name', 'normalized_name', 'uses'])
+CacheEntry = namedtuple('CacheEntry', ['expires', 'generation', 'matches', 'complete'])
+
+# Response cache dependencies of the matches: the tags themselves, and which
+# tasks (and so which workspaces) use them.
+DEPENDENCIES = ['tags', 'tag-uses']
+
+
+def prefix_filter(prefix):
+    """ Names starting with the normalized `prefix`, as a condition the normalized_name index can serve. """
+    condition = Q(normalized_name__startswith=prefix)
+    # SQLite's LIKE ignores case and so never reads an index; the equivalent
+    # code point range does. PostgreSQL serves LIKE from the pattern_ops index.
+    if connection.vendor == 'sqlite' and ord(prefix[-1]) < 0x10FFFF:
+        condition &= Q(normalized_name__gte=prefix, normalized_name__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return condition
+
+
+def matching_tags(prefix, workspace_id=None):
+    """
+    Tags whose normalized name starts with `prefix`, most used first. With
+    `workspace_id`, only the tags on that workspace's tasks, counting uses
+    there; otherwise every tag, counting uses everywhere.
+    """
+    tags = Tag.objects.filter(prefix_filter(prefix))
+    if workspace_id is not None:
+        tags = tags.filter(tasks__board__workspace_id=workspace_id)
+    return tags.annotate(uses=Count('tasks')).order_by('-uses', 'normalized_name', 'id').values_list(
+        'id', 'name', 'normalized_name', 'uses', named=True
+    )
+
+
+class PrefixCache:
+    """
+    The ranked matches of recently asked short prefixes, per workspace, kept in
+    this process for TAG_AUTOCOMPLETE_CACHE_TTL seconds and bounded to
+    TAG_AUTOCOMPLETE_CACHE_SIZE entries, least recently used out first. An
+    entry holding every match of its prefix also answers longer prefixes, by
+    filtering its already ranked matches. Entries are only served while the
+    generation they were read under is current (see current_generation()).
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, workspace_id, prefix, generation=None):
+        now = time.monotonic()
+        with self._lock:
+            for length in range(min(len(prefix), settings.TAG_AUTOCOMPLETE_CACHE_PREFIX_LENGTH), 0, -1):
+                key = (workspace_id, prefix[:length])
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry.expires <= now or entry.generation != generation:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                if length == len(prefix):
+                    return entry.matches
+                # A truncated entry may be missing matches of the longer prefix, and shorter ones more so.
+                if not entry.complete:
+                    return None
+                return [match for match in entry.matches if match.normalized_name.startswith(prefix)]
+        return None
+
+    def put(self, workspace_id, prefix, matches, complete, generation=None):
+        if len(prefix) > settings.TAG_AUTOCOMPLETE_CACHE_PREFIX_LENGTH:
+            return
+        entry = CacheEntry(time.monotonic() + settings.TAG_AUTOCOMPLETE_CACHE_TTL, generation, matches, complete)
+        with self._lock:
+            self._entries[(workspace_id, prefix)] = entry
+            self._entries.move_to_end((workspace_id, prefix))
+            while len(self._entries) > settings.TAG_AUTOCOMPLETE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+prefix_cache = PrefixCache()
+
+
+def current_generation():
+    """
+    The response cache generations of DEPENDENCIES, which tag writes and
+    changes to task tags move, or None when the response cache is off and
+    entries only expire.
+    """
+    if settings.RESPONSE_CACHE_ALIAS is None:
+        return None
+    return tuple(generations(DEPENDENCIES))
+
+
+def autocomplete(query, workspace_id=None, limit=10):
+    """ Up to `limit` tags whose name starts with `query`, ignoring case, as rows for the response. """
+    prefix = Tag.normalize(query)
+    generation = current_generation()
+    matches = prefix_cache.get(workspace_id, prefix, generation)
+    if matches is None:
+        # Always read the most a caller may ask for, so the entry serves any limit.
+        most = settings.TAG_AUTOCOMPLETE_MAX_RESULTS
+        matches = list(matching_tags(prefix, workspace_id)[:most + 1])
+        complete = len(matches) <= most
+        matches = matches[:most]
+        prefix_cache.put(workspace_id, prefix, matches, complete, generation)
+    return [{'id': match.id, 'name': match.name, 'uses': match.uses} for match in matches[:limit]]
@@ -0,0 +1,374 @@
+import asyncio
+import io
+import math
+import platform
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .counters import recount
+from .models import Board, Tag, Task, Workspace, WorkspaceMembership
+
+BENCHMARK_PASSWORD = 'bench-password-123'
+WORDS = (
+    'api', 'billing', 'bug', 'cache', 'deploy', 'design', 'docs', 'export', 'login', 'mobile',
+    'onboarding', 'release', 'report', 'search', 'security', 'signup', 'sync', 'upload',
+)
+DEFAULT_SIZES = {
+    'users': 200,
+    'workspaces': 20,
+    'members': 10,   # per workspace, creator included
+    'boards': 5,     # per workspace
+    'tasks': 200,    # per board
+    'tags': 100,
+}
+
+Dataset = namedtuple('Dataset', 'user workspace board task sizes')
+# `data` may be a callable taking the run state, for payloads that change
+# between requests.
+Scenario = namedtuple('Scenario', 'name method path data authenticated', defaults=(None, True))
+
+
+def seed(sizes=None, seed=0, batch_size=2000):
+    """
+    Fill the database with a synthetic dataset using bulk inserts only, and
+    return the dataset's principal: an admin of the first workspace.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    rng = random.Random(seed)
+    User = get_user_model()
+    today = date.today()
+
+    # One hash for everyone; hashing per user would dominate the seeding time.
+    password = make_password(BENCHMARK_PASSWORD)
+    users = User.objects.bulk_create([
+        User(username=f'bench-{i}', email=f'bench-{i}@example.com', password=password)
+        for i in range(max(sizes['users'], sizes['members']))
+    ], batch_size=batch_size)
+
+    workspaces = Workspace.objects.bulk_create([
+        Workspace(name=f'Workspace {i}', created_by=users[i % len(users)]) for i in range(sizes['workspaces'])
+    ], batch_size=batch_size)
+
+    members = {}
+    memberships = []
+    for workspace in workspaces:
+        others = rng.sample([u for u in users if u.pk != workspace.created_by_id], sizes['members'] - 1)
+        members[workspace.pk] = [workspace.created_by_id] + [u.pk for u in others]
+        memberships.append(WorkspaceMembership(workspace=workspace, user_id=workspace.created_by_id, role='admin'))
+        memberships.extend(WorkspaceMembership(workspace=workspace, user=u) for u in others)
+    WorkspaceMembership.objects.bulk_create(memberships, batch_size=batch_size)
+
+    boards = Board.objects.bulk_create([
+        Board(name=f'Board {i}', workspace=workspace, description='')
+        for workspace in workspaces for i in range(sizes['boards'])
+    ], batch_size=batch_size)
+
+    names = [f'{WORDS[i % len(WORDS)]}-{i}' for i in range(sizes['tags'])]
+    tags = Tag.objects.bulk_create(
+        [Tag(name=name, normalized_name=Tag.normalize(name)) for name in names], batch_size=batch_size
+    )
+
+    statuses = [value for value, _ in Task.STATUS_CHOICES]
+    tasks = []
+    for board in boards:
+        for i in range(sizes['tasks']):
+            start = today + timedelta(days=rng.randint(-60, 30))
+            tasks.append(Task(
+                title=f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}',
+                description=' '.join(rng.choices(WORDS, k=12)),
+                status=rng.choice(statuses),
+                start_date=start,
+                end_date=start + timedelta(days=rng.randint(1, 20)),
+                deadline=start + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.8 else None,
+                board=board,
+            ))
+    tasks = Task.objects.bulk_create(tasks, batch_size=batch_size)
+
+    Through = Task.tags.through
+    Through.objects.bulk_create([
+        Through(task_id=task.pk, tag_id=tag.pk)
+        for task in tasks for tag in rng.sample(tags, min(len(tags), rng.randint(0, 3)))
+    ], batch_size=batch_size)
+
+    Through = Task.assigned_users.through
+    user_column = f'{Task.assigned_users.field.m2m_reverse_field_name()}_id'
+    workspace_of = {board.pk: board.workspace_id for board in boards}
+    Through.objects.bulk_create([
+        Through(task_id=task.pk, **{user_column: user_id})
+        for task in tasks for user_id in rng.sample(members[workspace_of[task.board_id]], rng.randint(0, 2))
+    ], batch_size=batch_size)
+
+    # bulk_create skips the signals that keep the board counters current.
+    for _ in recount():
+        pass
+
+    workspace = workspaces[0]
+    board = boards[0]
+    return Dataset(
+        user=workspace.created_by,
+        workspace=workspace,
+        board=board,
+        task=next(task for task in tasks if task.board_id == board.pk),
+        sizes=sizes,
+    )
+
+
+def scenarios(dataset):
+    workspace, board, task = dataset.workspace.pk, dataset.board.pk, dataset.task.pk
+    tasks_url = reverse('home:board-tasks-list', kwargs={'workspace_pk': workspace, 'board_pk': board})
+    return [
+        Scenario('login', 'post', reverse('user-login'),
+                 {'username': dataset.user.username, 'password': BENCHMARK_PASSWORD}, authenticated=False),
+        Scenario('token refresh', 'post', reverse('token_refresh'),
+                 lambda state: {'refresh': state['refresh']}, authenticated=False),
+        Scenario('profile', 'get', reverse('profile')),
+        Scenario('workspace list', 'get', reverse('home:workspace-list')),
+        Scenario('workspace detail', 'get', reverse('home:workspace-detail', kwargs={'pk': workspace})),
+        Scenario('board list', 'get', reverse('home:workspace-boards-list', kwargs={'workspace_pk': workspace})),
+        Scenario('board summary', 'get', reverse('home:workspace-boards-summary', kwargs={'workspace_pk': workspace})),
+        Scenario('task page', 'get', tasks_url),
+        Scenario('task page by deadline', 'get', f'{tasks_url}?ordering=deadline'),
+        Scenario('task page filtered', 'get', f'{tasks_url}?status=Todo'),
+        Scenario('task search', 'get', f'{tasks_url}?search=release'),
+        Scenario('task detail', 'get', reverse(
+            'home:board-tasks-detail', kwargs={'workspace_pk': workspace, 'board_pk': board, 'pk': task}
+        )),
+        Scenario('task create', 'post', tasks_url, lambda state: {
+            'title': f"Benchmark task {state['counter']}", 'board': board, 'tags': ['bench'],
+            'assigned_users': [dataset.user.pk],
+        }),
+        Scenario('notification list', 'get', reverse('home:notifications-list')),
+    ]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, q):
+    """ Nearest-rank percentile of an ascending list. """
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def run(dataset, selected=None, requests=200, warmup=20):
+    """
+    Drive every scenario in-process and return {name: measurements}. Login
+    throttling is off: the login scenario measures the endpoint, not the limit.
+    """
+    refresh = RefreshToken.for_user(dataset.user)
+    state = {'refresh': str(refresh), 'counter': 0}
+    authenticated = APIClient()
+    authenticated.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    anonymous = APIClient()
+
+    def call(scenario):
+        state['counter'] += 1
+        client = authenticated if scenario.authenticated else anonymous
+        data = scenario.data(state) if callable(scenario.data) else scenario.data
+        response = getattr(client, scenario.method)(scenario.path, data, format='json' if data else None)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{scenario.name}: HTTP {response.status_code} {response.content[:200]!r}')
+        # Refresh tokens rotate; keep using the newest one.
+        if isinstance(response.data, dict) and 'refresh' in response.data:
+            state['refresh'] = response.data['refresh']
+        return response
+
+    results = {}
+    with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}):
+        for scenario in scenarios(dataset):
+            if selected and scenario.name not in selected:
+                continue
+            results[scenario.name] = measure(scenario, call, requests, warmup)
+    return results
+
+
+def measure(scenario, call, requests, warmup):
+    for _ in range(warmup):
+        call(scenario)
+    timings = []
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        started = time.perf_counter()
+        for _ in range(requests):
+            start = time.perf_counter()
+            call(scenario)
+            timings.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'requests': requests,
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(sum(timings) / requests * 1000, 3),
+        'rps': round(requests / elapsed, 1),
+        'queries_per_request': round(counter.count / requests, 2),
+    }
+
+
+def read_endpoints(dataset):
+    """ {name: (sync path, async path)} of the reads that have async views. """
+    workspace, board, task = dataset.workspace.pk, dataset.board.pk, dataset.task.pk
+    tasks = {'workspace_pk': workspace, 'board_pk': board}
+    return {
+        'notification list': (reverse('home:notifications-list'), reverse('home:async-notifications-list')),
+        'board list': (
+            reverse('home:workspace-boards-list', kwargs={'workspace_pk': workspace}),
+            reverse('home:async-workspace-boards-list', kwargs={'workspace_pk': workspace}),
+        ),
+        'task page': (reverse('home:board-tasks-list', kwargs=tasks), reverse('home:async-board-tasks-list', kwargs=tasks)),
+        'task detail': (
+            reverse('home:board-tasks-detail', kwargs={**tasks, 'pk': task}),
+            reverse('home:async-board-tasks-detail', kwargs={**tasks, 'pk': task}),
+        ),
+    }
+
+
+def wsgi_get(handler, path, token):
+    status = []
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_AUTHORIZATION': f'Bearer {token}', 'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+        'wsgi.url_scheme': 'http', 'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    response = handler(environ, lambda line, headers: status.append(int(line.split()[0])))
+    try:
+        b''.join(response)
+    finally:
+        response.close()
+    return status[0]
+
+
+async def asgi_get(handler, path, token):
+    status = []
+    finished = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            finished.set()
+
+    await handler({
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }, receive, send)
+    return status[0]
+
+
+async def drive(issue, clients, requests):
+    """ `requests` calls of `issue()` from `clients` concurrent clients. """
+    timings, statuses = [], []
+    peak_threads = threading.active_count()
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal peak_threads
+        for _ in remaining:
+            start = time.perf_counter()
+            statuses.append(await issue())
+            timings.append(time.perf_counter() - start)
+            peak_threads = max(peak_threads, threading.active_count())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'clients': clients,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'errors': sum(status >= 400 for status in statuses),
+        'peak_threads': peak_threads,
+    }
+
+
+def run_concurrency(dataset, selected=None, concurrency=(1, 8, 32), requests=200, workers=4):
+    """
+    Concurrent-connection capacity of each read with an async view, against
+    its sync view. The sync views are served like a threaded WSGI server with
+    `workers` threads; the async views by Django's ASGI handler on one event
+    loop. Per number of concurrent clients: requests per second, client-side
+    p50/p99 (time queued for a worker included), errors and peak threads.
+    """
+    token = str(RefreshToken.for_user(dataset.user).access_token)
+    wsgi, asgi = WSGIHandler(), ASGIHandler()
+    results = {}
+    for name, (sync_path, async_path) in read_endpoints(dataset).items():
+        if selected and name not in selected:
+            continue
+        results[name] = {'sync': [], 'async': []}
+        for clients in concurrency:
+            with ThreadPoolExecutor(workers) as pool:
+                async def sync_call():
+                    return await asyncio.get_running_loop().run_in_executor(pool, wsgi_get, wsgi, sync_path, token)
+                asyncio.run(drive(sync_call, clients, max(1, requests // 10)))
+                results[name]['sync'].append(asyncio.run(drive(sync_call, clients, requests)))
+
+            async def async_call():
+                return await asgi_get(asgi, async_path, token)
+            asyncio.run(drive(async_call, clients, max(1, requests // 10)))
+            results[name]['async'].append(asyncio.run(drive(async_call, clients, requests)))
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': f"{connection.vendor} {'.'.join(map(str, connection.get_database_version()))}",
+        'machine': platform.machine(),
+    }
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Regressions of `current` against `baseline`: any growth in queries per
+    request, or p50 latency more than `tolerance` above the baseline.
+    """
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        if now['queries_per_request'] > before['queries_per_request']:
+            regressions.append(
+                f"{name}: queries per request {before['queries_per_request']} -> {now['queries_per_request']}"
+            )
+        if now['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {before['p50_ms']}ms -> {now['p50_ms']}ms")
+    return regressions
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models import Subquery
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Board, ChangeLogEntry
+
+CHANGES_PAGE_SIZE = 200
+MAX_CHANGES_PAGE_SIZE = 1000
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'This sync token is older than the change log. Fetch a full snapshot and sync from its token.'
+    default_code = 'sync_token_expired'
+
+
+def workspace_of(board_id):
+    # Resolved inside the INSERT, so logging a task costs no extra query.
+    return Subquery(Board.objects.filter(pk=board_id).values('workspace_id'))
+
+
+def log_tasks(tasks, deleted=False):
+    """ Record changes to tasks given as (task id, board id) pairs. """
+    ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(
+            kind='task', object_id=task_id, board_id=board_id, workspace_id=workspace_of(board_id), deleted=deleted
+        )
+        for task_id, board_id in tasks
+    ])
+
+
+def log_board(board, deleted=False):
+    ChangeLogEntry.objects.create(
+        kind='board', object_id=board.pk, board_id=board.pk, workspace_id=board.workspace_id, deleted=deleted
+    )
+
+
+def log_membership(membership, deleted=False):
+    ChangeLogEntry.objects.create(
+        kind='membership', object_id=membership.pk, workspace_id=membership.workspace_id, deleted=deleted
+    )
+
+
+def encode_token(entry_id, written_since):
+    """
+    A signed token to read the entries after `entry_id`, all of which were
+    written at or after `written_since`: once that falls out of the
+    retention, prune() may have deleted some of them.
+    """
+    return signing.dumps({'id': entry_id, 'at': int(written_since.timestamp())}, salt='home.changes')
+
+
+def decode_token(token):
+    try:
+        payload = signing.loads(token, salt='home.changes')
+        entry_id, written_since = int(payload['id']), int(payload['at'])
+    except (signing.BadSignature, TypeError, ValueError, KeyError):
+        raise ValidationError({'since': 'Invalid sync token.'})
+    if timezone.now().timestamp() - written_since > settings.CHANGE_LOG_RETENTION.total_seconds():
+        raise SyncTokenExpired
+    return entry_id
+
+
+def read_changes(request, entries, sources):
+    """
+    One page of the change log `entries` after the request's `since` token.
+
+    `sources` maps each entry kind to (queryset, serializer class); changed
+    objects are loaded from their queryset in one query per kind, and any that
+    are no longer in it are reported deleted. An object changed several times
+    within the page appears once, at its last change. Tasks deleted with their
+    board get no entries of their own: the board's tombstone stands for them.
+    Without `since` the page
+    is empty and `next` is the current head: fetch a snapshot, then sync from
+    it.
+    """
+    since = request.query_params.get('since')
+    try:
+        limit = min(int(request.query_params.get('limit', CHANGES_PAGE_SIZE)), MAX_CHANGES_PAGE_SIZE)
+    except ValueError:
+        limit = CHANGES_PAGE_SIZE
+    limit = max(limit, 1)
+
+    # Entries younger than the settle time may still have uncommitted
+    # predecessors; leave them for the next page rather than skip those.
+    settled = timezone.now() - timedelta(seconds=settings.CHANGE_LOG_SETTLE_SECONDS)
+    if since is None:
+        head = ChangeLogEntry.objects.order_by('-id').values_list('id', flat=True).first()
+        return {'changes': [], 'next': encode_token(head or 0, settled), 'has_more': False}
+
+    after = decode_token(since)
+    page = list(
+        entries.filter(id__gt=after, created_at__lte=settled).order_by('id')
+        .values_list('id', 'kind', 'object_id', 'deleted', 'created_at')[:limit + 1]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    latest = {}
+    for entry_id, kind, object_id, deleted, _ in page:
+        latest.pop((kind, object_id), None)
+        latest[(kind, object_id)] = deleted
+
+    objects = {}
+    for kind, (queryset, serializer_class) in sources.items():
+        ids = [object_id for (entry_kind, object_id), deleted in latest.items() if entry_kind == kind and not deleted]
+        if ids:
+            rows = queryset.filter(pk__in=ids)
+            data = serializer_class(rows, many=True, context={'request': request}).data
+            objects.update({(kind, item['id']): item for item in data})
+
+    changes = []
+    for (kind, object_id), deleted in latest.items():
+        data = None if deleted else objects.get((kind, object_id))
+        changes.append({'type': kind, 'id': object_id, 'deleted': data is None, 'data': data})
+    # A full page leaves entries behind that are only as old as its last one;
+    # otherwise everything written before the settle time has been read.
+    written_since = page[-1][4] if has_more else settled
+    return {
+        'changes': changes,
+        'next': encode_token(page[-1][0] if page else after, written_since),
+        'has_more': has_more,
+    }
+
+
+def prune(batch_size=1000):
+    """ Delete change log entries past CHANGE_LOG_RETENTION, a batch per transaction. Yields rows deleted. """
+    # Keep the settle window as well: a token issued just inside the retention
+    # may still need entries written that long before it.
+    cutoff = timezone.now() - settings.CHANGE_LOG_RETENTION - timedelta(seconds=settings.CHANGE_LOG_SETTLE_SECONDS)
+    while True:
+        with transaction.atomic():
+            ids = list(ChangeLogEntry.objects.filter(created_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return
+            ChangeLogEntry.objects.filter(pk__in=ids).delete()
+        yield len(ids)
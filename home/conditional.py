@@ -0,0 +1,74 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified validators on list and retrieve, so a client polling
+    an unchanged resource gets a 304 without anything being loaded or
+    serialized.
+
+    Views implement get_validators() with one cheap lookup returning
+    (version, last_modified), or None to answer normally. The version must
+    change whenever the response body could; the ETag also covers the full path
+    and the negotiated media type, so pages, filters and formats never share
+    one. Last-Modified has one-second resolution, so clients should prefer
+    If-None-Match.
+
+    The validators of the request being answered are kept in
+    `current_validators`, for ResponseCacheMixin to key cached bodies by.
+    """
+    current_validators = None
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    async def aget_validators(self):
+        """ get_validators() for async views; by default the sync lookup in a thread. """
+        return await sync_to_async(self.get_validators)()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.current_validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified, response = self.check_preconditions(request, validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        validators = self.current_validators = await self.aget_validators()
+        if validators is None:
+            return await handler(request, *args, **kwargs)
+        etag, last_modified, response = self.check_preconditions(request, validators)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    def check_preconditions(self, request, validators):
+        """ The validators as (etag, last modified timestamp) plus the 304 or 412 to answer with, if any. """
+        version, last_modified = validators
+        etag = quote_etag(hashlib.md5(
+            f'{version}:{request.accepted_media_type}:{request.get_full_path()}'.encode(), usedforsecurity=False
+        ).hexdigest())
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        return etag, last_modified, get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if response.status_code not in (200, 304):
+            return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Cacheable by the client only, and always revalidated.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,106 @@
+import operator
+from collections import Counter
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Board, BoardTaskCounter, Task
+
+
+def apply_deltas(deltas, batch_size=100):
+    """
+    Apply {(board_id, status, deadline): delta} to the counters, in one UPDATE
+    per `batch_size` keys. Increments create the row when it is missing;
+    decrements never do, so a cascade that already removed a board's counters
+    is a no-op.
+    """
+    deltas = [(key, delta) for key, delta in deltas.items() if delta]
+    # No savepoint: inside a write's transaction a failure fails the write anyway.
+    with transaction.atomic(savepoint=False):
+        for start in range(0, len(deltas), batch_size):
+            batch = deltas[start:start + batch_size]
+            # Rows are not unique per key; each key moves its oldest row.
+            targets = Q()
+            for key, _ in batch:
+                targets |= Q(pk__in=BoardTaskCounter.objects.filter(counter_filter(key)).order_by('pk').values('pk')[:1])
+            updated = BoardTaskCounter.objects.filter(targets).update(count=F('count') + Case(
+                *[When(counter_filter(key), then=Value(delta)) for key, delta in batch], default=Value(0)
+            ))
+            if updated == len(batch):
+                continue
+            found = set(BoardTaskCounter.objects.filter(
+                reduce(operator.or_, [counter_filter(key) for key, _ in batch])
+            ).values_list('board_id', 'status', 'deadline'))
+            BoardTaskCounter.objects.bulk_create([
+                BoardTaskCounter(board_id=board_id, status=status, deadline=deadline, count=delta)
+                for (board_id, status, deadline), delta in batch
+                if delta > 0 and (board_id, status, deadline) not in found
+            ])
+
+
+def counter_filter(key):
+    board_id, status, deadline = key
+    condition = Q(board_id=board_id, status=status)
+    return condition & (Q(deadline__isnull=True) if deadline is None else Q(deadline=deadline))
+
+
+def change_deltas(changes):
+    """ changes: iterable of (previous key or None, current key or None). """
+    deltas = Counter()
+    for before, after in changes:
+        if before == after:
+            continue
+        if before is not None:
+            deltas[before] -= 1
+        if after is not None:
+            deltas[after] += 1
+    return deltas
+
+
+def workspace_summary(workspace):
+    """ Status totals and overdue counts for every board of the workspace, in two queries. """
+    today = timezone.localdate()
+    boards = {
+        board['id']: {**board, 'total': 0, 'overdue': 0, 'status_counts': {s: 0 for s, _ in Task.STATUS_CHOICES}}
+        for board in Board.objects.filter(workspace=workspace).order_by('id').values('id', 'name')
+    }
+    rows = BoardTaskCounter.objects.filter(board__workspace=workspace).values('board_id', 'status').annotate(
+        total=Sum('count'),
+        overdue=Sum('count', filter=Q(deadline__lt=today) & ~Q(status='Done')),
+    ).order_by()
+    for row in rows:
+        board = boards.get(row['board_id'])
+        if board is None:
+            continue
+        board['status_counts'][row['status']] = row['total']
+        board['total'] += row['total']
+        board['overdue'] += row['overdue'] or 0
+    return list(boards.values())
+
+
+def recount(board_ids=None, batch_size=500, task_model=Task, counter_model=BoardTaskCounter):
+    """
+    Recompute the counters from home_task, one transaction per batch of
+    boards. Yields the number of boards done after each batch.
+    """
+    if board_ids is None:
+        board_ids = set(task_model.objects.values_list('board_id', flat=True).distinct())
+        board_ids |= set(counter_model.objects.values_list('board_id', flat=True).distinct())
+    board_ids = sorted(board_ids)
+
+    done = 0
+    for start in range(0, len(board_ids), batch_size):
+        batch = board_ids[start:start + batch_size]
+        with transaction.atomic():
+            counter_model.objects.filter(board_id__in=batch).delete()
+            counts = task_model.objects.filter(board_id__in=batch).values('board_id', 'status', 'deadline').annotate(
+                count=Count('id')
+            ).order_by()
+            counter_model.objects.bulk_create(
+                [counter_model(**row) for row in counts.iterator()], batch_size=1000
+            )
+        done += len(batch)
+        yield done
+
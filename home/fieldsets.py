@@ -0,0 +1,104 @@
+from collections import namedtuple
+from functools import cache
+
+from rest_framework.exceptions import ValidationError
+
+
+class FieldSelection(namedtuple('FieldSelection', ['fields', 'expand'], defaults=(None, None))):
+    """ The fields (`?fields=`) and relations (`?expand=`) a request asked for; None means all of them. """
+
+    def includes(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        return self.includes(name) and (self.expand is None or name in self.expand)
+
+
+ALL_FIELDS = FieldSelection()
+
+
+@cache
+def readable_fields(serializer_class):
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+def parse_selection(request, serializer_class):
+    """
+    Read `?fields=a,b` and `?expand=x` against `serializer_class`. Fields keep
+    the serializer's order; leaving out `expand` expands every relation,
+    `?expand=` expands none.
+    """
+    params = request.query_params
+    if 'fields' not in params and 'expand' not in params:
+        return ALL_FIELDS
+
+    readable = readable_fields(serializer_class)
+    expandable = getattr(serializer_class, 'expandable_fields', {})
+    fields, expand, errors = None, None, {}
+    if params.get('fields'):
+        names = set(filter(None, (name.strip() for name in params['fields'].split(','))))
+        if unknown := names - set(readable):
+            errors['fields'] = [f'Unknown field: {name}' for name in sorted(unknown)]
+        fields = tuple(name for name in readable if name in names)
+    if 'expand' in params:
+        expand = frozenset(filter(None, (name.strip() for name in params['expand'].split(','))))
+        if unknown := expand - set(expandable):
+            errors['expand'] = [f'Cannot expand: {name}' for name in sorted(unknown)]
+    if errors:
+        raise ValidationError(errors)
+    return FieldSelection(fields, expand)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Render only the fields the `selection` in the serializer context includes.
+    `expandable_fields` maps each relation `?expand=` controls to the field
+    that renders it collapsed (as primary keys), or to None when the field
+    is already collapsed and to_representation() expands it.
+    """
+    expandable_fields = {}
+
+    @property
+    def selection(self):
+        return self.context.get('selection', ALL_FIELDS)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.selection
+        for name, collapsed in self.expandable_fields.items():
+            if collapsed is not None and name in fields and not selection.expands(name):
+                fields[name] = collapsed()
+        return {name: field for name, field in fields.items() if selection.includes(name)}
+
+
+class SparseFieldsetMixin:
+    """
+    Parse `?fields=` and `?expand=` for list and retrieve, hand the selection
+    to the serializer and load only the columns it renders. Relations are left
+    to get_queryset(), which should prefetch only what the selection includes.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_field_selection(self):
+        if not hasattr(self, '_field_selection'):
+            self._field_selection = ALL_FIELDS
+            if self.action in self.sparse_actions:
+                self._field_selection = parse_selection(self.request, self.get_serializer_class())
+        return self._field_selection
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'selection': self.get_field_selection()}
+
+    def get_selected_columns(self, queryset):
+        """ `queryset` deferring the columns of fields the selection leaves out, keeping what the paginator sorts on. """
+        selection = self.get_field_selection()
+        if selection.fields is None:
+            return queryset
+        columns = [
+            name for name in selection.fields
+            if not queryset.model._meta.get_field(name).many_to_many
+        ]
+        sort_columns = getattr(self.paginator, 'sort_columns', None)
+        if sort_columns is not None:
+            columns += sort_columns(self)
+        return queryset.only(*columns)
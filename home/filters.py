@@ -1,11 +1,36 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
 from .models import Task
+from .search import get_search_backend
 
 class TaskFilter(filters.FilterSet):
-    status = filters.CharFilter(field_name='status', lookup_expr='iexact')
+    status = filters.CharFilter(method='filter_status')
     title = filters.CharFilter(field_name='title', lookup_expr='icontains')
     assigned_user = filters.NumberFilter(field_name='assigned_users__id')
 
     class Meta:
         model = Task
         fields = ['status', 'title', 'assigned_user']
+
+    def filter_status(self, queryset, name, value):
+        # Match case-insensitively against the known choices, then filter with an exact
+        # lookup so the (board, status, ...) indexes apply; iexact would bypass them.
+        statuses = {choice.lower(): choice for choice, _ in Task.STATUS_CHOICES}
+        status = statuses.get(value.lower())
+        if status is None:
+            return queryset.none()
+        return queryset.filter(status=status)
+
+
+class TaskSearchFilter(SearchFilter):
+    """
+    Serve `?search=` from the full-text index when the database has one, ranked
+    best match first. Falls back to DRF's LIKE search otherwise.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        backend = get_search_backend()
+        query = request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+        if backend is None or not query:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, query)
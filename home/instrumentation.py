@@ -0,0 +1,263 @@
+import atexit
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+# Histogram upper bounds; every histogram has one extra, open-ended bucket.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# Statements kept per route, ranked by total time.
+STATEMENTS_KEPT = 50
+
+_current = ContextVar('request_stats', default=None)
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+class RequestStats:
+    """ What one request cost. Doubles as the execute wrapper of every connection. """
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'statements', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        # sql -> [executions, total seconds, slowest seconds]
+        self.statements = {}
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            entry = self.statements.get(sql)
+            if entry is None:
+                self.statements[sql] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+
+
+def current_stats():
+    return _current.get()
+
+
+def _timed_data(data):
+    def timed(self):
+        stats = _current.get()
+        # Only the outermost .data is timed; nested serializers are part of it.
+        if stats is None or stats.serializing:
+            return data.fget(self)
+        stats.serializing = True
+        start = time.perf_counter()
+        try:
+            return data.fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - start
+            stats.serializing = False
+    timed.instrumented = True
+    return property(timed)
+
+
+def install_serializer_timing():
+    # Serializer.data and ListSerializer.data both end in BaseSerializer.data,
+    # which is where to_representation runs. Patched once, and only when the
+    # middleware is enabled.
+    if not getattr(BaseSerializer.data.fget, 'instrumented', False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+
+
+def _histogram(bounds):
+    return {'buckets': [0] * (len(bounds) + 1), 'sum': 0, 'max': 0}
+
+
+def _observe(histogram, bounds, value):
+    index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+    histogram['buckets'][index] += 1
+    histogram['sum'] += value
+    histogram['max'] = max(histogram['max'], value)
+
+
+def quantile(histogram, bounds, q):
+    """ Upper bound of the bucket holding the q-th quantile, capped at the observed max. """
+    total = sum(histogram['buckets'])
+    if not total:
+        return 0
+    running = 0
+    for bound, count in zip(bounds + (histogram['max'],), histogram['buckets']):
+        running += count
+        if running >= q * total:
+            return min(bound, histogram['max'])
+    return histogram['max']
+
+
+def _new_route():
+    return {
+        'requests': 0,
+        'latency_ms': _histogram(LATENCY_BUCKETS_MS),
+        'queries': _histogram(QUERY_BUCKETS),
+        'db_ms': 0,
+        'serializer_ms': 0,
+        'statements': {},
+    }
+
+
+def _merge_statement(statements, sql, count, total_ms, max_ms, max_per_request):
+    entry = statements.setdefault(sql, {'count': 0, 'total_ms': 0, 'max_ms': 0, 'max_per_request': 0})
+    entry['count'] += count
+    entry['total_ms'] += total_ms
+    entry['max_ms'] = max(entry['max_ms'], max_ms)
+    entry['max_per_request'] = max(entry['max_per_request'], max_per_request)
+
+
+def _trim_statements(statements):
+    if len(statements) > 2 * STATEMENTS_KEPT:
+        kept = sorted(statements.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:STATEMENTS_KEPT]
+        statements.clear()
+        statements.update(kept)
+
+
+class RouteHistograms:
+    """
+    Per-route aggregates for this process, written to `directory` as one JSON
+    file per process every `flush_interval` seconds and at exit.
+    """
+
+    def __init__(self, directory, flush_interval):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.path = self.directory / f'{socket.gethostname()}-{os.getpid()}-{time.time_ns()}.json'
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def record(self, route, seconds, stats):
+        with self.lock:
+            entry = self.routes.get(route)
+            if entry is None:
+                entry = self.routes[route] = _new_route()
+            entry['requests'] += 1
+            _observe(entry['latency_ms'], LATENCY_BUCKETS_MS, seconds * 1000)
+            _observe(entry['queries'], QUERY_BUCKETS, stats.queries)
+            entry['db_ms'] += stats.db_time * 1000
+            entry['serializer_ms'] += stats.serializer_time * 1000
+            for sql, (count, total, slowest) in stats.statements.items():
+                _merge_statement(entry['statements'], sql, count, total * 1000, slowest * 1000, count)
+            _trim_statements(entry['statements'])
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.routes:
+                return
+            payload = json.dumps(self.routes)
+            self.last_flush = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            file.write(payload)
+        os.replace(temp, self.path)
+
+
+def get_recorder(directory=None, flush_interval=None):
+    directory = str(directory or settings.REQUEST_INSTRUMENTATION_DIR)
+    with _recorders_lock:
+        recorder = _recorders.get(directory)
+        if recorder is None:
+            recorder = _recorders[directory] = RouteHistograms(
+                directory, flush_interval or settings.REQUEST_INSTRUMENTATION_FLUSH_INTERVAL
+            )
+    return recorder
+
+
+@atexit.register
+def flush_recorders():
+    for recorder in list(_recorders.values()):
+        recorder.flush()
+
+
+def load_routes(directory):
+    """ Merge the per-process files in `directory` into {route: aggregates}. """
+    routes = {}
+    for path in sorted(Path(directory).glob('*.json')):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for route, other in data.items():
+            entry = routes.setdefault(route, _new_route())
+            entry['requests'] += other['requests']
+            entry['db_ms'] += other['db_ms']
+            entry['serializer_ms'] += other['serializer_ms']
+            for name in ('latency_ms', 'queries'):
+                histogram = entry[name]
+                histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], other[name]['buckets'])]
+                histogram['sum'] += other[name]['sum']
+                histogram['max'] = max(histogram['max'], other[name]['max'])
+            for sql, statement in other['statements'].items():
+                _merge_statement(entry['statements'], sql, **statement)
+            _trim_statements(entry['statements'])
+    return routes
+
+
+def route_name(request):
+    match = request.resolver_match
+    # Unresolved paths share one bucket so 404 scans cannot grow the table.
+    return f'{request.method} {match.view_name if match else "<unresolved>"}'
+
+
+def server_timing(stats, seconds):
+    return ', '.join([
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+        f'serializer;dur={stats.serializer_time * 1000:.1f}',
+        f'total;dur={seconds * 1000:.1f}',
+    ])
+
+
+class InstrumentationMiddleware:
+    """
+    Records query count, DB time and serializer time per request, returns them
+    in a Server-Timing header and feeds the per-route histograms. Removes
+    itself at startup unless REQUEST_INSTRUMENTATION is on.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.recorder = get_recorder()
+        install_serializer_timing()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+        response['Server-Timing'] = server_timing(stats, elapsed)
+        self.recorder.record(route_name(request), elapsed, stats)
+        return response
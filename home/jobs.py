@@ -0,0 +1,211 @@
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+_handlers = {}
+
+
+def job(name):
+    """ Register the decorated function to run the jobs called `name`; it is called with their payload. """
+    def register(handler):
+        _handlers[name] = handler
+        return handler
+    return register
+
+
+def enqueue(name, payload=None, delay=0):
+    """
+    Queue the job `name` with a JSON-serializable `payload`. The row is
+    written in the current transaction, so the job exists exactly when the
+    write it belongs to commits, and the workers of this process are woken
+    once it has.
+    """
+    if name not in _handlers:
+        raise ValueError(f'Unknown job: {name}')
+    queued = Job.objects.create(
+        name=name, payload=payload or {}, max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    transaction.on_commit(wake)
+    return queued
+
+
+def claim(limit):
+    """
+    Take up to `limit` due jobs, oldest first, under a new claim. A job is
+    only taken if it is still queued when the UPDATE reaches it, so workers
+    in any process never run the same job at once.
+    """
+    now = timezone.now()
+    due = list(Job.objects.filter(status='queued', run_at__lte=now).order_by('run_at').values_list('id', flat=True)[:limit])
+    if not due:
+        return []
+    token = uuid.uuid4().hex
+    if not Job.objects.filter(pk__in=due, status='queued').update(status='running', claimed_by=token, claimed_at=now):
+        return []
+    return list(Job.objects.filter(claimed_by=token).order_by('run_at', 'id'))
+
+
+def backoff(attempts):
+    """ Delay before the retry after `attempts` failures: doubling from JOBS_RETRY_DELAY up to JOBS_RETRY_MAX_DELAY, jittered. """
+    delay = min(settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def run(claimed):
+    """
+    Run a claimed job. Its handler's writes and the job's deletion commit
+    together; a failure puts the job back in the queue after backoff(), or
+    marks it failed once it has used max_attempts. Returns whether it
+    succeeded, which it has not when its claim was lost and its writes were
+    rolled back.
+    """
+    mine = Job.objects.filter(pk=claimed.pk, claimed_by=claimed.claimed_by)
+    try:
+        handler = _handlers.get(claimed.name)
+        if handler is None:
+            raise LookupError(f'No handler for job {claimed.name!r}')
+        with transaction.atomic():
+            handler(claimed.payload)
+            if not mine.delete()[0]:
+                # The claim expired and the job went to another worker, which will run it.
+                transaction.set_rollback(True)
+                logger.warning('Job %s (%s) lost its claim; its writes were rolled back', claimed.pk, claimed.name)
+                return False
+        return True
+    except Exception:
+        attempts = claimed.attempts + 1
+        error = traceback.format_exc()
+        if attempts >= claimed.max_attempts:
+            logger.exception('Job %s (%s) failed after %d attempts', claimed.pk, claimed.name, attempts)
+            mine.update(status='failed', attempts=attempts, last_error=error, claimed_by='')
+        else:
+            logger.warning('Job %s (%s) failed, retrying', claimed.pk, claimed.name, exc_info=True)
+            mine.update(
+                status='queued', attempts=attempts, last_error=error, claimed_by='',
+                run_at=timezone.now() + backoff(attempts),
+            )
+        return False
+
+
+def requeue_expired():
+    """ Put back jobs claimed more than JOBS_CLAIM_TIMEOUT seconds ago by a worker that has presumably died. """
+    now = timezone.now()
+    return Job.objects.filter(
+        status='running', claimed_at__lt=now - timedelta(seconds=settings.JOBS_CLAIM_TIMEOUT)
+    ).update(status='queued', claimed_by='', run_at=now)
+
+
+def run_due(batch_size=None):
+    """ Run due jobs in this thread until none are left; returns how many succeeded. """
+    succeeded = 0
+    while jobs := claim(batch_size or settings.JOBS_BATCH_SIZE):
+        succeeded += sum(run(claimed) for claimed in jobs)
+    return succeeded
+
+
+class JobRunner:
+    """
+    `threads` worker threads, each running batches of due jobs until there
+    are none, then sleeping until wake() or for JOBS_POLL_INTERVAL seconds.
+    One of them also requeues expired claims every JOBS_CLAIM_TIMEOUT seconds.
+    """
+
+    def __init__(self, threads, batch_size=None):
+        self.batch_size = batch_size
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads = [
+            threading.Thread(target=self.work, args=(i == 0,), name=f'job-worker-{i}', daemon=True)
+            for i in range(threads)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def work(self, sweeps):
+        next_sweep = 0
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    if sweeps and time.monotonic() >= next_sweep:
+                        requeue_expired()
+                        next_sweep = time.monotonic() + settings.JOBS_CLAIM_TIMEOUT
+                    run_due(self.batch_size)
+                except Exception:
+                    logger.exception('Job worker %s failed to reach the queue', threading.current_thread().name)
+                self.wakeup.wait(settings.JOBS_POLL_INTERVAL)
+                self.wakeup.clear()
+        finally:
+            connection.close()
+
+
+_runner = None
+_runner_pid = None
+_runner_lock = threading.Lock()
+
+
+def start_workers(threads, batch_size=None):
+    """ Start this process's job runner, which wake() signals, unless it has one; returns it. """
+    global _runner, _runner_pid
+    with _runner_lock:
+        # A runner inherited through fork has no threads in this process.
+        if _runner is None or _runner_pid != os.getpid():
+            _runner = JobRunner(threads, batch_size)
+            _runner.start()
+            _runner_pid = os.getpid()
+    return _runner
+
+
+def ensure_in_process_workers():
+    """ Start JOBS_IN_PROCESS_WORKERS threads in this process unless it runs them already, or that is 0. """
+    if settings.JOBS_IN_PROCESS_WORKERS and (_runner is None or _runner_pid != os.getpid()):
+        start_workers(settings.JOBS_IN_PROCESS_WORKERS)
+
+
+def wake():
+    if _runner is not None and _runner_pid == os.getpid():
+        _runner.wakeup.set()
+
+
+class JobWorkersWSGI:
+    """
+    Starts the serving process's job workers on its first request. Starting
+    them on import would put them in the parent of a pre-forking server
+    (e.g. gunicorn --preload), whose threads its workers do not inherit.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    def __call__(self, environ, start_response):
+        ensure_in_process_workers()
+        return self.application(environ, start_response)
+
+
+class JobWorkersASGI(JobWorkersWSGI):
+    """ JobWorkersWSGI for ASGI applications. """
+
+    async def __call__(self, scope, receive, send):
+        ensure_in_process_workers()
+        return await self.application(scope, receive, send)
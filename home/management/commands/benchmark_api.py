@@ -0,0 +1,64 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from home.benchmark import DEFAULT_SIZES, compare, environment, run, scenarios, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and benchmark the API in-process: '
+        'p50/p99 latency, requests per second and queries per request per endpoint.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_SIZES.items():
+            parser.add_argument(f'--{name}', type=int, default=default, help=f'Dataset size (default {default}).')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per endpoint.')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Only these endpoints.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Baseline JSON file to diff against.')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p50 growth (0.2 = 20%%).')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULT_SIZES}
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started = time.perf_counter()
+            dataset = seed(sizes, seed=options['seed'])
+            self.stdout.write(f'Seeded {sizes} in {time.perf_counter() - started:.1f}s')
+            names = [scenario.name for scenario in scenarios(dataset)]
+            unknown = set(options['scenarios'] or []) - set(names)
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            results = run(dataset, options['scenarios'], options['requests'], options['warmup'])
+            report = {'environment': environment(), 'sizes': sizes, 'results': results}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'endpoint':<24}{'p50 ms':>10}{'p99 ms':>10}{'rps':>10}{'queries':>10}")
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<24}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['rps']:>10.1f}"
+                f"{row['queries_per_request']:>10.2f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+
+        if options['compare']:
+            with open(options['compare']) as fh:
+                regressions = compare(json.load(fh), report, options['tolerance'])
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regressions against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
@@ -0,0 +1,62 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from home.benchmark import DEFAULT_SIZES, environment, read_endpoints, run_concurrency, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare how the sync and async read views hold up '
+        'under concurrent connections with the same worker budget.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_SIZES.items():
+            parser.add_argument(f'--{name}', type=int, default=default, help=f'Dataset size (default {default}).')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help='Concurrent clients.')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per run.')
+        parser.add_argument('--workers', type=int, default=4, help='Threads serving the sync views.')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Only these endpoints.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULT_SIZES}
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started = time.perf_counter()
+            dataset = seed(sizes, seed=options['seed'])
+            self.stdout.write(f'Seeded {sizes} in {time.perf_counter() - started:.1f}s')
+            unknown = set(options['scenarios'] or []) - set(read_endpoints(dataset))
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            results = run_concurrency(
+                dataset, options['scenarios'], options['concurrency'], options['requests'], options['workers']
+            )
+            report = {
+                'environment': environment(), 'sizes': sizes, 'workers': options['workers'], 'results': results,
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{'endpoint':<20}{'clients':>8}{'sync rps':>10}{'async rps':>10}{'sync p99':>10}{'async p99':>10}"
+            f"{'sync thr':>9}{'async thr':>10}{'errors':>8}"
+        )
+        for name, runs in results.items():
+            for sync, async_ in zip(runs['sync'], runs['async']):
+                self.stdout.write(
+                    f"{name:<20}{sync['clients']:>8}{sync['rps']:>10.1f}{async_['rps']:>10.1f}"
+                    f"{sync['p99_ms']:>10.2f}{async_['p99_ms']:>10.2f}{sync['peak_threads']:>9}"
+                    f"{async_['peak_threads']:>10}{sync['errors'] + async_['errors']:>8}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
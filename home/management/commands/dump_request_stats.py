@@ -0,0 +1,87 @@
+import json
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home.instrumentation import LATENCY_BUCKETS_MS, QUERY_BUCKETS, flush_recorders, load_routes, quantile
+
+SORT_KEYS = {
+    'requests': lambda entry: entry['requests'],
+    'latency': lambda entry: entry['latency_ms']['sum'] / entry['requests'],
+    'queries': lambda entry: entry['queries']['sum'] / entry['requests'],
+}
+
+
+def summarize(entry, statements):
+    requests = entry['requests']
+    ranked = entry['statements'].items()
+    return {
+        'requests': requests,
+        'p50_ms': quantile(entry['latency_ms'], LATENCY_BUCKETS_MS, 0.5),
+        'p99_ms': quantile(entry['latency_ms'], LATENCY_BUCKETS_MS, 0.99),
+        'mean_ms': entry['latency_ms']['sum'] / requests,
+        'max_ms': entry['latency_ms']['max'],
+        'mean_queries': entry['queries']['sum'] / requests,
+        'p99_queries': quantile(entry['queries'], QUERY_BUCKETS, 0.99),
+        'max_queries': entry['queries']['max'],
+        'mean_db_ms': entry['db_ms'] / requests,
+        'mean_serializer_ms': entry['serializer_ms'] / requests,
+        'latency_histogram': dict(zip([*map(str, LATENCY_BUCKETS_MS), 'inf'], entry['latency_ms']['buckets'])),
+        'slowest': [
+            {'sql': sql, **stats}
+            for sql, stats in sorted(ranked, key=lambda item: item[1]['max_ms'], reverse=True)[:statements]
+        ],
+        # The same statement run many times in one request is the N+1 signature.
+        'repeated': [
+            {'sql': sql, **stats}
+            for sql, stats in sorted(ranked, key=lambda item: item[1]['max_per_request'], reverse=True)
+            if stats['max_per_request'] > 1
+        ][:statements],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Print the per-route request histograms collected by the instrumentation middleware.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='latency')
+        parser.add_argument('--route', help='Only routes containing this text.')
+        parser.add_argument('--statements', type=int, default=3, help='Statements listed per route.')
+        parser.add_argument('--reset', action='store_true', help='Delete the collected data afterwards.')
+
+    def handle(self, *args, **options):
+        directory = settings.REQUEST_INSTRUMENTATION_DIR
+        flush_recorders()
+        routes = {
+            route: entry for route, entry in load_routes(directory).items()
+            if not options['route'] or options['route'] in route
+        }
+        ordered = sorted(routes.items(), key=lambda item: SORT_KEYS[options['sort']](item[1]), reverse=True)
+        report = {route: summarize(entry, options['statements']) for route, entry in ordered}
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+        if options['reset']:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def print_report(self, report):
+        if not report:
+            self.stdout.write('No requests recorded.')
+        for route, row in report.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(route))
+            self.stdout.write(
+                f"  {row['requests']} requests  p50 {row['p50_ms']:.1f}ms  p99 {row['p99_ms']:.1f}ms  "
+                f"queries {row['mean_queries']:.1f} avg / {row['max_queries']} max  "
+                f"db {row['mean_db_ms']:.1f}ms  serializer {row['mean_serializer_ms']:.1f}ms"
+            )
+            for statement in row['repeated']:
+                self.stdout.write(self.style.WARNING(
+                    f"  repeated x{statement['max_per_request']}: {statement['sql'][:200]}"
+                ))
+            for statement in row['slowest']:
+                self.stdout.write(f"  slowest {statement['max_ms']:.1f}ms: {statement['sql'][:200]}")
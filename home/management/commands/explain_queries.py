@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.query_plans import explain_hot_queries
+
+
+class Command(BaseCommand):
+    help = 'Print the query plan of every hot query and fail if one scans a whole table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Also write the plans to this JSON file.')
+
+    def handle(self, *args, **options):
+        report = explain_hot_queries()
+        failed = []
+        for name, (plan, problems) in report.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if problems:
+                failed.append(name)
+                for line in problems:
+                    self.stdout.write(self.style.ERROR(f'  full scan: {line.strip()}'))
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({name: plan for name, (plan, _) in report.items()}, fh, indent=2)
+
+        if failed:
+            raise CommandError(f"Queries without a usable index: {', '.join(failed)}")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from home.changes import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than CHANGE_LOG_RETENTION, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per transaction.')
+
+    def handle(self, *args, **options):
+        total = 0
+        for deleted in prune(options['batch_size']):
+            total += deleted
+            self.stdout.write(f'Deleted {total} change log entries')
+        self.stdout.write(self.style.SUCCESS(f'Pruned {total} change log entries.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from home.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the task full-text search index in one transaction.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError('This database has no full-text search backend.')
+
+        def progress(count, last_id):
+            self.stdout.write(f'Indexed {count} tasks (up to id {last_id})')
+
+        backend.rebuild(progress=progress)
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
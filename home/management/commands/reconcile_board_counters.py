@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from home.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-board task status counters from the task table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='Only these boards.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Boards per transaction.')
+
+    def handle(self, *args, **options):
+        done = 0
+        for done in recount(board_ids=options['boards'], batch_size=options['batch_size']):
+            self.stdout.write(f'Recounted {done} boards')
+        self.stdout.write(self.style.SUCCESS(f'Board counters reconciled ({done} boards).'))
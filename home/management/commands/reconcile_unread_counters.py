@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from home.notifications import recount
+
+
+class Command(BaseCommand):
+    help = 'Recompute the unread notification counters from the notification table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only these users.')
+
+    def handle(self, *args, **options):
+        written = recount(user_ids=options['users'])
+        self.stdout.write(self.style.SUCCESS(f'Unread counters reconciled ({written} users with unread notifications).'))
@@ -0,0 +1,34 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home.jobs import run_due, start_workers
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers until stopped, or run the jobs that are due once with --once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.JOBS_WORKER_THREADS, help='Worker threads.')
+        parser.add_argument('--batch-size', type=int, default=settings.JOBS_BATCH_SIZE, help='Jobs claimed at a time.')
+        parser.add_argument('--once', action='store_true', help='Run the due jobs in this thread, then exit.')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            ran = run_due(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Ran {ran} jobs.'))
+            return
+
+        runner = start_workers(options['threads'], options['batch_size'])
+        signal.signal(signal.SIGTERM, lambda *_: runner.stopping.set())
+        self.stdout.write(f'Running {options["threads"]} job workers; stop with Ctrl-C.')
+        try:
+            while not runner.stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Jobs in progress finish; claims left behind expire after JOBS_CLAIM_TIMEOUT.
+            runner.stop(settings.JOBS_CLAIM_TIMEOUT)
+        self.stdout.write(self.style.SUCCESS('Job workers stopped.'))
@@ -0,0 +1,164 @@
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.http import Http404
+
+from .models import Board, Workspace, WorkspaceMembership
+
+WorkspaceAccess = namedtuple('WorkspaceAccess', ['workspace', 'role', 'board'])
+
+
+def resolve_workspace_access(request, workspace_pk, board_pk=None):
+    """
+    Return the workspace, the caller's role in it (None for non-members) and
+    the board when `board_pk` is given, raising Http404 if either is missing.
+
+    The answer is memoized on the request, so permissions and views share one
+    lookup, and kept in the process cache for WORKSPACE_ACCESS_CACHE_TTL
+    seconds. Membership, workspace and board writes invalidate it.
+    """
+    django_request = getattr(request, '_request', request)
+    memo = django_request.__dict__.setdefault('_workspace_access', {})
+    key = _access_key(workspace_pk, board_pk)
+    if key not in memo:
+        memo[key] = _cached_access(request.user.id, *key)
+    return memo[key]
+
+
+async def aresolve_workspace_access(request, workspace_pk, board_pk=None):
+    """ resolve_workspace_access() for async views, sharing its request memo and cache. """
+    django_request = getattr(request, '_request', request)
+    memo = django_request.__dict__.setdefault('_workspace_access', {})
+    key = _access_key(workspace_pk, board_pk)
+    if key not in memo:
+        memo[key] = await _acached_access(request.user.id, *key)
+    return memo[key]
+
+
+def load_workspace_access(user_id, workspace_pk, board_pk=None):
+    """ resolve_workspace_access() for code that has a user id but no request. """
+    return _cached_access(user_id, *_access_key(workspace_pk, board_pk))
+
+
+def _access_key(workspace_pk, board_pk):
+    try:
+        return int(workspace_pk), int(board_pk) if board_pk is not None else None
+    except (TypeError, ValueError):
+        raise Http404
+
+
+def invalidate_workspace_access(workspace_id):
+    cache.set(_generation_key(workspace_id), time.time_ns(), None)
+
+
+def cached_workspace_list(user_id, build):
+    """
+    The user's serialized workspace list, built by `build()` on a miss and kept
+    for WORKSPACE_LIST_CACHE_TTL seconds. Writes that change any member's list
+    call invalidate_workspace_lists(), which only reaches other processes when
+    the default cache is shared with them.
+    """
+    key = f'workspace-list:{_generation(_list_generation_key(user_id))}:{user_id}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.WORKSPACE_LIST_CACHE_TTL)
+    return data
+
+
+def invalidate_workspace_lists(user_ids):
+    generation = time.time_ns()
+    cache.set_many({_list_generation_key(user_id): generation for user_id in user_ids}, None)
+
+
+def _generation(generation_key):
+    generation = cache.get(generation_key)
+    if generation is None:
+        # A fresh, unique generation so entries from before an eviction stay unreachable.
+        generation = time.time_ns()
+        if not cache.add(generation_key, generation, None):
+            generation = cache.get(generation_key)
+    return generation
+
+
+def _cached_access(user_id, workspace_pk, board_pk):
+    generation = _generation(_generation_key(workspace_pk))
+    key = f'workspace-access:{generation}:{user_id}:{workspace_pk}:{board_pk}'
+    access = cache.get(key)
+    if access is None:
+        access = _load_access(user_id, workspace_pk, board_pk)
+        cache.set(key, access, settings.WORKSPACE_ACCESS_CACHE_TTL)
+    return access
+
+
+async def _ageneration(generation_key):
+    generation = await cache.aget(generation_key)
+    if generation is None:
+        generation = time.time_ns()
+        if not await cache.aadd(generation_key, generation, None):
+            generation = await cache.aget(generation_key)
+    return generation
+
+
+async def _acached_access(user_id, workspace_pk, board_pk):
+    generation = await _ageneration(_generation_key(workspace_pk))
+    key = f'workspace-access:{generation}:{user_id}:{workspace_pk}:{board_pk}'
+    access = await cache.aget(key)
+    if access is None:
+        access = await _aload_access(user_id, workspace_pk, board_pk)
+        await cache.aset(key, access, settings.WORKSPACE_ACCESS_CACHE_TTL)
+    return access
+
+
+async def _aload_access(user_id, workspace_pk, board_pk):
+    try:
+        if board_pk is None:
+            workspace = await Workspace.objects.annotate(role=_role(user_id, 'pk')).aget(pk=workspace_pk)
+            return WorkspaceAccess(workspace, workspace.role, None)
+
+        board = await Board.objects.select_related('workspace').annotate(role=_role(user_id, 'workspace_id')).aget(
+            pk=board_pk, workspace_id=workspace_pk
+        )
+    except (Workspace.DoesNotExist, Board.DoesNotExist):
+        raise Http404
+    return WorkspaceAccess(board.workspace, board.role, board)
+
+
+def _load_access(user_id, workspace_pk, board_pk):
+    try:
+        if board_pk is None:
+            workspace = Workspace.objects.annotate(role=_role(user_id, 'pk')).get(pk=workspace_pk)
+            return WorkspaceAccess(workspace, workspace.role, None)
+
+        board = Board.objects.select_related('workspace').annotate(role=_role(user_id, 'workspace_id')).get(
+            pk=board_pk, workspace_id=workspace_pk
+        )
+    except (Workspace.DoesNotExist, Board.DoesNotExist):
+        raise Http404
+    return WorkspaceAccess(board.workspace, board.role, board)
+
+
+def _role(user_id, workspace_ref):
+    return Subquery(
+        WorkspaceMembership.objects.filter(user_id=user_id, workspace_id=OuterRef(workspace_ref)).values('role')[:1]
+    )
+
+
+def _generation_key(workspace_id):
+    return f'workspace-access-generation:{workspace_id}'
+
+
+def _list_generation_key(user_id):
+    return f'workspace-list-generation:{user_id}'
+
+
+class WorkspaceAccessMixin:
+    """ Resolve the nested router's workspace (and board) once per request. """
+
+    def get_workspace_access(self):
+        return resolve_workspace_access(
+            self.request, self.kwargs.get('workspace_pk'), self.kwargs.get('board_pk')
+        )
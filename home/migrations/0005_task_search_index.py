@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from home.search import BACKENDS
+
+    backend_class = BACKENDS.get(schema_editor.connection.vendor)
+    if backend_class:
+        backend_class().install(schema_editor)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from home.search import BACKENDS
+
+    backend_class = BACKENDS.get(schema_editor.connection.vendor)
+    if backend_class:
+        backend_class().uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_task_and_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_unread(apps, schema_editor):
+    Notification = apps.get_model('home', 'Notification')
+    UnreadNotificationCounter = apps.get_model('home', 'UnreadNotificationCounter')
+    unread = Notification.objects.filter(is_read=False).values('user_id').annotate(count=models.Count('id'))
+    UnreadNotificationCounter.objects.bulk_create(
+        [UnreadNotificationCounter(user_id=row['user_id'], count=row['count']) for row in unread], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_customuser_email'),
+        ('home', '0005_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadNotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def count_tasks(apps, schema_editor):
+    from home.counters import recount
+
+    for _ in recount(task_model=apps.get_model('home', 'Task'), counter_model=apps.get_model('home', 'BoardTaskCounter')):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0006_unreadnotificationcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardTaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Todo', 'To Do'), ('Doing', 'Doing'), ('Suspend', 'Suspend'), ('Done', 'Done')], max_length=10)),
+                ('deadline', models.DateField(blank=True, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='home.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'status', 'deadline'], name='board_counter_key')],
+            },
+        ),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
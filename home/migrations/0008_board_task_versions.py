@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite adds these columns by rebuilding home_task, which drops the
+    # triggers that keep the full-text index in sync.
+    from home.search import BACKENDS
+
+    if schema_editor.connection.vendor == 'sqlite':
+        backend = BACKENDS['sqlite']()
+        backend.uninstall(schema_editor)
+        backend.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0007_boardtaskcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(reinstall_search_index, reinstall_search_index),
+    ]
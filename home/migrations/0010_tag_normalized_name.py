@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:07
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize_names(apps, schema_editor):
+    Tag = apps.get_model('home', 'Tag')
+    tags = list(Tag.objects.only('name'))
+    for tag in tags:
+        tag.normalized_name = unicodedata.normalize('NFKC', tag.name).casefold()
+    Tag.objects.bulk_update(tags, ['normalized_name'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0009_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='normalized_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(normalize_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0011_job_queue'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_user_unread',
+        ),
+    ]
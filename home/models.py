@@ -1,5 +1,8 @@
+import unicodedata
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 
@@ -36,6 +39,9 @@ class Board(models.Model):
     workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name='boards')
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Both move whenever the board or any of its tasks change; see signals.bump_board_versions.
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return self.name
@@ -44,10 +50,23 @@ class Board(models.Model):
 
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # Prefix searches read this index; see home.autocomplete. Case folding can lengthen a name.
+    normalized_name = models.CharField(max_length=150, db_index=True, editable=False, default='')
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def normalize(name):
+        return unicodedata.normalize('NFKC', name).casefold()
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = self.normalize(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        super().save(*args, **kwargs)
+
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -67,9 +86,37 @@ class Task(models.Model):
     assigned_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='assigned_tasks', blank=True)
     board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tasks')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Every task query is scoped to one board. Each sortable column leads its own
+        # index so keyset pages seek on (column, created_at, id) instead of sorting.
+        indexes = [
+            models.Index(fields=['board', 'status', 'deadline', 'created_at', 'id'], name='task_board_status_deadline'),
+            models.Index(fields=['board', 'created_at', 'id'], name='task_board_created'),
+            models.Index(fields=['board', 'deadline', 'created_at', 'id'], name='task_board_deadline'),
+            models.Index(fields=['board', 'start_date', 'created_at', 'id'], name='task_board_start_date'),
+            models.Index(fields=['board', 'end_date', 'created_at', 'id'], name='task_board_end_date'),
+            models.Index(fields=['board', 'status', 'created_at', 'id'], name='task_board_status_created'),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored values so change handlers can tell what a save changed.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        fields = [self._meta.get_field(name) for name in update_fields] if update_fields else self._meta.concrete_fields
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **{
+            field.attname: getattr(self, field.attname) for field in fields
+        }}
     
 
 class Notification(models.Model):
@@ -78,5 +125,125 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_read'),
+            models.Index(fields=['user', '-created_at'], name='notification_user_created'),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message[:20]}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored values so the unread counters can follow is_read changes.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        fields = [self._meta.get_field(name) for name in update_fields] if update_fields else self._meta.concrete_fields
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **{
+            field.attname: getattr(self, field.attname) for field in fields
+        }}
+
+
+class UnreadNotificationCounter(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='unread_notification_counter'
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.count} unread"
+
+
+class BoardTaskCounter(models.Model):
+    """
+    Number of tasks on a board per (status, deadline). Summing rows gives status
+    totals, and summing those with a past deadline gives overdue counts, without
+    touching home_task. Rows are never unique per key; only their sums matter.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='task_counters')
+    status = models.CharField(max_length=10, choices=Task.STATUS_CHOICES)
+    deadline = models.DateField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'status', 'deadline'], name='board_counter_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.board_id} {self.status} {self.deadline}: {self.count}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    A task, board or membership that was created, updated or deleted, in write
+    order. The delta-sync `changes` endpoints read it per workspace or board.
+    Rows outlive what they describe, so deletes can be synced, and are pruned
+    after CHANGE_LOG_RETENTION.
+    """
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('board', 'Board'),
+        ('membership', 'Membership'),
+    ]
+
+    workspace = models.ForeignKey(
+        Workspace, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+'
+    )
+    # The board itself for board entries, the task's board for task entries.
+    board = models.ForeignKey(
+        Board, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, related_name='+'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['workspace', 'id'], name='change_log_workspace'),
+            models.Index(fields=['board', 'id'], name='change_log_board'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} {'deleted' if self.deleted else 'changed'}"
+
+
+class Job(models.Model):
+    """
+    A side effect of a write, queued in the same transaction and run by the
+    workers of home.jobs. Jobs that succeed are deleted; jobs that run out of
+    attempts stay behind as failed, with their last error.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    # The claim a worker took the job under, and when; see home.jobs.claim.
+    claimed_by = models.CharField(max_length=64, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_due'),
+            models.Index(fields=['claimed_by'], name='job_claim'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,117 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .jobs import enqueue, job
+from .models import Notification, Task, UnreadNotificationCounter
+from .realtime import publish_notifications
+
+
+def notify(deliveries):
+    """
+    Write a batch of (user_id, message) notifications with one insert and keep
+    every recipient's unread counter in step. bulk_create sends no post_save,
+    so the counters are only incremented here.
+    """
+    deliveries = list(deliveries)
+    if not deliveries:
+        return []
+
+    notifications = Notification.objects.bulk_create(
+        [Notification(user_id=user_id, message=message) for user_id, message in deliveries]
+    )
+
+    count_unread(Counter(user_id for user_id, _ in deliveries))
+
+    publish_notifications(notifications)
+    return notifications
+
+
+def count_unread(per_user):
+    """ Add per_user ({user id: new unread notifications}) to the users' unread counters. """
+    UnreadNotificationCounter.objects.bulk_create(
+        [UnreadNotificationCounter(user_id=user_id) for user_id in per_user], ignore_conflicts=True
+    )
+    # One UPDATE per distinct increment, which is a single one in the usual case.
+    by_increment = defaultdict(list)
+    for user_id, increment in per_user.items():
+        by_increment[increment].append(user_id)
+    for increment, user_ids in by_increment.items():
+        UnreadNotificationCounter.objects.filter(user_id__in=user_ids).update(count=F('count') + increment)
+
+
+def mark_read(user, queryset):
+    """ Mark the user's unread notifications in `queryset` as read in one UPDATE. """
+    updated = queryset.filter(user=user, is_read=False).update(is_read=True)
+    if updated:
+        discount_unread(user.id, updated)
+    return updated
+
+
+def discount_unread(user_id, count):
+    # The count is unsigned, so a counter that drifted below the rows fails
+    # here instead of clamping at zero; recount() repairs it.
+    UnreadNotificationCounter.objects.filter(user_id=user_id).update(count=F('count') - count)
+
+
+def recount(user_ids=None):
+    """
+    Recompute the unread counters of `user_ids`, or of every user, from the
+    notifications, for writes that bypassed them like queryset.update().
+    Returns how many counters it wrote.
+    """
+    notifications = Notification.objects.filter(is_read=False)
+    counters = UnreadNotificationCounter.objects.all()
+    if user_ids is not None:
+        notifications = notifications.filter(user_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+    rows = notifications.values('user_id').annotate(count=Count('id')).order_by()
+    with transaction.atomic():
+        counters.delete()
+        return len(UnreadNotificationCounter.objects.bulk_create(
+            [UnreadNotificationCounter(**row) for row in rows], batch_size=1000
+        ))
+
+
+def unread_count(user):
+    return UnreadNotificationCounter.objects.filter(user_id=user.id).values_list('count', flat=True).first() or 0
+
+
+def assignment_deliveries(assigned):
+    """ assigned: {task: user ids newly assigned to it}. """
+    return [
+        (user_id, f"You have been assigned to task '{task.title}'.")
+        for task, user_ids in assigned.items() for user_id in user_ids
+    ]
+
+
+def status_change_deliveries(changes):
+    """ changes: {task: previous status}. Every assignee hears about the move. """
+    if not changes:
+        return []
+    tasks = {task.id: task for task in changes}
+    links = Task.assigned_users.through.objects.filter(task_id__in=tasks)
+    user_column = f'{Task.assigned_users.field.m2m_reverse_field_name()}_id'
+    deliveries = []
+    for task_id, user_id in links.values_list('task_id', user_column):
+        task = tasks[task_id]
+        deliveries.append((user_id, f"Task '{task.title}' moved from {changes[task]} to {task.status}."))
+    return deliveries
+
+
+def queue_notifications(assigned=None, changes=None):
+    """
+    Queue the notifications for `assigned` ({task: user ids newly assigned})
+    and `changes` ({task: previous status}) as a job, to be written by a
+    worker once the current transaction commits. Recipients and messages are
+    settled now, so a delayed or retried job still tells who it should.
+    """
+    deliveries = assignment_deliveries(assigned or {}) + status_change_deliveries(changes or {})
+    if deliveries:
+        enqueue('notifications.deliver', {'deliveries': deliveries})
+
+
+@job('notifications.deliver')
+def deliver(payload):
+    notify(payload['deliveries'])
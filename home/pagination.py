@@ -0,0 +1,209 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full sort key instead of an offset.
+
+    Every ordering is completed with `tiebreak_fields`, so the position of the
+    last row on a page is unique and the next page is a plain range query on
+    an index. NULLs keep the database's native position (largest on
+    PostgreSQL, smallest on SQLite) so the sort can be read off the index.
+    """
+    ordering_fields = ()
+    tiebreak_fields = ('created_at', 'id')
+    default_ordering = 'created_at'
+    rank_annotation = 'search_rank'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.paginate_rows(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """ paginate_queryset() for async views, reading the page through the async ORM. """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.paginate_rows([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """ The query for one row more than the requested page, or None when not paginating. """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.keys = self.get_keys(self.ordering)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse, position = self.cursor
+
+        self.reverse, self.position = reverse, position
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(position, reverse))
+        return queryset[:self.page_size + 1]
+
+    def paginate_rows(self, results):
+        reverse, position = self.reverse, self.position
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        if self.page:
+            self.next_position = self._get_position_from_instance(self.page[-1], self.keys)
+            self.previous_position = self._get_position_from_instance(self.page[0], self.keys)
+        else:
+            # An empty page past either end still links back to where it started.
+            self.next_position = self.previous_position = [self._encode_value(v) for v in position or ()]
+            self.has_next = self.has_next and position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def sort_columns(self, view):
+        """ Every column a page of `view` can be sorted on, which its rows must carry. """
+        return [*(getattr(view, 'ordering_fields', None) or self.ordering_fields), *self.tiebreak_fields]
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the single sort field requested through `?ordering=`, honouring
+        the same `ordering_fields` the view exposes to `OrderingFilter`.
+        Without one, search results come back best match first.
+        """
+        ordering_fields = getattr(view, 'ordering_fields', None) or self.ordering_fields
+        param = request.query_params.get('ordering', '')
+        for term in param.split(','):
+            term = term.strip()
+            if term.lstrip('-') in ordering_fields:
+                return term
+        if self.rank_annotation in queryset.query.annotations:
+            return self.rank_annotation
+        return self.default_ordering
+
+    def get_keys(self, ordering):
+        descending = ordering.startswith('-')
+        field = ordering.lstrip('-')
+        keys = [field] + [name for name in self.tiebreak_fields if name != field]
+        return [(name, descending) for name in keys]
+
+    def get_order_by(self, reverse):
+        order_by = []
+        for name, descending in self.keys:
+            order_by.append(F(name).desc() if descending != reverse else F(name).asc())
+        return order_by
+
+    def get_seek_filter(self, position, reverse):
+        """
+        Build `(k1, k2, ...) > (v1, v2, ...)` in the page direction, spelled
+        out as nested OR/AND terms so it works on every backend and places
+        NULLs where the database sorts them.
+        """
+        seek = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(self.keys, position):
+            seek |= equal & self._beyond(name, value, descending == reverse)
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+
+        # A redundant bound on the leading key lets the planner start the index
+        # range at the cursor instead of filtering every earlier row.
+        (name, descending), value = self.keys[0], position[0]
+        ascending = descending == reverse
+        if value is not None and not (ascending == self.nulls_largest and self._get_field(name).null):
+            seek &= Q(**{f'{name}__gte' if ascending else f'{name}__lte': value})
+        return seek
+
+    def _beyond(self, name, value, ascending):
+        nulls_after = ascending == self.nulls_largest
+        if value is None:
+            return Q(pk__in=[]) if nulls_after else Q(**{f'{name}__isnull': False})
+        lookup = Q(**{f'{name}__gt' if ascending else f'{name}__lt': value})
+        if nulls_after and self._get_field(name).null:
+            lookup |= Q(**{f'{name}__isnull': True})
+        return lookup
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            if tokens['o'] != self.ordering or len(tokens['p']) != len(self.keys):
+                raise ValueError
+            reverse = bool(tokens.get('r', 0))
+            position = [
+                None if value is None else self._get_field(name).to_python(value)
+                for (name, _), value in zip(self.keys, tokens['p'])
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse, position
+
+    def encode_cursor(self, cursor):
+        reverse, position = cursor
+        tokens = {'o': self.ordering, 'p': position}
+        if reverse:
+            tokens['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(tokens, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor((False, self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor((True, self.previous_position))
+
+    def _get_field(self, name):
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        return self.model._meta.get_field(name)
+
+    def _get_position_from_instance(self, instance, keys):
+        position = []
+        for name, _ in keys:
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(self._encode_value(value))
+        return position
+
+    def _encode_value(self, value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    ordering_fields = ('created_at', 'start_date', 'end_date', 'deadline', 'status')
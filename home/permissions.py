@@ -1,6 +1,5 @@
 from rest_framework.permissions import BasePermission
-from .models import Workspace
-from django.shortcuts import get_object_or_404
+from .membership import aresolve_workspace_access, resolve_workspace_access
 
 class IsWorkspaceMember(BasePermission):
 
@@ -9,12 +8,20 @@ class IsWorkspaceMember(BasePermission):
         workspace_pk = view.kwargs.get('workspace_pk')
         if not workspace_pk:
             return False
-        
-        workspace = get_object_or_404(Workspace, id=workspace_pk)
-        return workspace.memberships.filter(user=request.user).exists()
+
+        access = resolve_workspace_access(request, workspace_pk, view.kwargs.get('board_pk'))
+        return access.role is not None
+
+    async def has_permission_async(self, request, view):
+        workspace_pk = view.kwargs.get('workspace_pk')
+        if not workspace_pk:
+            return False
+
+        access = await aresolve_workspace_access(request, workspace_pk, view.kwargs.get('board_pk'))
+        return access.role is not None
     
 
 class IsWorkspaceCreator(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        return obj.created_by == request.user
+        return obj.created_by_id == request.user.id
@@ -0,0 +1,57 @@
+import re
+from datetime import date, datetime, timezone
+
+from django.db import connection
+
+from .models import Job, Notification, Task, WorkspaceMembership
+from .pagination import TaskCursorPagination
+
+# Plan lines that mean a table is read without an index (SQLite and PostgreSQL)
+# or that rows are sorted after the fact instead of read in index order.
+FULL_SCAN_PATTERNS = [
+    re.compile(r'\bSCAN (?!.*\bUSING\b.*\bINDEX\b)(\w+)'),
+    re.compile(r'\bUSE TEMP B-TREE FOR ORDER BY\b'),
+    re.compile(r'\bSeq Scan on (\w+)'),
+]
+
+
+def _task_page(ordering, position=None, **filters):
+    paginator = TaskCursorPagination()
+    paginator.model = Task
+    paginator.annotations = {}
+    paginator.nulls_largest = connection.features.nulls_order_largest
+    paginator.keys = paginator.get_keys(ordering)
+
+    queryset = Task.objects.filter(board_id=1, **filters).order_by(*paginator.get_order_by(False))
+    if position is not None:
+        queryset = queryset.filter(paginator.get_seek_filter(position, False))
+    return queryset[:paginator.page_size + 1]
+
+
+def hot_queries():
+    """ The queries behind the busiest endpoints, built the way the views build them. """
+    day = date(2024, 1, 1)
+    moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        'task page': _task_page('created_at'),
+        'task page after cursor': _task_page('created_at', [moment, 1]),
+        'task page by deadline': _task_page('deadline', [day, moment, 1]),
+        'task page by start date': _task_page('start_date', [day, moment, 1]),
+        'task page by end date': _task_page('end_date', [day, moment, 1]),
+        'task page by status': _task_page('status', ['Todo', moment, 1]),
+        'task page filtered by status': _task_page('deadline', [day, moment, 1], status='Todo'),
+        'notification list': Notification.objects.filter(user_id=1).order_by('-created_at')[:50],
+        'unread notifications': Notification.objects.filter(user_id=1, is_read=False).values('id'),
+        'membership lookup': WorkspaceMembership.objects.filter(workspace_id=1, user_id=1).values('role'),
+        'due jobs': Job.objects.filter(status='queued', run_at__lte=moment).order_by('run_at').values('id')[:10],
+    }
+
+
+def explain_hot_queries():
+    """ Return {name: (plan, problems)} for every hot query. """
+    report = {}
+    for name, queryset in hot_queries().items():
+        plan = queryset.explain()
+        problems = [line for line in plan.splitlines() if any(p.search(line) for p in FULL_SCAN_PATTERNS)]
+        report[name] = (plan, problems)
+    return report
@@ -0,0 +1,383 @@
+import asyncio
+import functools
+import json
+import threading
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import Http404
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .models import Board
+
+# Put in a subscription's queue in place of everything it held when it fell too far behind.
+EVICTED = object()
+PING = '{"type":"ping"}'
+ACCESS_REVOKED = '{"type":"access.revoked"}'
+# Task attributes sent in events, and the keys they are sent under.
+TASK_FIELDS = {
+    'title': 'title',
+    'description': 'description',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'deadline': 'deadline',
+    'status': 'status',
+    'board_id': 'board',
+}
+
+
+class Subscription:
+    """
+    One connection's bounded queue of encoded events. Events arrive from any
+    thread; a subscriber that lets the queue fill up is evicted instead of
+    buffered without bound, and resyncs through the changes endpoints.
+    """
+
+    def __init__(self, channels, maxsize):
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.evicted = False
+
+    def deliver(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The connection's loop is gone; unsubscribe is on its way.
+            pass
+
+    def _put(self, message):
+        if self.evicted:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.evicted = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(EVICTED)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BaseBroker:
+    """
+    Routes published events to the subscriptions of this process by channel.
+
+    publish() may be called from any thread with a JSON string. Brokers for
+    several nodes override it to send the event to every node, where it is
+    handed to deliver(), and leave has_subscribers() answering True.
+    """
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, channels, maxsize=None):
+        subscription = Subscription(channels, maxsize or settings.REALTIME_QUEUE_SIZE)
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscriptions[channel]
+
+    def has_subscribers(self):
+        """ Whether publishing can reach anyone; False lets writers skip building events. """
+        return True
+
+    def publish(self, channels, message):
+        raise NotImplementedError
+
+    def deliver(self, channels, message):
+        # A subscriber on several of the channels gets the event once.
+        with self.lock:
+            targets = set().union(*(self.subscriptions.get(channel, ()) for channel in channels))
+        for subscription in targets:
+            subscription.deliver(message)
+
+
+class InProcessBroker(BaseBroker):
+    """ Events reach the subscribers of this process only: one ASGI server process, or tests. """
+
+    def has_subscribers(self):
+        return bool(self.subscriptions)
+
+    def publish(self, channels, message):
+        self.deliver(channels, message)
+
+
+@functools.cache
+def get_broker():
+    return import_string(settings.REALTIME_BROKER)()
+
+
+@functools.lru_cache(maxsize=4096)
+def board_workspace(board_id):
+    return Board.objects.filter(pk=board_id).values_list('workspace_id', flat=True).first()
+
+
+def publish(channels, event):
+    """ Send `event` to `channels` once the current transaction commits. """
+    broker = get_broker()
+    message = event if isinstance(event, str) else json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':'))
+    transaction.on_commit(lambda: broker.publish(channels, message))
+
+
+def board_channels(*board_ids):
+    channels = set()
+    for board_id in board_ids:
+        channels.add(f'board:{board_id}')
+        workspace_id = board_workspace(board_id)
+        if workspace_id is not None:
+            channels.add(f'workspace:{workspace_id}')
+    return channels
+
+
+def task_fields(task, attnames=TASK_FIELDS):
+    return {TASK_FIELDS[attname]: getattr(task, attname) for attname in attnames}
+
+
+def publish_task_created(task):
+    if get_broker().has_subscribers():
+        publish(board_channels(task.board_id), {
+            'type': 'task.created', 'board': task.board_id, 'task': {'id': task.pk, **task_fields(task)},
+        })
+
+
+def publish_task_updated(task, previous):
+    """ `previous`: the task's attribute values before the write; only what differs is sent. """
+    changed = [attname for attname in TASK_FIELDS if attname in previous and previous[attname] != getattr(task, attname)]
+    if changed and get_broker().has_subscribers():
+        board_ids = {task.board_id, previous.get('board_id', task.board_id)}
+        publish(board_channels(*board_ids), {
+            'type': 'task.updated', 'board': task.board_id, 'id': task.pk, 'changes': task_fields(task, changed),
+        })
+
+
+def publish_task_deleted(task_id, board_id):
+    if get_broker().has_subscribers():
+        publish(board_channels(board_id), {'type': 'task.deleted', 'board': board_id, 'id': task_id})
+
+
+def publish_task_relations(task_id, board_id, field, added=(), removed=(), cleared=False):
+    """ Assignee or tag ids added to or removed from a task. """
+    if get_broker().has_subscribers():
+        event = {'type': 'task.relations', 'board': board_id, 'id': task_id, 'field': field}
+        if cleared:
+            event['cleared'] = True
+        else:
+            event.update(added=sorted(added), removed=sorted(removed))
+        publish(board_channels(board_id), event)
+
+
+def publish_notifications(notifications):
+    if get_broker().has_subscribers():
+        for notification in notifications:
+            publish({f'user:{notification.user_id}'}, {
+                'type': 'notification.created',
+                'notification': {
+                    'id': notification.pk, 'message': notification.message,
+                    'created_at': notification.created_at, 'is_read': notification.is_read,
+                },
+            })
+
+
+def publish_access_revoked(user_id, workspace_id):
+    if get_broker().has_subscribers():
+        publish({access_channel(user_id, workspace_id)}, ACCESS_REVOKED)
+
+
+def access_channel(user_id, workspace_id):
+    return f'access:{workspace_id}:{user_id}'
+
+
+class Refused(Exception):
+    def __init__(self, code, reason):
+        super().__init__(reason)
+        self.code = code
+        self.reason = reason
+
+
+def authorize(token, workspace_pk=None, board_pk=None):
+    """
+    The channels a connection with this access token may listen on: the user's
+    own notifications, plus the workspace or board asked for when the user is a
+    member. Raises Refused otherwise.
+    """
+    from accounts.authentication import StatelessJWTAuthentication
+    from .membership import load_workspace_access
+
+    authentication = StatelessJWTAuthentication()
+    try:
+        user = authentication.get_user(authentication.get_validated_token(token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        raise Refused(4401, 'Authentication credentials were not provided or are invalid.')
+
+    channels = {f'user:{user.pk}'}
+    if workspace_pk is not None:
+        try:
+            access = load_workspace_access(user.pk, workspace_pk, board_pk)
+        except Http404:
+            raise Refused(4404, 'Not found.')
+        if access.role is None:
+            raise Refused(4403, 'You do not have permission to access this workspace.')
+        channels.add(f'board:{access.board.pk}' if access.board else f'workspace:{access.workspace.pk}')
+        channels.add(access_channel(user.pk, access.workspace.pk))
+    return channels
+
+
+def connection_params(scope):
+    params = {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+    # Browsers cannot set headers on WebSocket or EventSource connections, so
+    # the token may come in the query string instead.
+    token = params.get('token')
+    for name, value in scope.get('headers', []):
+        if name == b'authorization' and value.startswith(b'Bearer '):
+            token = value[len(b'Bearer '):].decode()
+    return token, params.get('workspace'), params.get('board')
+
+
+async def stream(subscription, emit, wait_for_disconnect):
+    """
+    Pass the subscription's events to `emit` until the client leaves (returns
+    None), the subscription is evicted ('evicted') or access to the workspace is
+    revoked ('revoked'). emit(None) is a heartbeat.
+    """
+    heartbeat = settings.REALTIME_HEARTBEAT_SECONDS
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    getter = None
+    try:
+        while True:
+            getter = getter or asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({getter, disconnected}, timeout=heartbeat, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                return None
+            if getter not in done:
+                await emit(None)
+                continue
+            message, getter = getter.result(), None
+            if message is EVICTED:
+                return 'evicted'
+            await emit(message)
+            if message == ACCESS_REVOKED:
+                return 'revoked'
+    finally:
+        for task in (getter, disconnected):
+            if task is not None:
+                task.cancel()
+        get_broker().unsubscribe(subscription)
+
+
+CLOSE_REASONS = {
+    'evicted': (4408, 'Too far behind; resync through the changes endpoint.'),
+    'revoked': (4403, 'Access to the workspace was revoked.'),
+}
+
+
+async def websocket_endpoint(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    token, workspace, board = connection_params(scope)
+    try:
+        channels = await sync_to_async(authorize)(token, workspace, board)
+    except Refused as refused:
+        await send({'type': 'websocket.close', 'code': refused.code, 'reason': refused.reason})
+        return
+    # Subscribed before accepting, so nothing published after the handshake is missed.
+    subscription = get_broker().subscribe(channels)
+    await send({'type': 'websocket.accept'})
+
+    async def emit(text):
+        await send({'type': 'websocket.send', 'text': text or PING})
+
+    async def wait_for_disconnect():
+        # Anything the client sends is ignored.
+        while (await receive())['type'] != 'websocket.disconnect':
+            pass
+
+    outcome = await stream(subscription, emit, wait_for_disconnect)
+    if outcome is not None:
+        code, reason = CLOSE_REASONS[outcome]
+        await send({'type': 'websocket.close', 'code': code, 'reason': reason})
+
+
+async def event_stream_endpoint(scope, receive, send):
+    if scope['method'] != 'GET':
+        await send_json(send, 405, {'detail': f'Method "{scope["method"]}" not allowed.'})
+        return
+    token, workspace, board = connection_params(scope)
+    try:
+        channels = await sync_to_async(authorize)(token, workspace, board)
+    except Refused as refused:
+        await send_json(send, {4401: 401, 4403: 403, 4404: 404}[refused.code], {'detail': refused.reason})
+        return
+    subscription = get_broker().subscribe(channels)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [
+        (b'content-type', b'text/event-stream'),
+        (b'cache-control', b'no-cache'),
+        # Stops nginx from buffering the stream.
+        (b'x-accel-buffering', b'no'),
+    ]})
+    await send({'type': 'http.response.body', 'body': b': connected\n\n', 'more_body': True})
+
+    async def emit(text):
+        body = f'data: {text}\n\n'.encode() if text else b': ping\n\n'
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+    async def wait_for_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    outcome = await stream(subscription, emit, wait_for_disconnect)
+    if outcome is not None:
+        code, reason = CLOSE_REASONS[outcome]
+        body = f'event: close\ndata: {json.dumps({"code": code, "reason": reason})}\n\n'.encode()
+        await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+
+async def send_json(send, status, data):
+    body = json.dumps(data).encode()
+    await send({'type': 'http.response.start', 'status': status, 'headers': [
+        (b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()),
+    ]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+class RealtimeRouter:
+    """
+    ASGI application serving realtime events next to Django: a WebSocket at
+    REALTIME_PATH and server-sent events at REALTIME_PATH + 'events/'. Both take
+    `token` (an access token, or an Authorization header) and optionally
+    `workspace`, or `workspace` and `board`, as query parameters, and push the
+    user's notifications plus task changes in that workspace or board as
+    compact JSON events. Everything else goes to `application`.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        path = settings.REALTIME_PATH
+        if scope['type'] == 'websocket':
+            if scope['path'] == path:
+                return await websocket_endpoint(scope, receive, send)
+            await receive()
+            return await send({'type': 'websocket.close', 'code': 4404})
+        if scope['type'] == 'http' and scope['path'] == f'{path}events/':
+            return await event_stream_endpoint(scope, receive, send)
+        return await self.application(scope, receive, send)
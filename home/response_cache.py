@@ -0,0 +1,189 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework.response import Response
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+# Per cache name, like LocMemCache's own stores: {key: pickled size} and the total.
+_sizes = {}
+_usage = {}
+
+
+def record(event, count=1):
+    with _metrics_lock:
+        _metrics[event] += count
+
+
+def metrics():
+    """ This process's response cache hits, misses, coalesced waits and evictions. """
+    with _metrics_lock:
+        return {event: _metrics[event] for event in ('hits', 'misses', 'coalesced', 'evictions')}
+
+
+class LRUMemoryCache(LocMemCache):
+    """
+    LocMemCache evicting the least recently used entry, one at a time, once
+    MAX_ENTRIES entries or MAX_BYTES of pickled values are stored, instead of
+    culling a fraction of the cache. Evictions are counted in metrics().
+    Values larger than MAX_BYTES are not stored.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._max_bytes = int(params.get('OPTIONS', {}).get('MAX_BYTES', 0)) or None
+        self._sizes = _sizes.setdefault(name, {})
+        self._usage = _usage.setdefault(name, [0])
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        size = len(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            self._delete(key)
+            return
+        self._delete(key)
+        while self._cache and (
+            len(self._cache) >= self._max_entries
+            or self._max_bytes is not None and self._usage[0] + size > self._max_bytes
+        ):
+            self._delete(next(reversed(self._cache)))
+            record('evictions')
+        super()._set(key, value, timeout)
+        self._sizes[key] = size
+        self._usage[0] += size
+
+    def _delete(self, key):
+        deleted = super()._delete(key)
+        if deleted:
+            self._usage[0] -= self._sizes.pop(key, 0)
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._sizes.clear()
+            self._usage[0] = 0
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _generation_key(dependency):
+    return f'response-generation:{dependency}'
+
+
+def generations(dependencies):
+    """ The current generation of each dependency, starting missing ones at a fresh, unique value. """
+    cache = get_cache()
+    keys = [_generation_key(dependency) for dependency in dependencies]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            generation = time.time_ns()
+            found[key] = generation if cache.add(key, generation, None) else cache.get(key, generation)
+    return [found[key] for key in keys]
+
+
+def invalidate(dependencies):
+    """
+    Make every cached response depending on `dependencies` unreachable: now,
+    and again once the transaction commits, so a response rebuilt from the
+    rows before the commit is not served afterwards.
+    """
+    dependencies = set(dependencies)
+    if not dependencies or settings.RESPONSE_CACHE_ALIAS is None:
+        return
+
+    def bump():
+        generation = time.time_ns()
+        get_cache().set_many({_generation_key(dependency): generation for dependency in dependencies}, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def cached(key, build, timeout=DEFAULT_TIMEOUT):
+    """
+    The value cached under `key`, built by `build()` on a miss. Only one
+    caller rebuilds a missing key at a time; the others wait up to
+    RESPONSE_CACHE_LOCK_TIMEOUT seconds for its result before building their
+    own. Returns the value and whether it came from the cache.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        record('hits')
+        return value, True
+
+    lock = f'{key}:lock'
+    if not cache.add(lock, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(settings.RESPONSE_CACHE_POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                record('coalesced')
+                return value, True
+            if not cache.has_key(lock):
+                break
+        record('misses')
+        return build(), False
+
+    record('misses')
+    try:
+        value = build()
+        cache.set(key, value, timeout)
+    finally:
+        cache.delete(lock)
+    return value, False
+
+
+class ResponseCacheMixin:
+    """
+    Cache the data of `list` responses in the RESPONSE_CACHE_ALIAS cache, keyed
+    by the full URL, the caller's audience and the generations of
+    get_cache_dependencies(). Signal receivers call invalidate() with the
+    dependencies a write touches. On views that also answer conditionally, the
+    key includes the validators the ETag is built from, so a write that only
+    another process saw cannot pair a new ETag with an old cached body.
+    Permissions are checked before the cache is
+    consulted; views whose output differs between callers that share an
+    audience must not use this.
+    """
+    cache_timeout = DEFAULT_TIMEOUT
+
+    def get_cache_dependencies(self):
+        raise NotImplementedError
+
+    def get_cache_audience(self):
+        """ What callers must have in common to share a cached response. """
+        return 'all'
+
+    def get_cache_key(self, request):
+        dependencies = self.get_cache_dependencies()
+        generation = ':'.join(str(value) for value in generations(dependencies))
+        validators = getattr(self, 'current_validators', None)
+        url = hashlib.md5(
+            f'{validators}:{request.build_absolute_uri()}'.encode(), usedforsecurity=False
+        ).hexdigest()
+        return f'response:{request.resolver_match.view_name}:{self.get_cache_audience()}:{generation}:{url}'
+
+    def list(self, request, *args, **kwargs):
+        if settings.RESPONSE_CACHE_ALIAS is None:
+            return super().list(request, *args, **kwargs)
+
+        def build():
+            return super(ResponseCacheMixin, self).list(request, *args, **kwargs).data
+
+        data, hit = cached(self.get_cache_key(request), build, self.cache_timeout)
+        response = Response(data)
+        response['X-Cache'] = 'hit' if hit else 'miss'
+        return response
@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+class BaseSearchBackend:
+    """
+    Full-text search over task titles and descriptions.
+
+    `search()` filters a Task queryset to the matches and annotates
+    `search_rank`, where lower sorts first on every backend.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def install(self, schema_editor):
+        raise NotImplementedError
+
+    def uninstall(self, schema_editor):
+        raise NotImplementedError
+
+    def rebuild(self, progress=None):
+        """ Reindex every task, calling progress(tasks indexed, last task id) when done. """
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    An external-content FTS5 table over home_task. Triggers keep it in sync on
+    every insert, update and delete, bulk writes included.
+    """
+    table = 'home_task_fts'
+
+    def search(self, queryset, query):
+        match = self.to_match_expression(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [match])
+        ).annotate(search_rank=RawSQL(
+            f'SELECT rank FROM {self.table} WHERE {self.table} MATCH %s AND rowid = home_task.id',
+            [match], output_field=FloatField(),
+        ))
+
+    def to_match_expression(self, query):
+        # Quote every term so user input is never parsed as FTS5 syntax, and let
+        # the last one match as a prefix for type-ahead.
+        terms = ['"{}"'.format(term.replace('"', '""')) for term in query.split()]
+        if not terms:
+            return None
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def install(self, schema_editor):
+        table = self.table
+        for statement in [
+            f"CREATE VIRTUAL TABLE {table} USING fts5(title, description, content='home_task', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            # Title matches outweigh description matches.
+            f"INSERT INTO {table}({table}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+            f"CREATE TRIGGER {table}_ai AFTER INSERT ON home_task BEGIN "
+            f"INSERT INTO {table}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+            f"CREATE TRIGGER {table}_ad AFTER DELETE ON home_task BEGIN "
+            f"INSERT INTO {table}({table}, rowid, title, description) "
+            f"VALUES ('delete', old.id, old.title, old.description); END",
+            f"CREATE TRIGGER {table}_au AFTER UPDATE OF title, description ON home_task BEGIN "
+            f"INSERT INTO {table}({table}, rowid, title, description) "
+            f"VALUES ('delete', old.id, old.title, old.description); "
+            f"INSERT INTO {table}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+            f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+        ]:
+            schema_editor.execute(statement)
+
+    def uninstall(self, schema_editor):
+        for suffix in ['ai', 'ad', 'au']:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {self.table}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def rebuild(self, progress=None):
+        # FTS5's own rebuild rereads home_task in one statement, in the same
+        # transaction as the count, so searches keep the old index until it
+        # commits and a task written meanwhile waits for it instead of being
+        # indexed twice.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+            cursor.execute('SELECT COUNT(*), MAX(id) FROM home_task')
+            count, last_id = cursor.fetchone()
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('optimize')")
+        if progress:
+            progress(count, last_id)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    A stored generated tsvector column with a GIN index. PostgreSQL recomputes
+    it on every write, so there is nothing to keep in sync by hand.
+    """
+    config = 'english'
+
+    def search(self, queryset, query):
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        return queryset.alias(
+            search_match=RawSQL(f'home_task.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(f'-ts_rank(home_task.search_vector, {tsquery})', [query], output_field=FloatField())
+        )
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"ALTER TABLE home_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{self.config}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce(description, '')), 'B')) STORED"
+        )
+        schema_editor.execute('CREATE INDEX home_task_search_idx ON home_task USING GIN (search_vector)')
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute('DROP INDEX IF EXISTS home_task_search_idx')
+        schema_editor.execute('ALTER TABLE home_task DROP COLUMN IF EXISTS search_vector')
+
+    def rebuild(self, progress=None):
+        with connection.cursor() as cursor:
+            cursor.execute('REINDEX INDEX home_task_search_idx')
+            cursor.execute('SELECT COUNT(*), MAX(id) FROM home_task')
+            count, last_id = cursor.fetchone()
+        if progress:
+            progress(count, last_id)
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    """
+    Return the TASK_SEARCH_BACKEND instance, or the backend for the database
+    vendor when that setting is unset. None means plain LIKE search.
+    """
+    path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    backend_class = BACKENDS.get(vendor or connection.vendor)
+    return backend_class() if backend_class else None
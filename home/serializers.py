@@ -1,6 +1,15 @@
+from collections import defaultdict
+from functools import lru_cache, partial
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from .models import Workspace, Board, Tag, Task, WorkspaceMembership, Notification
+from .compiled import CompiledSerializer
+from .fieldsets import ALL_FIELDS, SparseFieldsetSerializerMixin
+from .response_cache import invalidate as invalidate_responses
+from .signals import bulk_task_deletes, tasks_bulk_changed
 
 class WorkspaceSerializer(serializers.ModelSerializer):
     created_by = serializers.StringRelatedField(read_only=True)
@@ -10,8 +19,18 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'created_by', 'created_at']
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class WorkspaceListSerializer(WorkspaceSerializer):
+    role = serializers.CharField(read_only=True)
+    board_count = serializers.IntegerField(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta(WorkspaceSerializer.Meta):
+        fields = WorkspaceSerializer.Meta.fields + ['role', 'board_count', 'member_count']
+
+
+class BoardSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     workspace = serializers.PrimaryKeyRelatedField(queryset=Workspace.objects.all())
+    expandable_fields = {'workspace': None}
 
     class Meta:
         model = Board
@@ -19,11 +38,20 @@ class BoardSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['workspace'] = {'id': instance.workspace.id,
-        'name': instance.workspace.name,
-        }
+        if self.selection.expands('workspace'):
+            representation['workspace'] = {'id': instance.workspace.id,
+            'name': instance.workspace.name,
+            }
         return representation
 
+    @classmethod
+    @lru_cache(maxsize=64)
+    def compiled(cls, selection=ALL_FIELDS):
+        nested = {}
+        if selection.expands('workspace'):
+            nested['workspace'] = (['workspace_id', 'workspace__name'], lambda id, name: {'id': id, 'name': name})
+        return CompiledSerializer(cls, nested=nested, context={'selection': selection})
+
 
 class WorkspaceMembershipSerializer(serializers.ModelSerializer):
     class Meta:
@@ -43,9 +71,36 @@ class TagSerializer(serializers.ModelSerializer):
 
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     assigned_users = serializers.StringRelatedField(many=True)
+    expandable_fields = {
+        'tags': lambda: serializers.PrimaryKeyRelatedField(many=True, read_only=True),
+        'assigned_users': lambda: serializers.PrimaryKeyRelatedField(many=True, read_only=True),
+    }
+
+    @staticmethod
+    def setup_eager_loading(queryset, selection=ALL_FIELDS):
+        # Load every task's tags and assignees in one query each instead of one per row,
+        # and only the ones the selection renders.
+        prefetches = []
+        if selection.includes('tags'):
+            tags = Tag.objects.order_by('id')
+            prefetches.append(Prefetch('tags', queryset=tags if selection.expands('tags') else tags.only('id')))
+        if selection.includes('assigned_users'):
+            users = get_user_model().objects.only('id', 'username').order_by('id')
+            if not selection.expands('assigned_users'):
+                users = users.only('id')
+            prefetches.append(Prefetch('assigned_users', queryset=users))
+        return queryset.prefetch_related(*prefetches)
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def compiled(cls, selection=ALL_FIELDS):
+        return CompiledSerializer(cls, context={'selection': selection}, related={
+            'tags': partial(load_task_tags, expand=selection.expands('tags')),
+            'assigned_users': partial(load_task_assignees, expand=selection.expands('assigned_users')),
+        })
 
     class Meta:
         model = Task
@@ -68,6 +123,29 @@ class TaskSerializer(serializers.ModelSerializer):
             return representation
 
 
+def load_task_tags(task_ids, expand=True):
+    """ {task id: [tag or tag id]} for TaskSerializer.compiled(), in the order setup_eager_loading() gives. """
+    tags = defaultdict(list)
+    links = Task.tags.through.objects.filter(task_id__in=task_ids).order_by('tag_id')
+    if not expand:
+        for task_id, tag_id in links.values_list('task_id', 'tag_id'):
+            tags[task_id].append(tag_id)
+        return tags
+    for task_id, tag_id, name in links.values_list('task_id', 'tag_id', 'tag__name'):
+        tags[task_id].append({'id': tag_id, 'name': name})
+    return tags
+
+
+def load_task_assignees(task_ids, expand=True):
+    """ {task id: [str(user) or user id]} for TaskSerializer.compiled(); a user renders as their username. """
+    users = defaultdict(list)
+    user_field = Task.assigned_users.field.m2m_reverse_field_name()
+    links = Task.assigned_users.through.objects.filter(task_id__in=task_ids).order_by(f'{user_field}_id')
+    for task_id, user in links.values_list('task_id', f'{user_field}__username' if expand else f'{user_field}_id'):
+        users[task_id].append(user)
+    return users
+
+
 class TaskWriteSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(child=serializers.CharField(), write_only=True)
     assigned_users = serializers.ListField(child=serializers.IntegerField(), write_only=True)
@@ -79,44 +157,219 @@ class TaskWriteSerializer(serializers.ModelSerializer):
             'status', 'tags', 'board', 'assigned_users'
         ]
 
+    def validate_tags(self, value):
+        return list(dict.fromkeys(value))
+
+    def validate_assigned_users(self, value):
+        return list(dict.fromkeys(value))
+
+    @transaction.atomic
     def create(self, validated_data):
         tags_data = validated_data.pop('tags', [])
         assigned_users_data = validated_data.pop('assigned_users', [])
         task = Task.objects.create(**validated_data)
 
-        # Add tags
-        for tag_name in tags_data:
-            tag, created = Tag.objects.get_or_create(name=tag_name)
-            task.tags.add(tag)
-
-        # Assign users
-        for user_id in assigned_users_data:
-            user = get_user_model().objects.get(id=user_id)
-            task.assigned_users.add(user)
+        if tags_data:
+            task.tags.add(*resolve_tags(tags_data))
+        if assigned_users_data:
+            task.assigned_users.add(*assigned_users_data)
 
         return task
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        tags_data = validated_data.pop('tags', [])
-        assigned_users_data = validated_data.pop('assigned_users', [])
+        tags_data = validated_data.pop('tags', None)
+        assigned_users_data = validated_data.pop('assigned_users', None)
         instance = super().update(instance, validated_data)
 
-        # Update tags
-        instance.tags.clear()
-        for tag_name in tags_data:
-            tag, created = Tag.objects.get_or_create(name=tag_name)
-            instance.tags.add(tag)
-
-        # Update assigned users
-        instance.assigned_users.clear()
-        for user_id in assigned_users_data:
-            user = get_user_model().objects.get(id=user_id)
-            instance.assigned_users.add(user)
+        # set() only writes the rows that differ from what is stored.
+        if tags_data is not None:
+            instance.tags.set(resolve_tags(tags_data))
+        if assigned_users_data is not None:
+            instance.assigned_users.set(assigned_users_data)
 
         return instance
-    
+
+
+def resolve_tags(names):
+    """ Return Tag rows for `names`, creating the missing ones: one query when all exist, three otherwise. """
+    if not names:
+        return []
+    tags = list(Tag.objects.filter(name__in=names))
+    missing = set(names) - {tag.name for tag in tags}
+    if not missing:
+        return tags
+    # bulk_create sends no post_save, so the tag list is invalidated here.
+    Tag.objects.bulk_create(
+        [Tag(name=name, normalized_name=Tag.normalize(name)) for name in missing], ignore_conflicts=True
+    )
+    invalidate_responses(['tags'])
+    return list(Tag.objects.filter(name__in=names))
+
+class TaskBulkItemSerializer(TaskWriteSerializer):
+    tags = serializers.ListField(child=serializers.CharField(), write_only=True, required=False)
+    assigned_users = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
+
+    class Meta(TaskWriteSerializer.Meta):
+        fields = [field for field in TaskWriteSerializer.Meta.fields if field != 'board']
+
+
+class TaskBulkOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['create', 'update', 'delete'])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'This field is required for update and delete.'})
+        return attrs
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """ Create, update and delete many tasks of the board in `context['board']` at once. """
+
+    operations = TaskBulkOperationSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_operations(self, operations):
+        board = self.context['board']
+        errors = [{} for _ in operations]
+
+        targets = [operation['id'] for operation in operations if operation['op'] != 'create']
+        self.tasks = Task.objects.filter(board=board).in_bulk(targets)
+        seen = set()
+        for index, operation in enumerate(operations):
+            if operation['op'] != 'create':
+                if operation['id'] not in self.tasks:
+                    errors[index]['id'] = 'Task not found on this board.'
+                elif operation['id'] in seen:
+                    errors[index]['id'] = 'Task appears in more than one operation.'
+                seen.add(operation['id'])
+            if operation['op'] == 'delete':
+                continue
+
+            item = TaskBulkItemSerializer(data=operation['data'], partial=operation['op'] == 'update')
+            if item.is_valid():
+                operation['validated_data'] = item.validated_data
+            else:
+                errors[index].update(item.errors)
+
+        # One membership query covers every assignee in the batch.
+        user_ids = {
+            user_id for operation in operations
+            for user_id in operation.get('validated_data', {}).get('assigned_users', [])
+        }
+        members = set(WorkspaceMembership.objects.filter(
+            workspace_id=board.workspace_id, user_id__in=user_ids
+        ).values_list('user_id', flat=True)) if user_ids else set()
+        for index, operation in enumerate(operations):
+            for user_id in operation.get('validated_data', {}).get('assigned_users', []):
+                if user_id not in members:
+                    errors[index].setdefault('assigned_users', []).append(
+                        f'User with id {user_id} is not a member of the workspace.'
+                    )
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return operations
+
+    def create(self, validated_data):
+        board = self.context['board']
+        operations = validated_data['operations']
+        created, updated, previous, deleted, pending = [], [], {}, [], []
+        update_fields = set()
+
+        for operation in operations:
+            data = dict(operation.get('validated_data', {}))
+            tags_data = data.pop('tags', None)
+            assigned_users_data = data.pop('assigned_users', None)
+
+            if operation['op'] == 'create':
+                task = Task(board=board, **data)
+                created.append(task)
+            elif operation['op'] == 'update':
+                task = self.tasks[operation['id']]
+                previous[task.id] = {field: getattr(task, field) for field in data}
+                for field, value in data.items():
+                    setattr(task, field, value)
+                update_fields.update(data)
+                updated.append(task)
+            else:
+                deleted.append(operation['id'])
+                continue
+            pending.append((operation['op'], task, tags_data, assigned_users_data))
+
+        tag_names = list(dict.fromkeys(name for _, _, names, _ in pending for name in names or []))
+        TagLink = Task.tags.through
+        UserLink = Task.assigned_users.through
+        user_column = f'{Task.assigned_users.field.m2m_reverse_field_name()}_id'
+
+        with transaction.atomic():
+            tags = {tag.name: tag.id for tag in resolve_tags(tag_names)}
+            Task.objects.bulk_create(created)
+            if updated:
+                # bulk_update skips auto_now; relation-only updates still count as changes.
+                now = timezone.now()
+                for task in updated:
+                    task.updated_at = now
+                Task.objects.bulk_update(updated, sorted(update_fields | {'updated_at'}))
+            deleted_keys = {}
+            if deleted:
+                # Counters, versions and the change log take the whole batch from tasks_bulk_changed.
+                rows = Task.objects.filter(board=board, id__in=deleted).values_list('id', 'board_id', 'status', 'deadline')
+                deleted_keys = {task_id: tuple(key) for task_id, *key in rows}
+                with bulk_task_deletes():
+                    Task.objects.filter(id__in=deleted_keys).delete()
+
+            # Replace the relations of updated tasks that sent them, then insert
+            # every link in the batch with one statement per relation.
+            replaced_tags = [task.id for op, task, names, _ in pending if op == 'update' and names is not None]
+            replaced_users = [task.id for op, task, _, ids in pending if op == 'update' and ids is not None]
+            previous_users = defaultdict(set)
+            if replaced_tags:
+                TagLink.objects.filter(task_id__in=replaced_tags).delete()
+            if replaced_users:
+                links = UserLink.objects.filter(task_id__in=replaced_users)
+                for task_id, user_id in links.values_list('task_id', user_column):
+                    previous_users[task_id].add(user_id)
+                links.delete()
+            TagLink.objects.bulk_create([
+                TagLink(task_id=task.id, tag_id=tags[name])
+                for _, task, names, _ in pending for name in names or []
+            ])
+            UserLink.objects.bulk_create([
+                UserLink(task_id=task.id, **{user_column: user_id})
+                for _, task, _, ids in pending for user_id in ids or []
+            ])
+
+            assigned = {
+                task: set(ids) - previous_users[task.id] for _, task, _, ids in pending if ids
+            }
+            tasks_bulk_changed.send(
+                sender=Task, board=board, created=created, updated=updated,
+                previous=previous, assigned={task: ids for task, ids in assigned.items() if ids},
+                deleted=deleted_keys,
+            )
+
+        status_codes = {'create': 201, 'update': 200, 'delete': 204}
+        results = []
+        tasks = iter(task for _, task, _, _ in pending)
+        for operation in operations:
+            task_id = operation['id'] if operation['op'] == 'delete' else next(tasks).id
+            results.append({'op': operation['op'], 'id': task_id, 'status': status_codes[operation['op']]})
+        return results
+
+
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'message', 'created_at', 'is_read']
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def compiled(cls, selection=ALL_FIELDS):
+        return CompiledSerializer(cls)
+
+
+class NotificationIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+
@@ -0,0 +1,446 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .changes import log_board, log_membership, log_tasks
+from .counters import apply_deltas, change_deltas
+from .membership import invalidate_workspace_access, invalidate_workspace_lists
+from .models import Board, Notification, Tag, Task, Workspace, WorkspaceMembership
+from .notifications import count_unread, discount_unread, queue_notifications
+from .response_cache import invalidate as invalidate_responses
+from .realtime import (
+    board_workspace, publish_access_revoked, publish_task_created, publish_task_deleted, publish_task_relations,
+    publish_task_updated,
+)
+
+# Sent inside the transaction of a batch write on one board, once its rows are
+# saved. bulk_create and bulk_update skip post_save, so receivers that track
+# task changes listen here as well. Arguments: board, created (tasks),
+# updated (tasks), previous ({task id: {field: value before the write}}),
+# assigned ({task: ids of users newly assigned}) and deleted ({task id:
+# (board id, status, deadline) as stored before the delete}).
+tasks_bulk_changed = Signal()
+
+# Receivers run in the write's transaction. Board counters, the change log
+# and board versions stay there: summaries, sync tokens and ETags must agree
+# with the rows, so they commit or roll back together. A task update thus
+# costs, besides its own UPDATE, one counter UPDATE when its status or
+# deadline changes, one board version UPDATE and one change log INSERT;
+# queueing any of them would cost an INSERT of its own. Response cache bumps
+# are in-memory and repeated on commit, and realtime events are published on
+# commit already. Only notifications, which may lag, go through home.jobs.
+
+_bulk_deleting = ContextVar('bulk_deleting', default=False)
+
+
+@contextmanager
+def bulk_task_deletes():
+    """
+    Leave the tasks deleted inside to the tasks_bulk_changed receivers, which
+    handle the whole batch at once, instead of one post_delete each.
+    """
+    token = _bulk_deleting.set(True)
+    try:
+        yield
+    finally:
+        _bulk_deleting.reset(token)
+
+
+def batched_task_delete(origin):
+    """
+    Whether a task's post_delete is part of a delete whose tasks are handled
+    as a whole: a bulk_task_deletes() block, or a board or workspace delete
+    cascading to them. There the board's own receivers log its tombstone,
+    bump the workspace's responses and drop its counters with its rows.
+    """
+    if _bulk_deleting.get():
+        return True
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (Board, Workspace))
+
+
+@receiver([post_save, post_delete], sender=Workspace)
+def workspace_changed(sender, instance, **kwargs):
+    invalidate_workspace_access(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=WorkspaceMembership)
+@receiver([post_save, post_delete], sender=Board)
+def workspace_child_changed(sender, instance, **kwargs):
+    invalidate_workspace_access(instance.workspace_id)
+
+
+def invalidate_member_lists(workspace_id, *user_ids):
+    members = WorkspaceMembership.objects.filter(workspace_id=workspace_id).values_list('user_id', flat=True)
+    invalidate_workspace_lists({*members, *user_ids})
+
+
+# Every member's workspace list shows the name, role, board and member counts.
+@receiver([post_save, post_delete], sender=Workspace)
+def workspace_listing_changed(sender, instance, **kwargs):
+    invalidate_member_lists(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=WorkspaceMembership)
+def membership_listing_changed(sender, instance, **kwargs):
+    invalidate_member_lists(instance.workspace_id, instance.user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def creator_renamed_listing(sender, instance, created, **kwargs):
+    # Lists show each workspace's creator by username.
+    if not created and username_changed(instance):
+        invalidate_workspace_lists(set(
+            WorkspaceMembership.objects.filter(workspace__created_by=instance).values_list('user_id', flat=True)
+        ))
+
+
+@receiver([post_save, post_delete], sender=Board)
+def board_listing_changed(sender, instance, created=True, **kwargs):
+    # Only the board count is listed, so renames do not matter.
+    if created:
+        invalidate_member_lists(instance.workspace_id)
+
+
+def counter_key(task, values=None):
+    values = values or {}
+    return (
+        values.get('board_id', task.board_id),
+        values.get('status', task.status),
+        values.get('deadline', task.deadline),
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None)
+    if created:
+        apply_deltas(change_deltas([(None, counter_key(instance))]))
+    elif loaded is not None:
+        apply_deltas(change_deltas([(counter_key(instance, loaded), counter_key(instance))]))
+
+    previous = (loaded or {}).get('status')
+    if not created and previous is not None and previous != instance.status:
+        queue_notifications(changes={instance: previous})
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if batched_task_delete(origin):
+        return
+    apply_deltas(change_deltas([(counter_key(instance), None)]))
+
+
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def task_assignees_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        assigned = {task: [instance.pk] for task in Task.objects.filter(pk__in=pk_set).only('id', 'title')}
+    else:
+        assigned = {instance: pk_set}
+    queue_notifications(assigned=assigned)
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_count(sender, created, updated, previous, deleted, **kwargs):
+    apply_deltas(change_deltas(
+        [(None, counter_key(task)) for task in created]
+        + [(counter_key(task, previous[task.id]), counter_key(task)) for task in updated]
+        + [(key, None) for key in deleted.values()]
+    ))
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_notify(sender, updated, previous, assigned, **kwargs):
+    changes = {
+        task: previous[task.id]['status'] for task in updated
+        if previous[task.id].get('status', task.status) != task.status
+    }
+    queue_notifications(assigned, changes)
+
+
+def bump_board_versions(board_ids):
+    """ Move the version and timestamp that conditional GETs of these boards validate against. """
+    board_ids = {board_id for board_id in board_ids if board_id is not None}
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Task)
+def task_saved_version(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    bump_board_versions({instance.board_id, loaded.get('board_id')})
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_version(sender, instance, origin=None, **kwargs):
+    if batched_task_delete(origin):
+        return
+    bump_board_versions({instance.board_id})
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def task_relations_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_board_versions({instance.board_id})
+    elif pk_set:
+        bump_board_versions(Task.objects.filter(pk__in=pk_set).values_list('board_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Tag)
+def tag_renamed_version(sender, instance, created, **kwargs):
+    # Task payloads embed tag names.
+    if not created:
+        bump_board_versions(Task.objects.filter(tags=instance).values_list('board_id', flat=True).distinct())
+
+
+def username_changed(user):
+    loaded = getattr(user, '_loaded_values', None) or {}
+    return 'username' in loaded and loaded['username'] != user.username
+
+
+@receiver(post_save, sender=get_user_model())
+def assignee_renamed_version(sender, instance, created, **kwargs):
+    # Task payloads embed assignee usernames.
+    if not created and username_changed(instance):
+        bump_board_versions(
+            Task.objects.filter(assigned_users=instance).values_list('board_id', flat=True).distinct()
+        )
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_version(sender, board, **kwargs):
+    bump_board_versions({board.pk})
+
+
+def invalidate_board_responses(board_ids):
+    invalidate_responses(f'board:{board_id}' for board_id in board_ids if board_id is not None)
+
+
+@receiver([post_save, post_delete], sender=Task)
+def task_changed_responses(sender, instance, origin=None, **kwargs):
+    if origin is not None and batched_task_delete(origin):
+        return
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    invalidate_board_responses({instance.board_id, loaded.get('board_id')})
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def task_relations_responses(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_board_responses([instance.board_id])
+        return
+    if action in ('post_add', 'post_remove') and pk_set:
+        tasks = Task.objects.filter(pk__in=pk_set)
+    elif action == 'pre_clear':
+        # post_clear does not say which tasks lost the link.
+        field = 'tags' if sender is Task.tags.through else 'assigned_users'
+        tasks = Task.objects.filter(**{field: instance})
+    else:
+        return
+    invalidate_board_responses(tasks.values_list('board_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved_responses(sender, instance, created, **kwargs):
+    invalidate_responses(['tags'])
+    if not created:
+        invalidate_board_responses(Task.objects.filter(tags=instance).values_list('board_id', flat=True).distinct())
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleted_responses(sender, instance, **kwargs):
+    # The task links are deleted with the tag, without m2m_changed.
+    invalidate_responses(['tags'])
+    invalidate_board_responses(Task.objects.filter(tags=instance).values_list('board_id', flat=True).distinct())
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_responses(sender, board, **kwargs):
+    invalidate_board_responses([board.pk])
+
+
+# Tag autocomplete ranks tags by the tasks using them, per workspace.
+@receiver(m2m_changed, sender=Task.tags.through)
+def task_tags_uses(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_responses(['tag-uses'])
+
+
+@receiver(post_save, sender=Task)
+def task_moved_uses(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if loaded.get('board_id', instance.board_id) != instance.board_id:
+        invalidate_responses(['tag-uses'])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_uses(sender, instance, origin=None, **kwargs):
+    if not batched_task_delete(origin):
+        invalidate_responses(['tag-uses'])
+
+
+# Bulk writes link tags without m2m_changed; boards take their tasks' links along.
+@receiver(tasks_bulk_changed)
+@receiver(post_delete, sender=Board)
+def tasks_batch_uses(sender, **kwargs):
+    invalidate_responses(['tag-uses'])
+
+
+# Board lists embed the workspace name; task lists are keyed under the workspace too.
+@receiver([post_save, post_delete], sender=Workspace)
+def workspace_changed_responses(sender, instance, **kwargs):
+    invalidate_responses([f'workspace:{instance.pk}'])
+
+
+@receiver([post_save, post_delete], sender=WorkspaceMembership)
+@receiver([post_save, post_delete], sender=Board)
+def workspace_child_changed_responses(sender, instance, **kwargs):
+    invalidate_responses([f'workspace:{instance.workspace_id}'])
+
+
+@receiver(post_save, sender=Task)
+def task_saved_log(sender, instance, **kwargs):
+    previous_board = (getattr(instance, '_loaded_values', None) or {}).get('board_id', instance.board_id)
+    if previous_board != instance.board_id:
+        log_tasks([(instance.pk, previous_board)], deleted=True)
+    log_tasks([(instance.pk, instance.board_id)])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_log(sender, instance, origin=None, **kwargs):
+    if batched_task_delete(origin):
+        return
+    log_tasks([(instance.pk, instance.board_id)], deleted=True)
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def task_relations_log(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        log_tasks([(instance.pk, instance.board_id)])
+    elif pk_set:
+        log_tasks(Task.objects.filter(pk__in=pk_set).values_list('id', 'board_id'))
+
+
+@receiver(post_save, sender=Tag)
+def tag_renamed_log(sender, instance, created, **kwargs):
+    if not created:
+        log_tasks(Task.objects.filter(tags=instance).values_list('id', 'board_id'))
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_log(sender, board, created, updated, deleted, **kwargs):
+    log_tasks([(task.pk, board.pk) for task in created + updated])
+    log_tasks([(task_id, board.pk) for task_id in deleted], deleted=True)
+
+
+@receiver(post_save, sender=Board)
+def board_saved_log(sender, instance, **kwargs):
+    log_board(instance)
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted_log(sender, instance, **kwargs):
+    log_board(instance, deleted=True)
+
+
+@receiver(post_save, sender=WorkspaceMembership)
+def membership_saved_log(sender, instance, **kwargs):
+    log_membership(instance)
+
+
+@receiver(post_delete, sender=WorkspaceMembership)
+def membership_deleted_log(sender, instance, **kwargs):
+    log_membership(instance, deleted=True)
+
+
+@receiver(post_save, sender=Task)
+def task_saved_push(sender, instance, created, **kwargs):
+    if created:
+        publish_task_created(instance)
+    else:
+        publish_task_updated(instance, getattr(instance, '_loaded_values', None) or {})
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_push(sender, instance, origin=None, **kwargs):
+    if batched_task_delete(origin):
+        return
+    publish_task_deleted(instance.pk, instance.board_id)
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def task_relations_push(sender, instance, action, reverse, pk_set, **kwargs):
+    field = 'tags' if sender is Task.tags.through else 'assigned_users'
+    if action == 'post_clear' and not reverse:
+        publish_task_relations(instance.pk, instance.board_id, field, cleared=True)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        key = 'added' if action == 'post_add' else 'removed'
+        if not reverse:
+            publish_task_relations(instance.pk, instance.board_id, field, **{key: pk_set})
+        else:
+            for task_id, board_id in Task.objects.filter(pk__in=pk_set).values_list('id', 'board_id'):
+                publish_task_relations(task_id, board_id, field, **{key: [instance.pk]})
+
+
+@receiver(tasks_bulk_changed)
+def tasks_bulk_push(sender, board, created, updated, previous, assigned, deleted, **kwargs):
+    for task_id in deleted:
+        publish_task_deleted(task_id, board.pk)
+    for task in created:
+        publish_task_created(task)
+    for task in updated:
+        publish_task_updated(task, previous[task.id])
+    for task, user_ids in assigned.items():
+        publish_task_relations(task.pk, task.board_id, 'assigned_users', added=user_ids)
+
+
+@receiver([post_save, post_delete], sender=Board)
+def board_moved_push(sender, **kwargs):
+    # Boards rarely change workspace; forgetting every cached one is cheap.
+    board_workspace.cache_clear()
+
+
+@receiver(post_delete, sender=WorkspaceMembership)
+def membership_deleted_push(sender, instance, **kwargs):
+    publish_access_revoked(instance.user_id, instance.workspace_id)
+
+
+# Notifications written or toggled one at a time (admin, fixtures, scripts);
+# notify() and mark_read() keep the counters for their own bulk writes, which
+# send no signals. Other queryset updates need notifications.recount().
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if not created and 'is_read' not in loaded:
+        return
+    # The user counting the notification as unread before the save, and after it.
+    before = None if created or loaded['is_read'] else loaded.get('user_id', instance.user_id)
+    after = None if instance.is_read else instance.user_id
+    if before == after:
+        return
+    if before is not None:
+        discount_unread(before, 1)
+    if after is not None:
+        count_unread({after: 1})
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        discount_unread(instance.user_id, 1)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task, Notification
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestAsyncViews(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="reader", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        for i in range(3):
+            task = Task.objects.create(title=f"Task {i}", board=self.board, status="Todo")
+            task.tags.add(Tag.objects.create(name=f"tag-{i}"))
+            task.assigned_users.add(self.user)
+        self.task = task
+        Notification.objects.create(user=self.user, message="Hello")
+
+        kwargs = {"workspace_pk": self.workspace.id, "board_pk": self.board.id}
+        self.pairs = [
+            (reverse("home:notifications-list"), reverse("home:async-notifications-list")),
+            (
+                reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id}),
+                reverse("home:async-workspace-boards-list", kwargs={"workspace_pk": self.workspace.id}),
+            ),
+            (reverse("home:board-tasks-list", kwargs=kwargs), reverse("home:async-board-tasks-list", kwargs=kwargs)),
+            (
+                reverse("home:board-tasks-detail", kwargs={**kwargs, "pk": self.task.id}),
+                reverse("home:async-board-tasks-detail", kwargs={**kwargs, "pk": self.task.id}),
+            ),
+        ]
+
+    def test_async_views_answer_like_their_sync_counterparts(self):
+        for sync_url, async_url in self.pairs:
+            for query in ["", "?status=Todo&ordering=-created_at&page_size=2", "?fields=id&expand="]:
+                expected = self.client.get(sync_url + query)
+                response = self.client.get(async_url + query)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK, async_url)
+                # Page links point back at the path that was asked.
+                self.assertEqual(response.content.replace(b"/async/", b"/"), expected.content, async_url)
+
+    def test_task_list_pages_and_revalidates(self):
+        _, url = self.pairs[2]
+        first = self.client.get(url, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(len(first.data["results"]) + len(second.data["results"]), 3)
+        response = self.client.get(url, {"page_size": 2}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_permissions_and_missing_objects(self):
+        _, url = self.pairs[3]
+        self.assertEqual(self.client.get(url.replace(f"/{self.task.id}/", "/999/")).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.post(url, {}).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        outsider = get_user_model().objects.create_user(username="outsider", password="password123")
+        refresh = RefreshToken.for_user(outsider)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_queries_match_the_sync_path(self):
+        sync_url, async_url = self.pairs[2]
+        self.client.get(sync_url)  # warm the user state and access caches
+
+        # board version, tasks, tags, assignees
+        with self.assertNumQueries(4):
+            self.client.get(async_url)
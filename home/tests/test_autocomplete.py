@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.autocomplete import matching_tags, prefix_cache
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task
+from home.serializers import resolve_tags
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestTagAutocomplete(APITestCase):
+    def setUp(self):
+        cache.clear()
+        prefix_cache.clear()
+        self.user = get_user_model().objects.create_user(username="typist", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="member")
+        board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        owner = get_user_model().objects.create_user(username="owner", password="password123")
+        self.other_workspace = Workspace.objects.create(name="Other", created_by=owner)
+        other_board = Board.objects.create(name="Other", workspace=self.other_workspace, description="")
+
+        tags = {name: Tag.objects.create(name=name) for name in ["Urgent", "URGENT-2", "urlaub", "Straße", "review"]}
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", board=board).tags.add(tags["urlaub"], *[tags["Urgent"]][:i % 2])
+            Task.objects.create(title=f"Other {i}", board=other_board).tags.add(tags["URGENT-2"])
+
+        self.url = reverse("home:tag-autocomplete")
+
+    def complete(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [(row["name"], row["uses"]) for row in response.data]
+
+    def test_prefixes_match_any_case_ranked_by_use(self):
+        self.assertEqual(self.complete(q="uR"), [("URGENT-2", 3), ("urlaub", 3), ("Urgent", 1)])
+        self.assertEqual(self.complete(q="urg", limit=1), [("URGENT-2", 3)])
+        self.assertEqual(self.complete(q="STRASS"), [("Straße", 0)])
+
+    def test_workspace_scope_counts_only_its_tasks(self):
+        self.assertEqual(self.complete(q="ur", workspace=self.workspace.id), [("urlaub", 3), ("Urgent", 1)])
+
+        response = self.client.get(self.url, {"q": "ur", "workspace": self.other_workspace.id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        for params in [{}, {"q": " "}, {"q": "ur", "limit": "many"}]:
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_short_prefixes_are_answered_from_memory(self):
+        self.complete(q="u")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete(q="u"), [("URGENT-2", 3), ("urlaub", 3), ("Urgent", 1)])
+            # Every match of "u" is held, so longer prefixes filter it.
+            self.assertEqual(self.complete(q="urge"), [("URGENT-2", 3), ("Urgent", 1)])
+
+        # membership and the workspace's own matches
+        with self.assertNumQueries(2):
+            self.complete(q="u", workspace=self.workspace.id)
+
+    @override_settings(TAG_AUTOCOMPLETE_MAX_RESULTS=2)
+    def test_truncated_entries_only_answer_their_own_prefix(self):
+        self.assertEqual(self.complete(q="u"), [("URGENT-2", 3), ("urlaub", 3)])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.complete(q="urg"), [("URGENT-2", 3), ("Urgent", 1)])
+
+    def test_tag_and_task_writes_reach_cached_entries(self):
+        self.assertEqual(self.complete(q="u"), [("URGENT-2", 3), ("urlaub", 3), ("Urgent", 1)])
+
+        urgent = Tag.objects.get(name="Urgent")
+        Task.objects.filter(title="Task 0").get().tags.add(urgent)
+        self.assertEqual(self.complete(q="u"), [("URGENT-2", 3), ("urlaub", 3), ("Urgent", 2)])
+
+        response = self.client.delete(reverse("home:tag-detail", kwargs={"pk": urgent.id}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.complete(q="u"), [("URGENT-2", 3), ("urlaub", 3)])
+
+    @override_settings(TAG_AUTOCOMPLETE_CACHE_TTL=0)
+    def test_entries_expire(self):
+        self.complete(q="u")
+        resolve_tags(["Unicorn"])
+
+        self.assertIn(("Unicorn", 0), self.complete(q="u"))
+
+    def test_prefix_search_reads_the_normalized_index(self):
+        plan = matching_tags("ur")[:51].explain()
+
+        self.assertNotRegex(plan, r"\bSCAN home_tag\b|Seq Scan on home_tag")
+        if connection.vendor == "sqlite":
+            self.assertRegex(plan, r"home_tag USING INDEX home_tag_normalized_name")
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from home.benchmark import compare, run, run_concurrency, seed
+from home.models import BoardTaskCounter, Task, WorkspaceMembership
+
+
+class TestBenchmark(TestCase):
+    def test_seed_builds_the_requested_dataset(self):
+        dataset = seed({"users": 12, "workspaces": 2, "members": 4, "boards": 2, "tasks": 5, "tags": 6})
+
+        self.assertEqual(Task.objects.count(), 2 * 2 * 5)
+        self.assertEqual(WorkspaceMembership.objects.count(), 2 * 4)
+        self.assertEqual(WorkspaceMembership.objects.get(workspace=dataset.workspace, user=dataset.user).role, "admin")
+        self.assertEqual(sum(BoardTaskCounter.objects.values_list("count", flat=True)), 20)
+
+    def test_run_measures_every_selected_endpoint(self):
+        dataset = seed({"users": 6, "workspaces": 1, "members": 3, "boards": 1, "tasks": 5, "tags": 3})
+
+        results = run(dataset, ["token refresh", "task page", "task create"], requests=3, warmup=1)
+
+        self.assertEqual(list(results), ["token refresh", "task page", "task create"])
+        for row in results.values():
+            self.assertEqual(row["requests"], 3)
+            self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        self.assertGreater(results["task page"]["queries_per_request"], 0)
+
+    def test_compare_flags_query_and_latency_regressions(self):
+        baseline = {"results": {"a": {"queries_per_request": 3, "p50_ms": 10}}}
+        current = {"results": {"a": {"queries_per_request": 4, "p50_ms": 13}, "b": {"queries_per_request": 1, "p50_ms": 1}}}
+
+        self.assertEqual(len(compare(baseline, current, tolerance=0.2)), 2)
+        self.assertEqual(compare(baseline, current, tolerance=0.5), ["a: queries per request 3 -> 4"])
+
+
+class TestConcurrencyBenchmark(TransactionTestCase):
+    # Requests are served from other threads, which only see committed rows.
+    def test_sync_and_async_runs_cover_each_client_count(self):
+        cache.clear()
+        dataset = seed({"users": 6, "workspaces": 1, "members": 3, "boards": 1, "tasks": 5, "tags": 3})
+
+        results = run_concurrency(dataset, ["board list", "task detail"], concurrency=(1, 2), requests=4, workers=2)
+
+        self.assertEqual(list(results), ["board list", "task detail"])
+        for runs in results.values():
+            for mode in ("sync", "async"):
+                self.assertEqual([row["clients"] for row in runs[mode]], [1, 2])
+                self.assertTrue(all(row["errors"] == 0 for row in runs[mode]), runs[mode])
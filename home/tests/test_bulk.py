@@ -0,0 +1,144 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task, BoardTaskCounter, ChangeLogEntry
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestTaskBulkEndpoint(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="importer",
+            email="importer@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.url = reverse(
+            "home:board-tasks-bulk",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def test_mixed_batch_is_applied_with_per_item_results(self):
+        keep = Task.objects.create(title="Keep", board=self.board)
+        keep.tags.add(Tag.objects.create(name="old"))
+        drop = Task.objects.create(title="Drop", board=self.board)
+        operations = [
+            {"op": "create", "data": {"title": "New", "tags": ["a", "b"], "assigned_users": [self.user.id]}},
+            {"op": "update", "id": keep.id, "data": {"status": "Done", "tags": ["a"]}},
+            {"op": "delete", "id": drop.id},
+        ]
+
+        response = self.client.post(self.url, {"operations": operations}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["status"] for r in results], [201, 200, 204])
+        created = Task.objects.get(id=results[0]["id"])
+        self.assertEqual(sorted(created.tags.values_list("name", flat=True)), ["a", "b"])
+        self.assertEqual(list(created.assigned_users.all()), [self.user])
+        keep.refresh_from_db()
+        self.assertEqual(keep.status, "Done")
+        self.assertEqual(list(keep.tags.values_list("name", flat=True)), ["a"])
+        self.assertFalse(Task.objects.filter(id=drop.id).exists())
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def run(count):
+            operations = [
+                {"op": "create", "data": {"title": f"T{i}", "tags": [f"t{i}"], "assigned_users": [self.user.id]}}
+                for i in range(count)
+            ]
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, {"operations": operations}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        # The first write on a board also inserts its counter row.
+        Task.objects.create(title="Existing", board=self.board)
+        self.assertEqual(run(2), run(50))
+        self.assertEqual(Task.objects.count(), 53)
+
+    def test_deletes_do_not_grow_the_query_count_either(self):
+        def run(count):
+            tasks = [Task.objects.create(title=f"T{i}", board=self.board, status="Doing") for i in range(count)]
+            operations = [{"op": "delete", "id": task.id} for task in tasks]
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, {"operations": operations}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        Task.objects.create(title="Existing", board=self.board, status="Doing")
+        self.assertEqual(run(2), run(40))
+
+        self.assertEqual(sum(BoardTaskCounter.objects.filter(status="Doing").values_list("count", flat=True)), 1)
+        self.assertEqual(ChangeLogEntry.objects.filter(deleted=True).count(), 42)
+
+    def test_invalid_item_rolls_back_the_whole_batch(self):
+        outsider = get_user_model().objects.create_user(username="outsider", password="password123")
+        other_board = Board.objects.create(name="Other", workspace=self.workspace, description="")
+        foreign = Task.objects.create(title="Foreign", board=other_board)
+        operations = [
+            {"op": "create", "data": {"title": "Fine"}},
+            {"op": "create", "data": {"title": "Bad", "assigned_users": [outsider.id]}},
+            {"op": "delete", "id": foreign.id},
+        ]
+
+        response = self.client.post(self.url, {"operations": operations}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["operations"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("assigned_users", errors[1])
+        self.assertIn("id", errors[2])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_non_member_is_rejected(self):
+        stranger = get_user_model().objects.create_user(username="stranger", password="password123")
+        refresh = RefreshToken.for_user(stranger)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        response = self.client.post(self.url, {"operations": [{"op": "create", "data": {"title": "X"}}]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Task.objects.exists())
+
+
+class TestCascadedTaskDeletes(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="owner", password="password123")
+
+    def delete_queries(self, target, tasks):
+        workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=workspace, user=self.user, role="admin")
+        board = Board.objects.create(name="Board", workspace=workspace, description="")
+        board_id = board.id
+        tag = Tag.objects.create(name=f"{target}-{tasks}")
+        for i in range(tasks):
+            task = Task.objects.create(title=f"T{i}", board=board, status="Doing")
+            task.tags.add(tag)
+            task.assigned_users.add(self.user)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            (board if target == "board" else workspace).delete()
+
+        self.assertFalse(Task.objects.filter(board_id=board_id).exists())
+        self.assertFalse(BoardTaskCounter.objects.filter(board_id=board_id).exists())
+        # The board's tombstone stands for its tasks.
+        tombstones = ChangeLogEntry.objects.filter(board_id=board_id, deleted=True)
+        self.assertEqual(list(tombstones.values_list("kind", flat=True)), ["board"])
+        ChangeLogEntry.objects.all().delete()
+        return len(context.captured_queries)
+
+    def test_board_and_workspace_deletes_do_not_grow_with_their_tasks(self):
+        for target in ["board", "workspace"]:
+            self.assertEqual(self.delete_queries(target, 2), self.delete_queries(target, 60), target)
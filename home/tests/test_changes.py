@@ -0,0 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Task, ChangeLogEntry
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@override_settings(CHANGE_LOG_SETTLE_SECONDS=0)
+class TestDeltaSync(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="syncer", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.workspace_url = reverse("home:workspace-changes", kwargs={"pk": self.workspace.id})
+        self.board_url = reverse(
+            "home:workspace-boards-changes", kwargs={"workspace_pk": self.workspace.id, "pk": self.board.id}
+        )
+
+    def sync(self, url, token, **params):
+        response = self.client.get(url, {"since": token, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def head(self, url):
+        return self.client.get(url).data["next"]
+
+    def test_returns_only_what_changed_since_the_token(self):
+        Task.objects.create(title="Before", board=self.board)
+        token = self.head(self.board_url)
+
+        changed = Task.objects.create(title="Draft", board=self.board)
+        changed.title = "Final"
+        changed.save()
+        deleted = Task.objects.create(title="Gone", board=self.board)
+        deleted_id = deleted.id
+        deleted.delete()
+
+        page = self.sync(self.board_url, token)
+
+        self.assertEqual(
+            [(c["type"], c["id"], c["deleted"]) for c in page["changes"]],
+            [("task", changed.id, False), ("task", deleted_id, True)],
+        )
+        self.assertEqual(page["changes"][0]["data"]["title"], "Final")
+        self.assertFalse(page["has_more"])
+        self.assertEqual(self.sync(self.board_url, page["next"])["changes"], [])
+
+    def test_workspace_feed_covers_boards_and_memberships(self):
+        token = self.head(self.workspace_url)
+        other = get_user_model().objects.create_user(username="other", password="password123")
+
+        board = Board.objects.create(name="Second", workspace=self.workspace, description="")
+        membership = WorkspaceMembership.objects.create(workspace=self.workspace, user=other)
+        membership.delete()
+        Task.objects.create(title="Task", board=board)
+        Board.objects.create(name="Foreign", workspace=Workspace.objects.create(name="Other", created_by=other), description="")
+
+        changes = self.sync(self.workspace_url, token)["changes"]
+
+        self.assertEqual(
+            [(c["type"], c["deleted"]) for c in changes],
+            [("board", False), ("membership", True), ("task", False)],
+        )
+        self.assertEqual(changes[0]["data"]["name"], "Second")
+
+    def test_pages_are_bounded_and_queries_do_not_grow_with_the_board(self):
+        Task.objects.bulk_create([Task(title=f"Old {i}", board=self.board) for i in range(50)])
+        token = self.head(self.board_url)
+        for i in range(5):
+            Task.objects.create(title=f"New {i}", board=self.board)
+
+        # user state and access are cached: entries, tasks, tags, assignees
+        with self.assertNumQueries(4):
+            page = self.sync(self.board_url, token, limit=3)
+        self.assertEqual(len(page["changes"]), 3)
+        self.assertTrue(page["has_more"])
+
+        page = self.sync(self.board_url, page["next"], limit=3)
+        self.assertEqual([c["data"]["title"] for c in page["changes"]], ["New 3", "New 4"])
+        self.assertFalse(page["has_more"])
+
+    def test_expired_and_invalid_tokens(self):
+        token = self.head(self.board_url)
+
+        with mock.patch("home.changes.timezone.now", return_value=timezone.now() + timedelta(days=31)):
+            response = self.client.get(self.board_url, {"since": token})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+        for invalid in ["not-a-token", token[:-1] + ("A" if token[-1] != "A" else "B")]:
+            response = self.client.get(self.board_url, {"since": invalid})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_continuing_past_pruned_entries_is_gone(self):
+        token = self.head(self.board_url)
+        for i in range(5):
+            Task.objects.create(title=f"Task {i}", board=self.board)
+        ChangeLogEntry.objects.update(created_at=timezone.now() - timedelta(days=31))
+
+        page = self.sync(self.board_url, token, limit=3)
+        self.assertTrue(page["has_more"])
+
+        # The rest of the page is past retention, and may already be pruned.
+        response = self.client.get(self.board_url, {"since": page["next"]})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_non_members_cannot_sync(self):
+        stranger = get_user_model().objects.create_user(username="stranger", password="password123")
+        refresh = RefreshToken.for_user(stranger)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.assertEqual(self.client.get(self.workspace_url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.board_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_prune_deletes_entries_past_retention(self):
+        Task.objects.create(title="Task", board=self.board)
+        ChangeLogEntry.objects.update(created_at=timezone.now() - timedelta(days=31))
+        Task.objects.create(title="Recent", board=self.board)
+
+        call_command("prune_change_log", stdout=StringIO())
+
+        self.assertEqual(ChangeLogEntry.objects.count(), 1)
@@ -0,0 +1,119 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestConditionalRequests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="poller", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.task = Task.objects.create(title="Task", board=self.board)
+        self.tasks_url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+        self.boards_url = reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id})
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("private", response["Cache-Control"])
+        return response["ETag"]
+
+    def test_unchanged_task_list_is_not_modified_without_loading_tasks(self):
+        etag = self.etag(self.tasks_url)
+
+        # user state and access are cached; only the board version is read
+        with self.assertNumQueries(1):
+            response = self.client.get(self.tasks_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_task_writes_change_the_etag(self):
+        etags = [self.etag(self.tasks_url)]
+
+        self.task.title = "Renamed"
+        self.task.save()
+        etags.append(self.etag(self.tasks_url))
+
+        self.task.tags.add(Tag.objects.create(name="urgent"))
+        etags.append(self.etag(self.tasks_url))
+
+        Tag.objects.filter(name="urgent").get().save()
+        etags.append(self.etag(self.tasks_url))
+
+        self.task.delete()
+        etags.append(self.etag(self.tasks_url))
+
+        self.assertEqual(len(set(etags)), len(etags))
+        response = self.client.get(self.tasks_url, HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_renaming_an_assignee_changes_the_etag(self):
+        self.task.assigned_users.add(self.user)
+        etag = self.etag(self.tasks_url)
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.email = "poller@example.com"
+        user.save()
+        self.assertEqual(self.etag(self.tasks_url), etag)
+
+        user.username = "renamed"
+        user.save()
+        response = self.client.get(self.tasks_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["assigned_users"], ["renamed"])
+
+    def test_bulk_update_changes_the_etag(self):
+        etag = self.etag(self.tasks_url)
+
+        response = self.client.post(
+            f"{self.tasks_url}bulk/",
+            {"operations": [{"op": "update", "id": self.task.id, "data": {"tags": ["later"]}}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(self.etag(self.tasks_url), etag)
+
+    def test_query_string_and_format_get_their_own_etags(self):
+        etags = {
+            self.etag(self.tasks_url),
+            self.etag(f"{self.tasks_url}?status=Todo"),
+            self.etag(f"{self.tasks_url}?format=json"),
+        }
+
+        self.assertEqual(len(etags), 3)
+
+    def test_board_list_follows_board_and_workspace_changes(self):
+        etags = [self.etag(self.boards_url)]
+
+        Board.objects.create(name="Second", workspace=self.workspace, description="")
+        etags.append(self.etag(self.boards_url))
+
+        self.workspace.name = "Renamed"
+        self.workspace.save()
+        etags.append(self.etag(self.boards_url))
+
+        self.assertEqual(len(set(etags)), len(etags))
+        response = self.client.get(self.boards_url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since_is_honoured(self):
+        response = self.client.get(self.tasks_url)
+
+        response = self.client.get(self.tasks_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
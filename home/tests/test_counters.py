@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, BoardTaskCounter, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestBoardTaskCounters(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="counter",
+            email="counter@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.summary_url = reverse("home:workspace-boards-summary", kwargs={"workspace_pk": self.workspace.id})
+
+    def counts(self, board=None):
+        rows = BoardTaskCounter.objects.filter(board=board or self.board).values("status").annotate(total=Sum("count"))
+        return {row["status"]: row["total"] for row in rows if row["total"]}
+
+    def test_saves_and_deletes_keep_counters_in_step(self):
+        first = Task.objects.create(title="One", board=self.board)
+        second = Task.objects.create(title="Two", board=self.board)
+        self.assertEqual(self.counts(), {"Todo": 2})
+
+        first = Task.objects.get(pk=first.pk)
+        first.status = "Done"
+        first.save()
+        self.assertEqual(self.counts(), {"Todo": 1, "Done": 1})
+
+        second.delete()
+        self.assertEqual(self.counts(), {"Done": 1})
+
+    def test_a_status_change_moves_both_counters_in_one_update(self):
+        Task.objects.create(title="Done", board=self.board, status="Done")
+        task = Task.objects.get(pk=Task.objects.create(title="Todo", board=self.board).pk)
+
+        task.status = "Done"
+        with CaptureQueriesContext(connection) as context:
+            task.save(update_fields=["status"])
+
+        counter_queries = [query["sql"] for query in context.captured_queries if "home_boardtaskcounter" in query["sql"]]
+        self.assertEqual(len(counter_queries), 1, counter_queries)
+        self.assertEqual(self.counts(), {"Done": 2})
+
+    def test_bulk_endpoint_updates_counters(self):
+        task = Task.objects.create(title="Old", board=self.board)
+        url = reverse("home:board-tasks-bulk", kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id})
+        operations = [
+            {"op": "create", "data": {"title": "New", "status": "Doing"}},
+            {"op": "update", "id": task.id, "data": {"status": "Done"}},
+        ]
+
+        response = self.client.post(url, {"operations": operations}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), {"Doing": 1, "Done": 1})
+
+    def test_summary_reports_totals_and_overdue_per_board(self):
+        other = Board.objects.create(name="Empty", workspace=self.workspace, description="")
+        yesterday = date.today() - timedelta(days=1)
+        Task.objects.create(title="Late", board=self.board, deadline=yesterday)
+        Task.objects.create(title="Late but done", board=self.board, deadline=yesterday, status="Done")
+        Task.objects.create(title="On time", board=self.board, deadline=date.today() + timedelta(days=1))
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.summary_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        board, empty = response.data
+        self.assertEqual((board["id"], board["total"], board["overdue"]), (self.board.id, 3, 1))
+        self.assertEqual(board["status_counts"], {"Todo": 2, "Doing": 0, "Done": 1, "Suspend": 0})
+        self.assertEqual((empty["id"], empty["total"]), (other.id, 0))
+
+    def test_reconcile_command_repairs_drift(self):
+        Task.objects.create(title="One", board=self.board)
+        Task.objects.bulk_create([Task(title="Silent", board=self.board, status="Doing")])
+        BoardTaskCounter.objects.create(board=self.board, status="Suspend", count=4)
+
+        call_command("reconcile_board_counters", stdout=StringIO())
+
+        self.assertEqual(self.counts(), {"Todo": 1, "Doing": 1})
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestSparseFieldsets(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="viewer", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="Long description")
+        tag = Tag.objects.create(name="urgent")
+        for i in range(3):
+            self.task = Task.objects.create(title=f"Task {i}", board=self.board, description="Long description")
+            self.task.tags.add(tag)
+            self.task.assigned_users.add(self.user)
+
+        kwargs = {"workspace_pk": self.workspace.id, "board_pk": self.board.id}
+        self.tasks_url = reverse("home:board-tasks-list", kwargs=kwargs)
+        self.task_url = reverse("home:board-tasks-detail", kwargs={**kwargs, "pk": self.task.id})
+        self.boards_url = reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id})
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response
+
+    def test_fields_narrow_every_row(self):
+        for url in [self.tasks_url, self.task_url]:
+            response = self.get(url, fields="deadline, status,id,title")
+            row = response.data["results"][0] if "results" in response.data else response.data
+
+            # The serializer's order, not the request's.
+            self.assertEqual(list(row), ["id", "title", "deadline", "status"])
+
+    def test_expand_collapses_relations_to_primary_keys(self):
+        task = self.get(self.tasks_url, expand="tags").data["results"][0]
+        self.assertEqual(task["tags"][0]["name"], "urgent")
+        self.assertEqual(task["assigned_users"], [self.user.id])
+
+        task = self.get(self.task_url, expand="").data
+        self.assertEqual((task["tags"], task["assigned_users"]), ([Tag.objects.get().id], [self.user.id]))
+
+        board = self.get(self.boards_url, expand="").data[0]
+        self.assertEqual(board["workspace"], self.workspace.id)
+        board = self.get(self.boards_url, fields="name,workspace").data[0]
+        self.assertEqual(board, {"name": "Board", "workspace": {"id": self.workspace.id, "name": "Workspace"}})
+
+    @override_settings(RESPONSE_CACHE_ALIAS=None)
+    def test_compiled_and_stock_serializers_agree(self):
+        requests = {
+            self.tasks_url: [{"fields": "id,title,tags"}, {"expand": ""}, {"fields": "assigned_users,tags", "expand": "tags"}],
+            self.boards_url: [{"fields": "id,name"}, {"expand": ""}, {"fields": "workspace", "expand": "workspace"}],
+        }
+        for url, cases in requests.items():
+            for params in cases:
+                with override_settings(COMPILED_SERIALIZERS=False):
+                    expected = self.client.get(url, params).content
+                self.assertEqual(self.get(url, **params).content, expected, params)
+
+    def test_slim_requests_load_only_what_they_render(self):
+        self.get(self.tasks_url)  # warm the user state and access caches
+
+        for url in [self.tasks_url, self.task_url]:
+            # board version and tasks: no tag or assignee queries
+            with CaptureQueriesContext(connection) as queries:
+                self.get(url, fields="id,title,status,deadline")
+            self.assertEqual(len(queries), 2)
+            self.assertNotIn("description", queries[1]["sql"])
+
+        # Collapsed relations are read off the link tables alone.
+        with CaptureQueriesContext(connection) as queries:
+            self.get(self.tasks_url, fields="id,tags,assigned_users", expand="")
+        self.assertEqual(len(queries), 4)
+        self.assertFalse(any('"home_tag"' in query["sql"] or '"accounts_customuser"' in query["sql"] for query in queries))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.tasks_url, {"fields": "title,secret", "expand": "board"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"fields", "expand"})
@@ -0,0 +1,75 @@
+import json
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.instrumentation import RequestStats, get_recorder, load_routes
+from home.models import Workspace, WorkspaceMembership, Board
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestInstrumentationMiddleware(APITestCase):
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(REQUEST_INSTRUMENTATION=True, REQUEST_INSTRUMENTATION_DIR=self.directory))
+
+        self.user = get_user_model().objects.create_user(
+            username="timed",
+            email="timed@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.url = reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id})
+
+    def test_response_carries_server_timing(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serializer;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_dump_merges_per_route_histograms(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        out = StringIO()
+        call_command("dump_request_stats", "--json", stdout=out)
+
+        report = json.loads(out.getvalue())
+        row = report["GET home:workspace-boards-list"]
+        self.assertEqual(row["requests"], 2)
+        self.assertEqual(sum(row["latency_histogram"].values()), 2)
+        self.assertGreater(row["mean_queries"], 0)
+
+    def test_repeated_statements_are_reported(self):
+        recorder = get_recorder(self.directory)
+        stats = RequestStats()
+        stats.queries = 4
+        stats.statements = {"SELECT 1": [3, 0.003, 0.002], "SELECT 2": [1, 0.001, 0.001]}
+        recorder.record("GET example", 0.01, stats)
+        recorder.flush()
+
+        out = StringIO()
+        call_command("dump_request_stats", "--json", "--route", "example", stdout=out)
+
+        row = json.loads(out.getvalue())["GET example"]
+        self.assertEqual([s["sql"] for s in row["repeated"]], ["SELECT 1"])
+        self.assertEqual(row["repeated"][0]["max_per_request"], 3)
+        self.assertIn("GET example", load_routes(self.directory))
+
+    def test_disabled_middleware_adds_nothing(self):
+        with self.settings(REQUEST_INSTRUMENTATION=False):
+            self.client.handler.load_middleware()
+            response = self.client.get(self.url)
+
+        self.assertNotIn("Server-Timing", response)
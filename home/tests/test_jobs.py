@@ -0,0 +1,142 @@
+import os
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from home import jobs
+from home.jobs import JobRunner, claim, enqueue, job, requeue_expired, run, run_due
+from home.models import Job, Tag
+
+
+@job("test.tag")
+def create_tag(payload):
+    Tag.objects.create(name=payload["name"])
+    if payload.get("fail"):
+        raise RuntimeError("boom")
+
+
+ran = []
+ran_five = threading.Event()
+
+
+@job("test.count")
+def count(payload):
+    ran.append(payload)
+    if len(ran) == 5:
+        ran_five.set()
+
+
+class TestJobQueue(TestCase):
+    def test_jobs_are_queued_with_the_write(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            enqueue("test.tag", {"name": "queued"})
+        self.assertEqual(list(Job.objects.values_list("name", "status")), [("test.tag", "queued")])
+        self.assertEqual(len(callbacks), 1)  # wakes the workers once committed
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue("test.tag", {"name": "rolled back"})
+            raise RuntimeError
+        self.assertEqual(Job.objects.count(), 1)
+        with self.assertRaises(ValueError):
+            enqueue("test.missing")
+
+    def test_a_job_commits_with_its_writes(self):
+        enqueue("test.tag", {"name": "done"})
+
+        self.assertEqual(run_due(), 1)
+
+        self.assertTrue(Tag.objects.filter(name="done").exists())
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_DELAY=10)
+    def test_failures_back_off_then_fail(self):
+        enqueue("test.tag", {"name": "flaky", "fail": True})
+
+        with self.assertLogs("home.jobs", "WARNING"):
+            self.assertEqual(run_due(), 0)
+        queued = Job.objects.get()
+        self.assertEqual((queued.status, queued.attempts), ("queued", 1))
+        self.assertGreaterEqual(queued.run_at, timezone.now() + timedelta(seconds=4))
+        self.assertIn("RuntimeError: boom", queued.last_error)
+        self.assertEqual(run_due(), 0)
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("home.jobs", "ERROR"):
+            run_due()
+        self.assertEqual(Job.objects.values_list("status", "attempts").get(), ("failed", 2))
+        self.assertFalse(Tag.objects.exists())
+
+    def test_jobs_are_claimed_once(self):
+        for i in range(3):
+            enqueue("test.tag", {"name": f"tag-{i}"})
+
+        self.assertEqual(len(claim(2)), 2)
+        self.assertEqual(len(claim(10)), 1)
+        self.assertEqual(claim(10), [])
+
+    @override_settings(JOBS_CLAIM_TIMEOUT=60)
+    def test_expired_claims_go_back_to_the_queue(self):
+        enqueue("test.tag", {"name": "slow"})
+        lost = claim(1)[0]
+        self.assertEqual(requeue_expired(), 0)
+
+        Job.objects.update(claimed_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(requeue_expired(), 1)
+        claimed = claim(1)[0]
+
+        # The first worker finishing late neither keeps its writes nor drops the job.
+        with self.assertLogs("home.jobs", "WARNING"):
+            self.assertFalse(run(lost))
+        self.assertFalse(Tag.objects.exists())
+        self.assertEqual(Job.objects.get().claimed_by, claimed.claimed_by)
+        self.assertTrue(run(claimed))
+        self.assertEqual(list(Tag.objects.values_list("name", flat=True)), ["slow"])
+
+    def test_command_runs_due_jobs_once(self):
+        enqueue("test.tag", {"name": "command"})
+        out = StringIO()
+
+        call_command("run_jobs", "--once", stdout=out)
+
+        self.assertIn("Ran 1 jobs.", out.getvalue())
+        self.assertFalse(Job.objects.exists())
+
+
+class TestInProcessWorkers(TestCase):
+    @override_settings(JOBS_IN_PROCESS_WORKERS=2)
+    def test_forked_processes_start_their_own_workers(self):
+        inherited = mock.Mock()
+        with mock.patch.object(jobs, "_runner", inherited), mock.patch.object(jobs, "_runner_pid", os.getpid() + 1), \
+                mock.patch("home.jobs.JobRunner") as runner_class:
+            jobs.wake()
+            inherited.wakeup.set.assert_not_called()
+
+            jobs.ensure_in_process_workers()
+            jobs.ensure_in_process_workers()
+
+            runner_class.assert_called_once_with(2, None)
+            runner_class.return_value.start.assert_called_once_with()
+            jobs.wake()
+            runner_class.return_value.wakeup.set.assert_called_once_with()
+
+
+class TestJobRunner(TransactionTestCase):
+    @override_settings(JOBS_POLL_INTERVAL=0.05)
+    def test_worker_threads_run_queued_jobs(self):
+        for _ in range(5):
+            enqueue("test.count", {})
+
+        # One thread: SQLite's shared in-memory test database locks whole tables.
+        runner = JobRunner(1)
+        runner.start()
+        try:
+            self.assertTrue(ran_five.wait(5))
+        finally:
+            runner.stop(5)
+
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestWorkspaceAccessResolver(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        self.membership = WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user)
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.tasks_url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def test_access_is_resolved_once_and_then_served_from_cache(self):
+        # user state, board with workspace and role, board version, tasks
+        with self.assertNumQueries(4):
+            self.client.get(self.tasks_url)
+        # board version; the list itself comes from the response cache
+        with self.assertNumQueries(1):
+            response = self.client.get(self.tasks_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_membership_delete_revokes_cached_access(self):
+        self.assertEqual(self.client.get(self.tasks_url).status_code, status.HTTP_200_OK)
+
+        self.membership.delete()
+
+        self.assertEqual(self.client.get(self.tasks_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_board_from_another_workspace_is_not_found(self):
+        other = Workspace.objects.create(name="Other", created_by=self.user)
+        foreign_board = Board.objects.create(name="Foreign", workspace=other, description="")
+        url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": foreign_board.id},
+        )
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
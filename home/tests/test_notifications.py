@@ -0,0 +1,141 @@
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.jobs import run_due
+from home.notifications import recount
+from home.models import Workspace, WorkspaceMembership, Board, Task, Notification
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestNotificationPipeline(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="owner",
+            email="owner@example.com",
+            password="password123",
+        )
+        self.assignee = get_user_model().objects.create_user(username="assignee", password="password123")
+        refresh = RefreshToken.for_user(self.assignee)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.assignee)
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+
+    def unread(self):
+        response = self.client.get(reverse("home:notifications-unread-count"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["unread"]
+
+    def test_assignment_and_status_change_notify_assignees(self):
+        task = Task.objects.create(title="Ship it", board=self.board)
+        task.assigned_users.add(self.assignee)
+        task.status = "Doing"
+        task.save()
+        task.save()
+        self.assertFalse(Notification.objects.exists())
+        run_due()
+
+        messages = list(Notification.objects.filter(user=self.assignee).order_by("id").values_list("message", flat=True))
+        self.assertEqual(messages, ["You have been assigned to task 'Ship it'.", "Task 'Ship it' moved from Todo to Doing."])
+        self.assertEqual(self.unread(), 2)
+
+    def test_recipients_are_settled_when_the_job_is_queued(self):
+        task = Task.objects.create(title="Ship it", board=self.board)
+        task.assigned_users.add(self.assignee)
+        task.status = "Doing"
+        task.save()
+
+        task.assigned_users.clear()
+        task.title = "Renamed"
+        task.save()
+        run_due()
+
+        self.assertEqual(
+            list(Notification.objects.filter(user=self.assignee).order_by("id").values_list("message", flat=True)),
+            ["You have been assigned to task 'Ship it'.", "Task 'Ship it' moved from Todo to Doing."],
+        )
+
+    def test_bulk_endpoint_notifies_new_assignees_once(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        url = reverse("home:board-tasks-bulk", kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id})
+        operations = [
+            {"op": "create", "data": {"title": f"T{i}", "assigned_users": [self.assignee.id]}} for i in range(3)
+        ]
+
+        response = self.client.post(url, {"operations": operations}, format="json")
+        task_id = response.data["results"][0]["id"]
+        self.client.post(url, {"operations": [
+            {"op": "update", "id": task_id, "data": {"status": "Done", "assigned_users": [self.assignee.id, self.user.id]}},
+        ]}, format="json")
+        run_due()
+
+        self.assertEqual(Notification.objects.filter(user=self.assignee).count(), 4)
+        # Newly assigned, then told about the status change like every assignee.
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_mark_actions_run_as_single_updates(self):
+        task = Task.objects.create(title="Task", board=self.board)
+        task.assigned_users.add(self.assignee)
+        for i in range(3):
+            task.status = ["Doing", "Suspend", "Done"][i]
+            task.save()
+        run_due()
+        first, second = Notification.objects.filter(user=self.assignee).order_by("id")[:2]
+
+        with self.assertNumQueries(3):  # user, update, counter
+            self.client.post(reverse("home:notifications-mark-read"), {"ids": [first.id, second.id]}, format="json")
+        self.assertEqual(self.unread(), 2)
+
+        response = self.client.post(reverse("home:notifications-mark-all-read"))
+        self.assertEqual(response.data["marked"], 2)
+        self.assertEqual(self.unread(), 0)
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+
+    def test_counter_follows_notifications_written_one_at_a_time(self):
+        notification = Notification.objects.create(user=self.assignee, message="From the admin")
+        Notification.objects.create(user=self.assignee, message="Already read", is_read=True)
+        self.assertEqual(self.unread(), 1)
+
+        notification.delete()
+        self.assertEqual(self.unread(), 0)
+
+    def test_counter_follows_is_read_toggles_on_existing_rows(self):
+        notification = Notification.objects.create(user=self.assignee, message="Toggle me")
+        notification = Notification.objects.get(pk=notification.pk)
+
+        notification.is_read = True
+        notification.save()
+        self.assertEqual(self.unread(), 0)
+        notification.save()
+        self.assertEqual(self.unread(), 0)
+        notification.is_read = False
+        notification.save(update_fields=["is_read"])
+        self.assertEqual(self.unread(), 1)
+
+        # Queryset updates send no signals; recount() repairs what they skipped.
+        Notification.objects.filter(pk=notification.pk).update(is_read=True)
+        self.assertEqual(self.unread(), 1)
+        out = StringIO()
+        call_command("reconcile_unread_counters", stdout=out)
+        self.assertIn("(0 users", out.getvalue())
+        self.assertEqual(self.unread(), 0)
+
+        Notification.objects.filter(pk=notification.pk).update(is_read=False)
+        self.assertEqual(recount([self.assignee.id]), 1)
+        self.assertEqual(self.unread(), 1)
+
+    def test_mark_as_read_ignores_other_users_notifications(self):
+        other = Notification.objects.create(user=self.user, message="private")
+
+        response = self.client.post(reverse("home:notifications-mark-as-read", kwargs={"pk": other.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        other.refresh_from_db()
+        self.assertFalse(other.is_read)
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from django.db import connection
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestTaskCursorPagination(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="pager",
+            email="pager@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def create_tasks(self, count, **kwargs):
+        return [Task.objects.create(title=f"Task {i}", board=self.board, **kwargs) for i in range(count)]
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task["id"] for task in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_pages_follow_creation_order(self):
+        tasks = self.create_tasks(7)
+
+        response = self.client.get(self.url, {"page_size": 3})
+
+        self.assertEqual([t["id"] for t in response.data["results"]], [t.id for t in tasks[:3]])
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(self.walk(f"{self.url}?page_size=3"), [t.id for t in tasks])
+
+    def test_inserts_between_pages_do_not_shift_rows(self):
+        tasks = self.create_tasks(4)
+
+        first = self.client.get(self.url, {"page_size": 2, "ordering": "-created_at"})
+        self.create_tasks(3)
+        rest = self.walk(first.data["next"])
+
+        seen = [t["id"] for t in first.data["results"]] + rest
+        self.assertEqual(seen, [t.id for t in reversed(tasks)])
+
+    def test_nullable_ordering_keeps_nulls_together_without_repeats(self):
+        today = date.today()
+        dated = [Task.objects.create(title=f"D{i}", board=self.board, deadline=today + timedelta(days=i % 2))
+                 for i in range(4)]
+        undated = self.create_tasks(3)
+
+        ids = self.walk(f"{self.url}?page_size=2&ordering=deadline")
+
+        self.assertEqual(len(ids), len(set(ids)))
+        nulls, values = (ids[-3:], ids[:4]) if connection.features.nulls_order_largest else (ids[:3], ids[3:])
+        self.assertEqual(nulls, [t.id for t in undated])
+        self.assertCountEqual(values, [t.id for t in dated])
+
+        reverse_ids = self.walk(f"{self.url}?page_size=2&ordering=-deadline")
+        self.assertEqual(len(reverse_ids), 7)
+        self.assertEqual(set(reverse_ids), set(ids))
+
+    def test_previous_link_returns_the_prior_page(self):
+        self.create_tasks(5)
+
+        first = self.client.get(self.url, {"page_size": 2, "ordering": "status"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        self.create_tasks(3)
+        first = self.client.get(self.url, {"page_size": 1})
+        cursor = first.data["next"].split("cursor=")[1].split("&")[0]
+
+        response = self.client.get(self.url, {"cursor": cursor, "ordering": "deadline"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,160 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestTaskReadQueries(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.tags = [Tag.objects.create(name=f"tag-{i}") for i in range(3)]
+        self.url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(title=f"Task {i}", board=self.board)
+            task.tags.set(self.tags)
+            task.assigned_users.add(self.user)
+
+    def count_queries(self, url, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_task_list_query_count_does_not_grow_with_page_size(self):
+        self.create_tasks(3)
+        small, _ = self.count_queries(self.url, page_size=3)
+
+        self.create_tasks(20)
+        large, response = self.count_queries(self.url, page_size=23)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["results"]), 23)
+        self.assertEqual(response.data["results"][0]["assigned_users"], ["reader"])
+        self.assertEqual([t["name"] for t in response.data["results"][0]["tags"]], ["tag-0", "tag-1", "tag-2"])
+
+    def test_task_detail_uses_fixed_queries(self):
+        self.create_tasks(1)
+        task = Task.objects.get()
+        url = reverse(
+            "home:board-tasks-detail",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id, "pk": task.id},
+        )
+
+        before, _ = self.count_queries(url)
+
+        task.tags.add(*[Tag.objects.create(name=f"extra-{i}") for i in range(5)])
+        task.assigned_users.add(*[
+            get_user_model().objects.create_user(username=f"user-{i}", password="password123") for i in range(5)
+        ])
+        after, response = self.count_queries(url)
+
+        self.assertEqual(before, after)
+        self.assertEqual(len(response.data["tags"]), 8)
+        self.assertEqual(len(response.data["assigned_users"]), 6)
+
+    def test_board_list_does_not_query_workspace_per_row(self):
+        url = reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id})
+        small, _ = self.count_queries(url)
+
+        for i in range(10):
+            Board.objects.create(name=f"Board {i}", workspace=self.workspace, description="")
+        large, response = self.count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertEqual(response.data[0]["workspace"]["name"], "Workspace")
+
+
+class TestTaskWriteQueries(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="writer",
+            email="writer@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.members = [self.user]
+        for i in range(9):
+            member = get_user_model().objects.create_user(username=f"member-{i}", password="password123")
+            WorkspaceMembership.objects.create(workspace=self.workspace, user=member)
+            self.members.append(member)
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        Tag.objects.create(name="existing")
+        self.url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def write(self, method, url, tag_count, user_count, prefix):
+        data = {
+            "title": "Task",
+            "board": self.board.id,
+            "tags": ["existing"] + [f"{prefix}-{i}" for i in range(tag_count - 1)],
+            "assigned_users": [member.id for member in self.members[:user_count]],
+        }
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_201_CREATED])
+        return len(context.captured_queries), response
+
+    def test_create_query_count_does_not_grow_with_tags_or_assignees(self):
+        # The first write on a board also inserts its counter row.
+        Task.objects.create(title="Existing", board=self.board)
+        small, _ = self.write("post", self.url, 2, 2, "small")
+        large, response = self.write("post", self.url, 10, 10, "large")
+
+        self.assertEqual(small, large)
+        task = Task.objects.get(id=response.data["id"])
+        self.assertEqual(task.tags.count(), 10)
+        self.assertEqual(task.assigned_users.count(), 10)
+
+    def test_update_applies_only_the_difference(self):
+        _, response = self.write("post", self.url, 5, 1, "first")
+        url = reverse(
+            "home:board-tasks-detail",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id, "pk": response.data["id"]},
+        )
+        task = Task.objects.get(id=response.data["id"])
+        kept = set(task.tags.through.objects.filter(task=task, tag__name="existing").values_list("id", flat=True))
+
+        small, _ = self.write("put", url, 2, 2, "second")
+        large, _ = self.write("put", url, 10, 10, "third")
+
+        self.assertEqual(small, large)
+        self.assertEqual(task.tags.count(), 10)
+        self.assertEqual(task.assigned_users.count(), 10)
+        self.assertTrue(task.tags.through.objects.filter(id__in=kept).exists())
+
+    def test_assignee_outside_workspace_is_rejected(self):
+        outsider = get_user_model().objects.create_user(username="outsider", password="password123")
+        data = {"title": "Task", "board": self.board.id, "tags": [], "assigned_users": [outsider.id]}
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,9 @@
+from django.test import TestCase
+from home.query_plans import explain_hot_queries
+
+
+class TestHotQueryPlans(TestCase):
+    def test_hot_queries_use_indexes(self):
+        for name, (plan, problems) in explain_hot_queries().items():
+            with self.subTest(name):
+                self.assertEqual(problems, [], plan)
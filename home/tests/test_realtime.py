@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.cache import cache
+from django.test import TestCase
+from home.models import Workspace, WorkspaceMembership, Board, Task
+from home.notifications import notify
+from home.realtime import EVICTED, InProcessBroker, RealtimeRouter
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestRealtime(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="listener", password="password123")
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        self.membership = WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.application = RealtimeRouter(None)
+
+    def write(self, function, *args):
+        # Events go out on commit, which the test transaction never reaches.
+        def run():
+            with self.captureOnCommitCallbacks(execute=True):
+                return function(*args)
+        return sync_to_async(run)()
+
+    async def connect(self, path="/realtime/", **params):
+        params = {"token": self.token, **params}
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        communicator = ApplicationCommunicator(self.application, {
+            "type": "websocket", "path": path, "query_string": query.encode(), "headers": [],
+        })
+        await communicator.send_input({"type": "websocket.connect"})
+        return communicator, await communicator.receive_output(timeout=2)
+
+    async def receive_event(self, communicator):
+        return json.loads((await communicator.receive_output(timeout=2))["text"])
+
+    async def test_board_subscribers_get_compact_task_events(self):
+        communicator, handshake = await self.connect(workspace=self.workspace.id, board=self.board.id)
+        self.assertEqual(handshake["type"], "websocket.accept")
+
+        task = await self.write(lambda: Task.objects.create(title="Draft", board=self.board))
+        event = await self.receive_event(communicator)
+        self.assertEqual(event["type"], "task.created")
+        self.assertEqual(event["task"]["title"], "Draft")
+
+        task.status = "Doing"
+        await self.write(task.save)
+        event = await self.receive_event(communicator)
+        self.assertEqual(event, {"type": "task.updated", "board": self.board.id, "id": task.id, "changes": {"status": "Doing"}})
+
+        await self.write(task.delete)
+        event = await self.receive_event(communicator)
+        self.assertEqual(event["type"], "task.deleted")
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=2)
+
+    async def test_notifications_reach_the_user_over_server_sent_events(self):
+        communicator = ApplicationCommunicator(self.application, {
+            "type": "http", "method": "GET", "path": "/realtime/events/",
+            "query_string": f"token={self.token}".encode(), "headers": [],
+        })
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output(timeout=2)
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(dict(start["headers"])[b"content-type"], b"text/event-stream")
+        await communicator.receive_output(timeout=2)  # ": connected"
+
+        await self.write(notify, [(self.user.id, "Hello")])
+        body = (await communicator.receive_output(timeout=2))["body"].decode()
+
+        self.assertTrue(body.startswith("data: "))
+        self.assertEqual(json.loads(body[len("data: "):])["notification"]["message"], "Hello")
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait(timeout=2)
+
+    async def test_connections_are_refused_without_access(self):
+        _, handshake = await self.connect(token="invalid")
+        self.assertEqual((handshake["type"], handshake["code"]), ("websocket.close", 4401))
+
+        other = await sync_to_async(Workspace.objects.create)(name="Other", created_by=self.user)
+        _, handshake = await self.connect(workspace=other.id)
+        self.assertEqual((handshake["type"], handshake["code"]), ("websocket.close", 4403))
+
+    async def test_removed_members_are_disconnected(self):
+        communicator, _ = await self.connect(workspace=self.workspace.id)
+
+        await self.write(self.membership.delete)
+
+        self.assertEqual((await self.receive_event(communicator))["type"], "access.revoked")
+        close = await communicator.receive_output(timeout=2)
+        self.assertEqual((close["type"], close["code"]), ("websocket.close", 4403))
+
+    async def test_slow_consumers_are_evicted(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe({"board:1"}, maxsize=2)
+
+        for i in range(3):
+            broker.publish({"board:1"}, str(i))
+        await asyncio.sleep(0)
+
+        self.assertIs(await subscription.get(), EVICTED)
+        broker.unsubscribe(subscription)
+        self.assertFalse(broker.has_subscribers())
@@ -0,0 +1,165 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db.models import F
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home import response_cache
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task
+from home.response_cache import LRUMemoryCache, cached
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestResponseCache(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="reader", password="password123")
+        self.authenticate(self.user)
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="member")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.other_board = Board.objects.create(name="Other", workspace=self.workspace, description="")
+        self.tag = Tag.objects.create(name="urgent")
+        self.task = Task.objects.create(title="Task", board=self.board)
+        self.task.tags.add(self.tag)
+
+        self.tasks_url = reverse(
+            "home:board-tasks-list", kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id}
+        )
+        self.boards_url = reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id})
+        self.tags_url = reverse("home:tag-list")
+
+    def authenticate(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def assertCache(self, url, expected):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], expected, url)
+        return response
+
+    def test_repeated_lists_are_served_from_the_cache(self):
+        for url in [self.tasks_url, self.boards_url, self.tags_url]:
+            first = self.assertCache(url, "miss")
+            self.assertEqual(self.assertCache(url, "hit").content, first.content)
+            self.assertCache(url + "?ordering=-created_at", "miss")
+
+        # board version for the ETag; no task, tag or assignee queries
+        with self.assertNumQueries(1):
+            self.client.get(self.tasks_url)
+
+    def test_writes_invalidate_the_lists_they_change(self):
+        writes = [
+            (lambda: Task.objects.create(title="New", board=self.board), self.tasks_url),
+            (lambda: Tag.objects.create(name="new"), self.tags_url),
+            (lambda: Tag.objects.get(name="new").tasks.add(self.task), self.tasks_url),
+            (lambda: Tag.objects.filter(pk=self.tag.pk).first().save(), self.tasks_url),
+            (lambda: self.tag.tasks.clear(), self.tasks_url),
+            (lambda: self.tag.delete(), self.tags_url),
+            (lambda: Board.objects.create(name="Third", workspace=self.workspace, description=""), self.boards_url),
+            (lambda: WorkspaceMembership.objects.create(workspace=self.workspace, user=self.other_user()), self.tasks_url),
+        ]
+        for write, url in writes:
+            self.client.get(url)
+            self.assertCache(url, "hit")
+            write()
+            self.assertCache(url, "miss")
+
+    def test_tags_created_by_task_writes_invalidate_the_tag_list(self):
+        self.assertCache(self.tags_url, "miss")
+        self.assertCache(self.tags_url, "hit")
+
+        response = self.client.post(self.tasks_url, {"title": "Tagged", "board": self.board.id, "tags": ["brandnew"], "assigned_users": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+
+        response = self.assertCache(self.tags_url, "miss")
+        self.assertIn("brandnew", [tag["name"] for tag in response.data])
+
+    def test_writes_elsewhere_keep_the_entry(self):
+        self.assertCache(self.tasks_url, "miss")
+
+        Task.objects.create(title="Elsewhere", board=self.other_board)
+
+        self.assertCache(self.tasks_url, "hit")
+
+    def test_writes_seen_only_by_the_database_miss_the_entry(self):
+        for url in [self.tasks_url, self.boards_url]:
+            first = self.assertCache(url, "miss")
+
+            # Another process's write: its signals never reach this process's cache.
+            Task.objects.filter(pk=self.task.pk).update(title="Renamed")
+            Board.objects.filter(workspace=self.workspace).update(version=F("version") + 1, name="Renamed")
+
+            response = self.assertCache(url, "miss")
+            self.assertNotEqual(response["ETag"], first["ETag"])
+            self.assertIn("Renamed", response.content.decode())
+
+    def test_entries_are_shared_by_role_and_still_need_membership(self):
+        self.assertCache(self.tasks_url, "miss")
+
+        colleague = self.other_user()
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=colleague, role="member")
+        self.assertCache(self.tasks_url, "miss")
+        self.authenticate(colleague)
+        self.assertCache(self.tasks_url, "hit")
+
+        self.authenticate(get_user_model().objects.create_user(username="outsider", password="password123"))
+        self.assertEqual(self.client.get(self.tasks_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def other_user(self):
+        return get_user_model().objects.create_user(username=f"user-{get_user_model().objects.count()}", password="password123")
+
+
+class TestCacheMechanics(SimpleTestCase):
+    def test_lru_backend_bounds_entries_and_bytes(self):
+        evictions = response_cache.metrics()["evictions"]
+        lru = LRUMemoryCache("test-lru", {"OPTIONS": {"MAX_ENTRIES": 3, "MAX_BYTES": 400}})
+        lru.clear()
+
+        for key in "abc":
+            lru.set(key, key)
+        lru.get("a")
+        lru.set("d", "d")
+        self.assertEqual([key for key in "abcd" if lru.has_key(key)], ["a", "c", "d"])
+
+        # One entry over the count, then the rest over the byte bound.
+        lru.set("big", "x" * 380)
+        self.assertEqual([key for key in ["a", "c", "d", "big"] if lru.has_key(key)], ["big"])
+        lru.set("huge", "x" * 500)
+        self.assertEqual([key for key in ["big", "huge"] if lru.has_key(key)], ["big"])
+        self.assertEqual(response_cache.metrics()["evictions"] - evictions, 4)
+
+    @override_settings(RESPONSE_CACHE_POLL_INTERVAL=0.001)
+    def test_only_one_caller_rebuilds_a_missing_key(self):
+        response_cache.get_cache().clear()
+        before = response_cache.metrics()
+        started, release, builds = threading.Event(), threading.Event(), []
+
+        def build():
+            builds.append(1)
+            started.set()
+            release.wait(2)
+            return ["rows"]
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(cached("hot", build)))
+        first.start()
+        started.wait(2)
+        waiters = [threading.Thread(target=lambda: results.append(cached("hot", build))) for _ in range(4)]
+        for thread in waiters:
+            thread.start()
+        time.sleep(0.1)  # let the waiters find the lock taken
+        release.set()
+        for thread in [first, *waiters]:
+            thread.join(2)
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(sorted(hit for _, hit in results), [False, True, True, True, True])
+        after = response_cache.metrics()
+        self.assertEqual((after["misses"] - before["misses"], after["coalesced"] - before["coalesced"]), (1, 4))
@@ -0,0 +1,84 @@
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board, Task
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from io import StringIO
+
+
+class TestTaskFullTextSearch(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="searcher",
+            email="searcher@example.com",
+            password="password123",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Workspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="")
+        self.url = reverse(
+            "home:board-tasks-list",
+            kwargs={"workspace_pk": self.workspace.id, "board_pk": self.board.id},
+        )
+
+    def search(self, term, **params):
+        response = self.client.get(self.url, {"search": term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["title"] for task in response.data["results"]]
+
+    def test_results_are_ranked_with_title_matches_first(self):
+        Task.objects.create(title="Write report", description="invoice numbers", board=self.board)
+        Task.objects.create(title="Invoice customers", description="", board=self.board)
+        Task.objects.create(title="Unrelated", description="nothing here", board=self.board)
+
+        self.assertEqual(self.search("invoice"), ["Invoice customers", "Write report"])
+
+    def test_index_follows_updates_and_deletes(self):
+        task = Task.objects.create(title="Draft roadmap", board=self.board)
+        task.title = "Final plan"
+        task.save()
+
+        self.assertEqual(self.search("roadmap"), [])
+        self.assertEqual(self.search("plan"), ["Final plan"])
+
+        task.delete()
+        self.assertEqual(self.search("plan"), [])
+
+    def test_ranked_results_paginate_without_repeats(self):
+        for i in range(5):
+            Task.objects.create(title=f"Deploy service {i}", description="deploy " * i, board=self.board)
+
+        response = self.client.get(self.url, {"search": "deploy", "page_size": 2})
+        titles = [t["title"] for t in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            titles.extend(t["title"] for t in response.data["results"])
+
+        self.assertEqual(len(titles), 5)
+        self.assertEqual(len(set(titles)), 5)
+
+    def test_query_syntax_is_treated_as_text(self):
+        Task.objects.create(title='Fix "quoted" AND broken', board=self.board)
+
+        self.assertEqual(self.search('"quoted" AND'), ['Fix "quoted" AND broken'])
+        self.assertEqual(self.search("NEAR("), [])
+
+    def test_rebuild_command_reindexes_every_task(self):
+        for i in range(5):
+            Task.objects.create(title=f"Batch {i}", board=self.board)
+        if connection.vendor == "sqlite":
+            # Start from an emptied index, as a rebuild interrupted mid-way used to leave it.
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO home_task_fts(home_task_fts) VALUES ('delete-all')")
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        self.assertIn("Indexed 5 tasks", out.getvalue())
+        self.assertEqual(len(self.search("batch")), 5)
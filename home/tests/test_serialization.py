@@ -0,0 +1,103 @@
+import datetime
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from home.models import Workspace, WorkspaceMembership, Board, Tag, Task, Notification
+from home.renderers import JSONParser, JSONRenderer
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# Both serializers must run on every request.
+@override_settings(RESPONSE_CACHE_ALIAS=None)
+class TestCompiledSerializers(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="reader", password="password123")
+        other = get_user_model().objects.create_user(username="zoë", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.workspace = Workspace.objects.create(name="Wörkspace", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.workspace, user=self.user, role="admin")
+        self.board = Board.objects.create(name="Board", workspace=self.workspace, description="line\u2028break")
+        Board.objects.create(name="Empty", workspace=self.workspace, description="")
+        tags = [Tag.objects.create(name=name) for name in ["urgent", "später"]]
+        for i in range(4):
+            task = Task.objects.create(
+                title=f"Täsk {i} \"quoted\"", board=self.board, status=["Todo", "Doing"][i % 2],
+                deadline=datetime.date(2030, 1, i + 1) if i % 2 else None, description="searchable words",
+            )
+            task.tags.add(*tags[:i])
+            task.assigned_users.add(*[self.user, other][:i % 3])
+        Notification.objects.create(user=self.user, message="Hello \u2029 there")
+        Notification.objects.create(user=self.user, message="Read", is_read=True)
+
+        kwargs = {"workspace_pk": self.workspace.id, "board_pk": self.board.id}
+        self.urls = [
+            reverse("home:notifications-list"),
+            reverse("home:workspace-boards-list", kwargs={"workspace_pk": self.workspace.id}),
+            reverse("home:board-tasks-list", kwargs=kwargs),
+            reverse("home:board-tasks-list", kwargs=kwargs) + "?ordering=-deadline&page_size=3",
+            reverse("home:board-tasks-list", kwargs=kwargs) + "?search=searchable&status=Doing",
+        ]
+
+    def test_compiled_lists_render_the_same_bytes(self):
+        for url in self.urls:
+            with override_settings(COMPILED_SERIALIZERS=False):
+                expected = self.client.get(url)
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.content, expected.content, url)
+
+    def test_compiled_pages_follow_on(self):
+        url = self.urls[3]
+        first = self.client.get(url)
+        with override_settings(COMPILED_SERIALIZERS=False):
+            expected = self.client.get(first.data["next"])
+
+        self.assertEqual(self.client.get(first.data["next"]).content, expected.content)
+
+    def test_task_list_queries_do_not_grow(self):
+        self.client.get(self.urls[2])  # warm the user state and access caches
+
+        # board version, tasks, tags, assignees
+        with self.assertNumQueries(4):
+            self.client.get(self.urls[2])
+
+
+class TestJSONRendererAndParser(APITestCase):
+    data = {
+        "text": "plain \"quoted\" ünïcode \u2028\u2029 \x00",
+        "numbers": [1, -2, 3.5, 1e16, 10 ** 20],
+        "nested": {"list": [None, True, False], "empty": {}},
+        "when": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "day": datetime.date(2024, 5, 1),
+        "amount": Decimal("1.50"),
+        "pair": (1, 2),
+    }
+
+    def test_renders_the_same_bytes_as_the_stock_renderer(self):
+        for media_type in [None, "application/json", "application/json; indent=4"]:
+            self.assertEqual(
+                JSONRenderer().render(self.data, media_type),
+                renderers.JSONRenderer().render(self.data, media_type),
+            )
+        self.assertEqual(JSONRenderer().render(None), b"")
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"nan": float("nan")})
+
+    def test_parses_like_the_stock_parser(self):
+        body = JSONRenderer().render(self.data)
+        self.assertEqual(JSONParser().parse(BytesIO(body)), parsers.JSONParser().parse(BytesIO(body)))
+
+        for invalid in [b"{", b'{"a": NaN}', b"\xff"]:
+            with self.assertRaises(ParseError):
+                JSONParser().parse(BytesIO(invalid))
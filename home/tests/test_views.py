@@ -1,7 +1,7 @@
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
-from home.models import Workspace
+from home.models import Workspace, WorkspaceMembership
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
 
@@ -29,6 +29,8 @@ class TestWorkspaceView(APITestCase):
     def test_retrieve_workspace_list(self):
         workspace1 = Workspace.objects.create(name="Workspace 1", created_by=self.user)
         workspace2 = Workspace.objects.create(name="Workspace 2", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=workspace1, user=self.user, role="admin")
+        WorkspaceMembership.objects.create(workspace=workspace2, user=self.user, role="admin")
 
         response = self.client.get(self.url)
 
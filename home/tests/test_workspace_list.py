@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from home.models import Workspace, WorkspaceMembership, Board
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TestWorkspaceList(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="lister", password="password123")
+        self.other = get_user_model().objects.create_user(username="other", password="password123")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.url = reverse("home:workspace-list")
+
+        self.mine = Workspace.objects.create(name="Mine", created_by=self.user)
+        WorkspaceMembership.objects.create(workspace=self.mine, user=self.user, role="admin")
+        self.shared = Workspace.objects.create(name="Shared", created_by=self.other)
+        WorkspaceMembership.objects.create(workspace=self.shared, user=self.other, role="admin")
+        WorkspaceMembership.objects.create(workspace=self.shared, user=self.user, role="member")
+        foreign = Workspace.objects.create(name="Foreign", created_by=self.other)
+        WorkspaceMembership.objects.create(workspace=foreign, user=self.other, role="admin")
+        Board.objects.create(name="Board", workspace=self.shared, description="")
+
+    def test_lists_only_the_callers_workspaces_with_counts_and_role(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row["name"]: row for row in response.data}
+        self.assertEqual(set(rows), {"Mine", "Shared"})
+        self.assertEqual(rows["Shared"]["role"], "member")
+        self.assertEqual(rows["Shared"]["created_by"], "other")
+        self.assertEqual((rows["Shared"]["board_count"], rows["Shared"]["member_count"]), (1, 2))
+        self.assertEqual((rows["Mine"]["board_count"], rows["Mine"]["member_count"]), (0, 1))
+
+    def test_list_is_one_query_then_cached(self):
+        self.client.get(reverse("profile"))  # warm the user state
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_changes_reach_every_members_cached_list(self):
+        self.client.get(self.url)
+
+        Board.objects.create(name="Another", workspace=self.shared, description="")
+        self.shared.name = "Renamed"
+        self.shared.save()
+        WorkspaceMembership.objects.filter(workspace=self.mine).delete()
+
+        rows = self.client.get(self.url).data
+        self.assertEqual([(row["name"], row["board_count"]) for row in rows], [("Renamed", 2)])
+
+    def test_renaming_a_creator_reaches_the_members_cached_lists(self):
+        self.client.get(self.url)
+
+        other = get_user_model().objects.get(pk=self.other.pk)
+        other.username = "renamed"
+        other.save()
+
+        rows = {row["name"]: row["created_by"] for row in self.client.get(self.url).data}
+        self.assertEqual(rows, {"Mine": "lister", "Shared": "renamed"})
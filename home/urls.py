@@ -2,6 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers
 from .views import WorkspaceViewSet, BoardViewSet, TagViewSet, TaskViewSet, WorkspaceMembershipViewSet, NotificationViewSet
+from .async_views import AsyncBoardViewSet, AsyncNotificationViewSet, AsyncTaskViewSet
 
 app_name = 'home'
 
@@ -19,8 +20,26 @@ router.register('notifications', NotificationViewSet, basename='notifications')
 router.register('tags', TagViewSet, basename='tag')
 #router.register(r'workspace-memberships', WorkspaceMembershipViewSet, basename='workspace-membership')
 
+# Async versions of the busiest reads, for ASGI deployments; same responses as their sync counterparts.
+async_urlpatterns = [
+    path('notifications/', AsyncNotificationViewSet.as_view({'get': 'list'}), name='async-notifications-list'),
+    path(
+        'workspaces/<workspace_pk>/boards/', AsyncBoardViewSet.as_view({'get': 'list'}),
+        name='async-workspace-boards-list',
+    ),
+    path(
+        'workspaces/<workspace_pk>/boards/<board_pk>/tasks/', AsyncTaskViewSet.as_view({'get': 'list'}),
+        name='async-board-tasks-list',
+    ),
+    path(
+        'workspaces/<workspace_pk>/boards/<board_pk>/tasks/<pk>/', AsyncTaskViewSet.as_view({'get': 'retrieve'}),
+        name='async-board-tasks-detail',
+    ),
+]
+
 urlpatterns = [
     path('', include(router.urls)),
     path('', include(workspaces_router.urls)),
     path('', include(boards_router.urls)),
+    path('async/', include(async_urlpatterns)),
 ]
@@ -2,16 +2,28 @@ from rest_framework import viewsets, serializers
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
-from .models import Workspace, Board, Tag, Task, WorkspaceMembership, Notification
-from rest_framework.exceptions import PermissionDenied
-from .serializers import WorkspaceSerializer, BoardSerializer, TagSerializer, TaskSerializer,TaskWriteSerializer, WorkspaceMembershipSerializer, NotificationSerializer
+from .models import Workspace, Board, Tag, Task, WorkspaceMembership, Notification, ChangeLogEntry
+from rest_framework.exceptions import PermissionDenied, NotFound
+from .serializers import WorkspaceSerializer, WorkspaceListSerializer, BoardSerializer, TagSerializer, TaskSerializer,TaskWriteSerializer, TaskBulkSerializer, WorkspaceMembershipSerializer, NotificationSerializer, NotificationIdsSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework import status
 from django.conf import settings
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from .permissions import IsWorkspaceMember, IsWorkspaceCreator
+from .membership import WorkspaceAccessMixin, cached_workspace_list, resolve_workspace_access
+from .autocomplete import autocomplete as autocomplete_tags
+from .changes import read_changes
+from .compiled import CompiledListMixin
+from .conditional import ConditionalGetMixin
+from .fieldsets import SparseFieldsetMixin
+from .response_cache import ResponseCacheMixin
+from .counters import workspace_summary
+from .notifications import mark_read as mark_notifications_read, unread_count as count_unread_notifications
 from rest_framework.exceptions import ValidationError
-from .filters import TaskFilter
+from .filters import TaskFilter, TaskSearchFilter
+from .pagination import TaskCursorPagination
 from rest_framework.decorators import action
 
 
@@ -26,6 +38,46 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsWorkspaceCreator()]
         return [IsAuthenticated()]
 
+    def get_queryset(self):
+        if self.action != 'list':
+            return super().get_queryset()
+        # One query: the caller's memberships joined to their workspaces and creators.
+        return Workspace.objects.filter(memberships__user=self.request.user).select_related('created_by').only(
+            'name', 'created_at', 'created_by__username'
+        ).annotate(
+            role=F('memberships__role'),
+            board_count=self.count_of(Board),
+            member_count=self.count_of(WorkspaceMembership),
+        ).order_by('id')
+
+    @staticmethod
+    def count_of(model):
+        rows = model.objects.filter(workspace=OuterRef('pk')).order_by().values('workspace')
+        return Coalesce(Subquery(rows.annotate(count=Count('pk')).values('count')), 0)
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return WorkspaceListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        data = cached_workspace_list(
+            request.user.id, lambda: list(self.get_serializer(self.get_queryset(), many=True).data)
+        )
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    def changes(self, request, pk=None):
+        access = resolve_workspace_access(request, pk)
+        if access.role is None:
+            raise PermissionDenied("You do not have permission to access this workspace.")
+        workspace = access.workspace
+        return Response(read_changes(request, ChangeLogEntry.objects.filter(workspace=workspace), {
+            'task': (TaskSerializer.setup_eager_loading(Task.objects.filter(board__workspace=workspace)), TaskSerializer),
+            'board': (Board.objects.filter(workspace=workspace).select_related('workspace'), BoardSerializer),
+            'membership': (WorkspaceMembership.objects.filter(workspace=workspace), WorkspaceMembershipSerializer),
+        }), status=status.HTTP_200_OK)
+
 
     def perform_create(self, serializer):
         workspace = serializer.save(created_by=self.request.user)
@@ -47,80 +99,204 @@ class WorkspaceMembershipViewSet(viewsets.ModelViewSet):
         serializer.save()
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(ConditionalGetMixin, ResponseCacheMixin, CompiledListMixin, SparseFieldsetMixin, WorkspaceAccessMixin, viewsets.ModelViewSet):
     serializer_class = BoardSerializer
     permission_classes = [IsAuthenticated, IsWorkspaceMember]
 
+    def get_validators(self):
+        boards = self.get_validator_boards()
+        return None if boards is None else self.board_validators(boards.aggregate(**self.validator_aggregates()))
+
+    async def aget_validators(self):
+        boards = self.get_validator_boards()
+        return None if boards is None else self.board_validators(await boards.aaggregate(**self.validator_aggregates()))
+
+    def get_validator_boards(self):
+        boards = Board.objects.filter(workspace=self.get_workspace_access().workspace)
+        if self.action == 'retrieve':
+            if not self.kwargs['pk'].isdigit():
+                return None
+            boards = boards.filter(pk=self.kwargs['pk'])
+        return boards
+
+    @staticmethod
+    def validator_aggregates():
+        return {'count': Count('id'), 'version': Sum('version'), 'last_modified': Max('updated_at')}
+
+    def board_validators(self, state):
+        # Boards embed the workspace name, which is not part of their versions.
+        if not state['count']:
+            return None
+        return (
+            f"{self.get_workspace_access().workspace.name}:{state['count']}:{state['version']}:"
+            f"{state['last_modified'].isoformat()}",
+            state['last_modified'],
+        )
+
+    def get_cache_dependencies(self):
+        return [f'workspace:{self.get_workspace_access().workspace.pk}']
+
+    def get_cache_audience(self):
+        return self.get_workspace_access().role
+
     def get_queryset(self):
-        workspace_id = self.kwargs.get('workspace_pk')
-        workspace = get_object_or_404(Workspace, id=workspace_id)
+        workspace = self.get_workspace_access().workspace
 
-        return Board.objects.filter(workspace=workspace)
+        queryset = self.get_selected_columns(Board.objects.filter(workspace=workspace))
+        if self.get_field_selection().expands('workspace'):
+            queryset = queryset.select_related('workspace')
+        return queryset
 
     def perform_create(self, serializer):
-        workspace_id = self.kwargs.get('workspace_pk')
-        workspace = Workspace.objects.get(id=workspace_id)
+        workspace = self.get_workspace_access().workspace
 
         serializer.save(workspace=workspace)
 
+    @action(detail=False, methods=['get'])
+    def summary(self, request, workspace_pk=None):
+        return Response(workspace_summary(self.get_workspace_access().workspace), status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def changes(self, request, workspace_pk=None, pk=None):
+        board = resolve_workspace_access(request, workspace_pk, pk).board
+        return Response(read_changes(request, ChangeLogEntry.objects.filter(board=board), {
+            'task': (TaskSerializer.setup_eager_loading(Task.objects.filter(board=board)), TaskSerializer),
+            'board': (Board.objects.filter(pk=board.pk).select_related('workspace'), BoardSerializer),
+        }), status=status.HTTP_200_OK)
+
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
     permission_classes = [IsAuthenticated]
 
-
-class TaskViewSet(viewsets.ModelViewSet):
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    def get_cache_dependencies(self):
+        return ['tags']
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This parameter is required.'})
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        limit = min(max(limit, 1), settings.TAG_AUTOCOMPLETE_MAX_RESULTS)
+
+        workspace_id = request.query_params.get('workspace')
+        if workspace_id is not None:
+            access = resolve_workspace_access(request, workspace_id)
+            if access.role is None:
+                raise PermissionDenied("You do not have permission to access this workspace.")
+            workspace_id = access.workspace.id
+        return Response(autocomplete_tags(query, workspace_id, limit), status=status.HTTP_200_OK)
+
+
+class TaskViewSet(ConditionalGetMixin, ResponseCacheMixin, CompiledListMixin, SparseFieldsetMixin, WorkspaceAccessMixin, viewsets.ModelViewSet):
+    permission_classes = [IsAuthenticated, IsWorkspaceMember]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, OrderingFilter]
     filterset_class = TaskFilter
+    pagination_class = TaskCursorPagination
     search_fields = ['title', 'description']
-    ordering_fields = ['start_date', 'end_date', 'deadline', 'status']
+    ordering_fields = ['created_at', 'start_date', 'end_date', 'deadline', 'status']
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return TaskWriteSerializer
+        if self.action == 'bulk':
+            return TaskBulkSerializer
         return TaskSerializer
 
-    def get_queryset(self):
-        workspace_id = self.kwargs.get('workspace_pk')
-        board_id = self.kwargs.get('board_pk')
+    def get_validators(self):
+        return self.board_version().first()
+
+    async def aget_validators(self):
+        return await self.board_version().afirst()
+
+    def get_cache_dependencies(self):
+        access = self.get_workspace_access()
+        return [f'workspace:{access.workspace.pk}', f'board:{access.board.pk}']
+
+    def get_cache_audience(self):
+        return self.get_workspace_access().role
 
-        workspace = get_object_or_404(Workspace, id=workspace_id)
+    def board_version(self):
+        # Every write to a task, its tags or its assignees bumps the board's version.
+        return Board.objects.filter(pk=self.get_workspace_access().board.pk).values_list('version', 'updated_at')
 
-        if not workspace.memberships.filter(user=self.request.user).exists():
-            raise PermissionDenied("You do not have permission to view tasks in this workspace.")
+    def get_queryset(self):
+        board = self.get_workspace_access().board
 
-        return Task.objects.filter(board__id=board_id, board__workspace=workspace)
+        queryset = Task.objects.filter(board=board)
+        if self.action in ['list', 'retrieve']:
+            queryset = TaskSerializer.setup_eager_loading(self.get_selected_columns(queryset), self.get_field_selection())
+        return queryset
 
     def perform_create(self, serializer):
-        board_pk = self.kwargs['board_pk']
-        board = get_object_or_404(Board, id=board_pk)
+        board = self.get_workspace_access().board
 
-        assigned_users_data = serializer.validated_data.get('assigned_users', [])
-        for user_id in assigned_users_data:
-            if not WorkspaceMembership.objects.filter(workspace=board.workspace, user_id=user_id).exists():
-                raise ValidationError({"detail": f"User with id {user_id} is not a member of the workspace."})
+        self.check_assigned_users(board, serializer.validated_data.get('assigned_users', []))
 
         serializer.save(board=board)
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    def perform_update(self, serializer):
+        self.check_assigned_users(self.get_workspace_access().board, serializer.validated_data.get('assigned_users', []))
+
+        serializer.save()
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, workspace_pk=None, board_pk=None):
+        # IsWorkspaceMember has already checked membership once for the whole batch.
+        board = self.get_workspace_access().board
+
+        serializer = self.get_serializer(data=request.data, context={**self.get_serializer_context(), 'board': board})
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    def check_assigned_users(self, board, user_ids):
+        if not user_ids:
+            return
+        members = set(WorkspaceMembership.objects.filter(
+            workspace_id=board.workspace_id, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+        for user_id in user_ids:
+            if user_id not in members:
+                raise ValidationError({"detail": f"User with id {user_id} is not a member of the workspace."})
+
+class NotificationViewSet(CompiledListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
 
+    def get_serializer_class(self):
+        if self.action == 'mark_read':
+            return NotificationIdsSerializer
+        return NotificationSerializer
+
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
-        notification = get_object_or_404(Notification, pk=pk, user=request.user)
-        notification.is_read = True
-        notification.save()
+        notifications = Notification.objects.filter(pk=pk)
+        if not mark_notifications_read(request.user, notifications) and not notifications.filter(user=request.user).exists():
+            raise NotFound()
         return Response({'status': 'Notification marked as read'}, status=status.HTTP_200_OK)
 
-
-
-
-
-
+    @action(detail=False, methods=['post'])
+    def mark_read(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_notifications_read(request.user, Notification.objects.filter(pk__in=serializer.validated_data['ids']))
+        return Response({'marked': updated}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        updated = mark_notifications_read(request.user, Notification.objects.all())
+        return Response({'marked': updated}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        return Response({'unread': count_unread_notifications(request.user)}, status=status.HTTP_200_OK)
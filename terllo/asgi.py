@@ -1,7 +1,10 @@
 """
 ASGI config for terllo project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``:
+Django, plus the realtime WebSocket and server-sent event endpoints of
+home.realtime. Each serving process starts its background job workers on
+its first request (see home.jobs). Serve it with any ASGI server, e.g. ``uvicorn terllo.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +16,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'terllo.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up: they need the app registry.
+from home.jobs import JobWorkersASGI  # noqa: E402
+from home.realtime import RealtimeRouter  # noqa: E402
+
+application = JobWorkersASGI(RealtimeRouter(django_application))
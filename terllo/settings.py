@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'home.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,25 +87,102 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Serialized list responses (see home.response_cache). Any Django cache
+    # backend works; a shared one also lets workers wait for each other's rebuilds.
+    'responses': {
+        'BACKEND': 'home.response_cache.LRUMemoryCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'MAX_BYTES': 64 * 1024 * 1024,
+        },
+    },
+}
+
+# Cache alias for list responses, or None to serve them uncached. A worker
+# rebuilding a missing entry makes the others wait up to the lock timeout
+# (seconds), checking every poll interval.
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_LOCK_TIMEOUT = 5
+RESPONSE_CACHE_POLL_INTERVAL = 0.02
+
+# Tag autocomplete returns at most MAX_RESULTS tags. Each process keeps the
+# matches of up to CACHE_SIZE prefixes of at most CACHE_PREFIX_LENGTH
+# characters for CACHE_TTL seconds (see home.autocomplete).
+TAG_AUTOCOMPLETE_MAX_RESULTS = 50
+TAG_AUTOCOMPLETE_CACHE_SIZE = 1024
+TAG_AUTOCOMPLETE_CACHE_PREFIX_LENGTH = 3
+TAG_AUTOCOMPLETE_CACHE_TTL = 30
+
+# Seconds a resolved workspace membership stays in the process cache.
+WORKSPACE_ACCESS_CACHE_TTL = 30
+
+# Seconds a user's workspace list stays cached. Writes invalidate the lists
+# in the cache they ran against; with the per-process default cache, other
+# processes keep serving theirs, missing or still listing workspaces, for
+# up to this long. Keep it short unless 'default' is shared between them.
+WORKSPACE_LIST_CACHE_TTL = 5
+
+
+# Request instrumentation: query counts, DB and serializer time per request in a
+# Server-Timing header, plus per-route histograms for `manage.py dump_request_stats`.
+# When off, the middleware drops out of the stack at startup.
+
+REQUEST_INSTRUMENTATION = False
+REQUEST_INSTRUMENTATION_DIR = BASE_DIR / 'instrumentation'
+REQUEST_INSTRUMENTATION_FLUSH_INTERVAL = 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# Cheapest first; the similarity check is the slowest and only runs with a user.
 AUTH_PASSWORD_VALIDATORS = [
     {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'accounts.validators.CommonPasswordValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
     },
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+# The first hasher encodes new passwords; the rest still verify older hashes,
+# which are rehashed on the next successful login. Put the Argon2 hasher first
+# once argon2-cffi is installed.
+
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedScryptPasswordHasher',
+    'accounts.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Cost per login, traded against login throughput (see `manage.py benchmark_login`).
+# scrypt: 16 MiB and roughly a sixth of PBKDF2's default CPU time per check.
+# Argon2: the OWASP minimum of 19 MiB, two passes, one lane.
+PASSWORD_HASHER_COST = {
+    'scrypt': {'work_factor': 2**14, 'block_size': 8, 'parallelism': 1},
+    'argon2': {'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1},
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -131,12 +209,31 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'home.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'home.renderers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Token buckets: "10/min" allows a burst of 10, then one attempt every 6 seconds.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_username': '10/min',
+    },
+    # Trusted proxies in front of the app. Throttles key clients by address:
+    # REMOTE_ADDR with 0, otherwise the entry this many proxies back in
+    # X-Forwarded-For. Clients write the header themselves, so never count
+    # proxies that are not there.
+    'NUM_PROXIES': 0,
 }
 
 from datetime import timedelta
@@ -147,5 +244,53 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
+# Revoked refresh-token ids each process remembers, so replays are refused
+# without a database round trip.
+REVOKED_TOKEN_CACHE_SIZE = 10000
+
+# Seconds a user's active flag and username stay cached for token
+# authentication, i.e. how long a deactivated user's tokens keep working.
+USER_STATE_CACHE_TTL = 30
+
+# Delta sync: how long change log entries, and so sync tokens, stay valid, and
+# how old an entry must be before it is served. The settle time should exceed
+# the longest write transaction, so an entry committed after a younger one is
+# not skipped.
+CHANGE_LOG_RETENTION = timedelta(days=30)
+CHANGE_LOG_SETTLE_SECONDS = 2
+
+# Realtime events on the ASGI entry point (see home.realtime). The in-process
+# broker only reaches connections of the process that made the change; use a
+# broker that fans out between nodes when running several. A connection with
+# REALTIME_QUEUE_SIZE undelivered events is dropped and must resync.
+REALTIME_BROKER = 'home.realtime.InProcessBroker'
+REALTIME_PATH = '/realtime/'
+REALTIME_QUEUE_SIZE = 256
+REALTIME_HEARTBEAT_SECONDS = 25
+
+# Background jobs (see home.jobs) are queued in the database with the write
+# that causes them and run by `manage.py run_jobs` processes, with
+# JOBS_WORKER_THREADS threads each: deploy at least one next to the web
+# processes. Pushed notifications then need a broker that fans out between
+# processes. JOBS_IN_PROCESS_WORKERS > 0 instead starts that many threads in
+# every serving process on its first request, which only suits a single
+# process; on SQLite they compete with requests for the one write lock.
+# A failed job is retried after JOBS_RETRY_DELAY seconds, doubling up to
+# JOBS_RETRY_MAX_DELAY, until it has run JOBS_MAX_ATTEMPTS times. A job
+# claimed more than JOBS_CLAIM_TIMEOUT seconds ago is assumed lost with its
+# worker and queued again.
+JOBS_IN_PROCESS_WORKERS = 0
+JOBS_WORKER_THREADS = 4
+JOBS_BATCH_SIZE = 10
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 2
+JOBS_RETRY_MAX_DELAY = 300
+JOBS_CLAIM_TIMEOUT = 300
+
+# Task, board and notification lists are built from `.values_list()` rows
+# (see home.compiled) instead of model instances and ModelSerializer.
+COMPILED_SERIALIZERS = True
@@ -2,6 +2,8 @@
 WSGI config for terllo project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+Each serving process starts its background job workers on its first request
+(see home.jobs).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
@@ -13,4 +15,9 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'terllo.settings')
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+# Imported once Django is set up: it needs the app registry.
+from home.jobs import JobWorkersWSGI  # noqa: E402
+
+application = JobWorkersWSGI(django_application)